@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# benchmark-solver.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Compare solves/sec of the in-project bitmask solver with sudoku-engine.
+
+Usage: scripts/benchmark-solver.py [--puzzles N] [--difficulty D] [--diagonal]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.base.solver import flatten, get_solver  # noqa: E402
+
+
+def _rate(label, puzzles, func):
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        func(puzzle)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {len(puzzles) / elapsed:10.1f} /s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--puzzles", type=int, default=50)
+    parser.add_argument("--difficulty", type=float, default=0.7)
+    parser.add_argument("--diagonal", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    solver = get_solver(3, args.diagonal)
+    rng = random.Random(args.seed)
+    puzzles = [
+        solver.make_puzzle(args.difficulty, rng)[0] for _ in range(args.puzzles)
+    ]
+    clues = sum(v is not None for p in puzzles for row in p for v in row)
+    print(
+        f"{args.puzzles} {'diagonal' if args.diagonal else 'classic'} puzzles, "
+        f"{clues / args.puzzles:.1f} clues on average"
+    )
+
+    print("bitmask solver:")
+    _rate("solve", puzzles, lambda p: solver.solve(flatten(p)))
+    _rate("uniqueness check", puzzles, lambda p: solver.count_solutions(flatten(p)))
+
+    try:
+        from sudoku import ClassicSudoku, DiagonalSudoku
+        from sudoku.base_sudoku import Solver
+    except ImportError:
+        print(
+            "sudoku-engine not installed, skipping comparison "
+            "(pip install -r requirements-benchmark.txt)"
+        )
+        return
+
+    sudoku_cls = DiagonalSudoku if args.diagonal else ClassicSudoku
+    print("sudoku-engine:")
+    _rate(
+        "solve",
+        puzzles,
+        lambda p: sudoku_cls(size=9, board=[row[:] for row in p]).solve(),
+    )
+    _rate(
+        "uniqueness check",
+        puzzles,
+        lambda p: Solver(
+            sudoku_cls(size=9, board=[row[:] for row in p]), max_solutions=2
+        ).solve_count(),
+    )
+
+
+if __name__ == "__main__":
+    main()
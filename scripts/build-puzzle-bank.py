@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+# build-puzzle-bank.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Pre-generate a puzzle bank on all cores, without GTK.
+
+Usage: scripts/build-puzzle-bank.py OUTPUT [--count N] [--variants ...]
+                                    [--difficulties ...] [--jobs J]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.base.constants import DIFFICULTY_LEVELS  # noqa: E402
+from src.base.grader import get_grader, grade_level  # noqa: E402
+from src.base.puzzle_bank import (  # noqa: E402
+    PuzzleBankWriter,
+    difficulty_bucket,
+    encode_record,
+)
+from src.base.solver import flatten  # noqa: E402
+from src.variants.classic_sudoku.generator import (  # noqa: E402
+    ClassicSudokuGenerator,
+)
+from src.variants.diagonal_sudoku.generator import (  # noqa: E402
+    DiagonalSudokuGenerator,
+)
+
+GENERATORS = {
+    "classic": ClassicSudokuGenerator,
+    "diagonal": DiagonalSudokuGenerator,
+}
+
+
+def _generate(task):
+    """
+    Pool task: generate one puzzle and check it against its level.
+    Returns (record, seconds, accepted).
+    """
+    variant, difficulty, seed = task
+    random.seed(seed)
+    generator = GENERATORS[variant]()
+    start = time.perf_counter()
+    puzzle, solution = generator._generate_impl(difficulty)
+    elapsed = time.perf_counter() - start
+
+    accepted = True
+    if generator.graded:
+        grader = get_grader(generator.block_size, generator.diagonal)
+        grade = grader.grade(flatten(puzzle))
+        accepted = grade_level(grade) == difficulty_bucket(difficulty)
+    return encode_record(puzzle, solution), elapsed, accepted
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class _Stats:
+    """Throughput and timing of one bucket."""
+
+    def __init__(self, label):
+        self.label = label
+        self.start = time.perf_counter()
+        self.end = None
+        self.accepted = 0
+        self.rejected = 0
+        self.times = []
+
+    def add(self, elapsed, accepted):
+        self.times.append(elapsed)
+        if accepted:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    def rate(self):
+        end = self.end or time.perf_counter()
+        return self.accepted / max(end - self.start, 1e-9)
+
+    def progress(self, count):
+        return f"\r  {self.label:<18} {self.accepted}/{count}  {self.rate():8.1f} /s"
+
+    def summary(self):
+        times = sorted(self.times)
+        attempts = self.accepted + self.rejected
+        return (
+            f"  {self.label:<18} {self.accepted} puzzles  {self.rate():8.1f} /s  "
+            f"rejected {self.rejected / max(attempts, 1):6.1%}  "
+            f"p50 {_percentile(times, 0.5) * 1000:7.1f} ms  "
+            f"p99 {_percentile(times, 0.99) * 1000:7.1f} ms"
+        )
+
+
+def _fill_bucket(pool, jobs, writer, variant, difficulty, count, rng):
+    """Generate until `count` accepted puzzles were written to the bucket."""
+    generator = GENERATORS[variant]
+    writer.begin_bucket(variant, difficulty, generator.block_size)
+    stats = _Stats(f"{variant} {difficulty}")
+    while stats.accepted < count:
+        # Keep every job busy on the last puzzles, the few extra are dropped
+        missing = count - stats.accepted
+        tasks = [
+            (variant, difficulty, rng.getrandbits(64))
+            for _ in range(max(missing, jobs))
+        ]
+        for record, elapsed, accepted in pool.imap_unordered(_generate, tasks):
+            if stats.accepted >= count:
+                break
+            stats.add(elapsed, accepted)
+            if accepted:
+                writer.add_record(record)
+            print(stats.progress(count), end="", file=sys.stderr, flush=True)
+    stats.finish()
+    print(file=sys.stderr)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output", help="bank file to write, e.g. puzzles.bank")
+    parser.add_argument(
+        "--count", type=int, default=1000, help="puzzles per variant and difficulty"
+    )
+    parser.add_argument(
+        "--variants", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS)
+    )
+    parser.add_argument(
+        "--difficulties", nargs="+", type=float, default=list(DIFFICULTY_LEVELS)
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    results = []
+    with mp.Pool(args.jobs) as pool, PuzzleBankWriter(args.output) as writer:
+        for variant in args.variants:
+            for difficulty in args.difficulties:
+                stats = _fill_bucket(
+                    pool, args.jobs, writer, variant, difficulty, args.count, rng
+                )
+                results.append(stats)
+
+    elapsed = time.perf_counter() - start
+    total = sum(stats.accepted for stats in results)
+    print(f"Wrote {total} puzzles to {args.output} with {args.jobs} jobs")
+    for stats in results:
+        print(stats.summary())
+    print(f"  {'total':<18} {total / elapsed:8.1f} /s in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
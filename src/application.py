@@ -27,6 +27,8 @@ from gi.repository import Gio, Adw, Gtk, GLib
 from .window import SudokuWindow
 from .screens.help_dialog import HowToPlayDialog
 from .log_utils import setup_logging
+from .base.generator_pool import GeneratorPool
+from .base.save_service import SaveService
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
@@ -41,6 +43,8 @@ class SudokuApplication(Adw.Application):
         self._setup_actions()
         self._setup_accelerators()
         self.log_handler = setup_logging()
+        # Closing the last window quits without going through the quit action
+        self.connect("shutdown", self._on_shutdown)
 
     def _setup_actions(self):
         """Set up application actions."""
@@ -52,6 +56,10 @@ class SudokuApplication(Adw.Application):
         """Set up keyboard accelerators for window actions."""
         self.set_accels_for_action("win.pencil-toggled", ["p"])
         self.set_accels_for_action("win.back-to-menu", ["<Ctrl>m"])
+        self.set_accels_for_action("win.undo", ["<primary>z"])
+        self.set_accels_for_action("win.redo", ["<primary><shift>z", "<primary>y"])
+        self.set_accels_for_action("win.fill-notes", ["<primary><shift>p"])
+        self.set_accels_for_action("win.hint", ["<primary>h"])
         self.set_accels_for_action("win.show-primary-menu", ["F10"])
         self.set_accels_for_action("win.show-shortcuts-overlay", ["<Ctrl>question"])
         self.set_accels_for_action("win.show-preferences", ["<primary>comma"])
@@ -131,8 +139,15 @@ class SudokuApplication(Adw.Application):
         dialog.present(self.props.active_window)
 
     def _on_close_request(self, *args):
+        GeneratorPool.shutdown_shared()
         self.quit()
 
+    def _on_shutdown(self, *_):
+        for window in self.get_windows():
+            if isinstance(window, SudokuWindow):
+                window.save_game()
+        SaveService.shared().flush()
+
     def create_action(self, name, callback, shortcuts=None):
         """Add an application action.
 
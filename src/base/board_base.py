@@ -17,12 +17,34 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import json
+import copy
 import os
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from typing import Any, Self
 from gi.repository import GLib
+from .board_state import (
+    DIGIT_INTS,
+    DIGIT_STRS,
+    BoardState,
+    GridView,
+    NoteSet,
+    NotesView,
+    encode_digit,
+)
+from .generator_pool import GenerationRequest
+from .hints import Hint, HintEngine
+from .move_history import MoveHistory
 from .preferences_manager import PreferencesManager
+from .puzzle_bank import PuzzleBank
+from .puzzle_cache import PuzzleCache
+from .save_file import write_save
+from .save_format import encode_save
+from .save_index import SaveIndex
+from .save_journal import SaveJournal, read_journal
+from .save_service import SaveService
+from .validity import ValidityChecker
+from .transforms import random_isomorph
 
 
 def _get_save_path():
@@ -30,7 +52,7 @@ def _get_save_path():
     data_dir = GLib.get_user_data_dir()
     save_dir = os.path.join(data_dir, "sudokugame")
     os.makedirs(save_dir, exist_ok=True)
-    return os.path.join(save_dir, "board.json")
+    return os.path.join(save_dir, "board.sav")
 
 
 class BoardBase(ABC):
@@ -43,6 +65,7 @@ class BoardBase(ABC):
         variant: str,
         variant_preferences: dict[str, Any] | None = None,
         general_preferences: dict[str, Any] | None = None,
+        request: GenerationRequest | None = None,
     ):
         self.rules = rules
         self.generator = generator
@@ -56,32 +79,94 @@ class BoardBase(ABC):
         self.variant_preferences = variant_preferences or prefs.variant_defaults
         self.general_preferences = general_preferences or prefs.general_defaults
 
-        self.puzzle, self.solution = self.generator.generate(difficulty)
-        self.user_inputs = [
-            [None for _ in range(self.rules.size)] for _ in range(self.rules.size)
-        ]
-        self.notes = [
-            [set() for _ in range(self.rules.size)] for _ in range(self.rules.size)
-        ]
+        self.state = BoardState(self.rules.size, self.rules.topology)
+        self.history = MoveHistory()
+        self._move = None
+        self.journal = SaveJournal()
+        self.validity = ValidityChecker(self.rules.topology)
+        self.hints = HintEngine(self.rules.topology)
+        self.puzzle, self.solution = self._draw_puzzle(difficulty, request)
+
+    # The grids below are list-like views over `self.state`. Clues and the
+    # solution read back as ints, user entries as digit strings, and all of
+    # them accept ints, strings or None when written. Notes read back as
+    # sets of digit strings.
+
+    @property
+    def puzzle(self) -> GridView:
+        state = self.state
+        return GridView(state.puzzle, state.size, DIGIT_INTS, state)
+
+    @puzzle.setter
+    def puzzle(self, grid):
+        self.state.assign(self.state.puzzle, grid)
+
+    @property
+    def solution(self) -> GridView:
+        state = self.state
+        return GridView(state.solution, state.size, DIGIT_INTS, state)
+
+    @solution.setter
+    def solution(self, grid):
+        self.state.assign(self.state.solution, grid)
+
+    @property
+    def user_inputs(self) -> GridView:
+        state = self.state
+        return GridView(state.inputs, state.size, DIGIT_STRS, state)
+
+    @user_inputs.setter
+    def user_inputs(self, grid):
+        self.state.assign(self.state.inputs, grid)
+
+    @property
+    def notes(self) -> NotesView:
+        return NotesView(self.state.notes, self.state.size)
+
+    @notes.setter
+    def notes(self, grid):
+        self.state.load_notes(grid)
+
+    @staticmethod
+    def has_instant_puzzle(
+        variant: str, difficulty: float, block_size: int = 3
+    ) -> bool:
+        """Whether a puzzle can be drawn without running the generator."""
+        bank = PuzzleBank.get()
+        if bank is not None and bank.remaining(variant, difficulty, block_size):
+            return True
+        return PuzzleCache.has_ready(variant, difficulty, block_size)
+
+    def _draw_puzzle(self, difficulty: float, request: GenerationRequest | None):
+        """Prefer the puzzle bank, then prefetched puzzles, then generate."""
+        block_size = self.rules.block_size
+        bank = PuzzleBank.get()
+        drawn = bank.draw(self.variant, difficulty, block_size) if bank else None
+        if drawn:
+            # Banked puzzles are shared by every install, disguise them
+            return random_isomorph(*drawn, block_size, self.rules.diagonal)
+        return PuzzleCache.take(
+            self.variant, difficulty, block_size
+        ) or self.generator.generate(difficulty, request=request)
 
     @classmethod
     def _load_from_file_common(
         cls,
         *,
         filename: str | None,
-        rules: Any,
-        generator: Any,
+        rules_cls: type,
+        generator_cls: type,
     ) -> Self | None:
         filename = filename or _get_save_path()
-        if not os.path.exists(filename):
+        state = SaveIndex.shared().take_state(filename)
+        if state is None:
             return None
 
-        with open(filename, "r", encoding="utf-8") as f:
-            state = json.load(f)
-
         self = cls.__new__(cls)
-        self.rules = rules
-        self.generator = generator
+        # Saves from before other board sizes existed are all 9x9
+        block_size = state.get("block_size", 3)
+        self.rules = rules_cls(block_size)
+        self.generator = generator_cls(block_size)
         self.difficulty = state["difficulty"]
         self.difficulty_label = state.get("difficulty_label", "Unknown")
 
@@ -97,125 +182,314 @@ class BoardBase(ABC):
             prefs.general_defaults,
         )
         self.variant = state.get("variant", "Unknown")
-        self.puzzle = state["puzzle"]  # The default board shown to the user
-        self.solution = state["solution"]
-        self.user_inputs = state["user_inputs"]
-        self.notes = [[set(n) for n in row] for row in state["notes"]]
+        self.state = BoardState(self.rules.size, self.rules.topology)
+        self.history = MoveHistory()
+        # Binary saves hold the grids packed, JSON ones as nested lists
+        packed = isinstance(state["puzzle"], bytes)
+        if packed:
+            self.state.load_packed(
+                state["puzzle"], state["solution"], state["user_inputs"], state["notes"]
+            )
+            self.history.load_moves(state["history"])
+        else:
+            self.puzzle = state["puzzle"]  # The default board shown to the user
+            self.solution = state["solution"]
+            self.user_inputs = state["user_inputs"]
+            self.notes = state["notes"]
+            self.history.load(state.get("history", {}))
+        self._move = None
+        self.journal = SaveJournal(state.get("journal_epoch"))
+        self._replay_journal(filename)
+        if not packed or "recovered_from" in state:
+            # Rewrite JSON saves as binary ones, and replace a damaged save,
+            # with a full snapshot on the next save
+            self.journal = SaveJournal()
+        self.validity = ValidityChecker(self.rules.topology)
+        self.hints = HintEngine(self.rules.topology)
 
         prefs.variant_defaults.update(self.variant_preferences)
         prefs.general_defaults.update(self.general_preferences)
         return self
 
+    def _replay_journal(self, filename: str):
+        """Apply the moves, undos and redos journaled since the snapshot."""
+        entries = read_journal(filename, self.journal.epoch)
+        if entries is None:
+            # The journal on disk follows another snapshot, or there is none,
+            # e.g. after a crash between the two writes. Appending to it would
+            # lose the moves, so save a new snapshot first.
+            self.journal = SaveJournal()
+            return
+        moves = 0
+        for kind, changes in entries:
+            if kind == "move":
+                for i, _, entry, _, mask in changes:
+                    self._restore(i, entry, mask)
+                self.history.record(changes)
+                moves += 1
+            elif kind == "undo":
+                self._step_back(self.history.undo())
+            else:
+                self._step_forward(self.history.redo())
+        self.journal = SaveJournal(self.journal.epoch, moves)
+
     @classmethod
     def load_from_file(cls, filename: str | None = None) -> Self | None:
         raise NotImplementedError
 
-    def save_to_file(self, filename: str | None = None):
-        path = filename or _get_save_path()
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Copy of everything a save holds, cheap enough to take on the main
+        loop after every move. `save_format.encode_save` turns it into a
+        save.
+        """
         prefs = PreferencesManager.get_preferences()
         if prefs is None:
             raise RuntimeError("Preferences not initialized")
-        state = {
+        state = self.state
+        return {
             "difficulty": self.difficulty,
             "difficulty_label": self.difficulty_label,
-            "variant_preferences": prefs.variant_defaults,
-            "general_preferences": prefs.general_defaults,
+            "variant_preferences": copy.deepcopy(prefs.variant_defaults),
+            "general_preferences": copy.deepcopy(prefs.general_defaults),
             "variant": self.variant,
-            "puzzle": self.puzzle,
-            "solution": self.solution,
-            "user_inputs": self.user_inputs,
-            "notes": [[list(n) for n in row] for row in self.notes],
+            "block_size": self.rules.block_size,
+            "size": state.size,
+            "puzzle": bytes(state.puzzle),
+            "solution": bytes(state.solution),
+            "user_inputs": bytes(state.inputs),
+            "notes": state.notes[:],
+            "history": self.history.moves(),
+            "journal_epoch": self.journal.epoch,
         }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(state, f)
+
+    @staticmethod
+    def write_snapshot(path: str, snapshot: dict[str, Any]):
+        write_save(path, encode_save(snapshot))
+
+    def save_to_file(self, filename: str | None = None):
+        """Save a full snapshot right away, see `save` for saving during play."""
+        path = filename or _get_save_path()
+        self.journal.compact(self.snapshot)
+        self.journal.write(path, self.write_snapshot)
+        SaveIndex.shared().invalidate(path)
+
+    def save(self):
+        """
+        Save in the background, usually by appending the latest moves to
+        the journal, see `SaveJournal`. Bursts of saves are written once,
+        see `SaveService`; flush it before reading the save back.
+        """
+        if self.journal.needs_compaction():
+            self.journal.compact(self.snapshot)
+        self._schedule_write()
+
+    def compact(self):
+        """
+        Save in the background as a new snapshot, after changes the journal
+        doesn't cover, like preferences, and before leaving the game.
+        """
+        self.journal.compact(self.snapshot)
+        self._schedule_write()
+
+    def _schedule_write(self):
+        path = _get_save_path()
+        SaveService.shared().schedule(
+            path,
+            lambda: self.journal.write(path, self.write_snapshot),
+            sync=lambda: self.journal.sync(path),
+        )
+
+    def begin_move(self) -> bool:
+        """
+        Start recording every entry and note change as one undoable move,
+        until `commit_move`. False, and nothing to commit, if a move is
+        already being recorded; the changes then join that move.
+        """
+        if self._move is not None:
+            return False
+        self._move = {}
+        return True
+
+    def commit_move(self) -> list[tuple[int, int, int, int, int]]:
+        """Record the current move, returning its changes, see `MoveHistory`."""
+        before, self._move = self._move or {}, None
+        inputs, notes = self.state.inputs, self.state.notes
+        changes = [
+            (i, entry, inputs[i], mask, notes[i])
+            for i, (entry, mask) in sorted(before.items())
+            if (entry, mask) != (inputs[i], notes[i])
+        ]
+        self.history.record(changes)
+        if changes:
+            self.journal.record_move(changes)
+        return changes
+
+    @contextmanager
+    def move(self):
+        """
+        Record the changes made inside the block as one move, see
+        `begin_move`. Yields a list that holds the recorded changes once
+        the block is left, empty if nothing changed or the block joined an
+        outer move.
+        """
+        changes = []
+        if not self.begin_move():
+            yield changes
+            return
+        try:
+            yield changes
+        finally:
+            changes += self.commit_move()
+
+    def _remember(self, cells):
+        """Keep the state of `cells` from before the current move."""
+        move = self._move
+        if move is None:
+            return
+        inputs, notes = self.state.inputs, self.state.notes
+        for i in cells:
+            if i not in move:
+                move[i] = (inputs[i], notes[i])
+
+    def undo(self) -> list[tuple[int, int]]:
+        """Revert the latest move, returning the (row, col) it touched."""
+        changes = self.history.undo()
+        if changes:
+            self.journal.record_undo()
+        return self._step_back(changes)
+
+    def redo(self) -> list[tuple[int, int]]:
+        """Apply the latest undone move again, returning the (row, col) it touched."""
+        changes = self.history.redo()
+        if changes:
+            self.journal.record_redo()
+        return self._step_forward(changes)
+
+    def _step_back(self, changes) -> list[tuple[int, int]]:
+        return [self._restore(i, old, mask) for i, old, _, mask, _ in changes or ()]
+
+    def _step_forward(self, changes) -> list[tuple[int, int]]:
+        return [self._restore(i, new, mask) for i, _, new, _, mask in changes or ()]
+
+    def _restore(self, i: int, entry: int, mask: int) -> tuple[int, int]:
+        state = self.state
+        state.write(state.inputs, i, entry)
+        state.notes[i] = mask
+        return divmod(i, state.size)
 
     def set_input(self, row, col, value):
-        self.user_inputs[row][col] = value
+        state = self.state
+        i = row * state.size + col
+        self._remember((i,))
+        state.write(state.inputs, i, encode_digit(value))
 
     def clear_input(self, row, col):
-        self.user_inputs[row][col] = None
+        state = self.state
+        i = row * state.size + col
+        self._remember((i,))
+        state.write(state.inputs, i, 0)
 
-    def get_correct_value(self, row, col):
-        return self.solution[row][col]
+    def get_correct_value(self, row, col) -> int | None:
+        return DIGIT_INTS[self.state.solution[row * self.state.size + col]]
 
-    def get_input(self, row, col) -> str:
-        return self.user_inputs[row][col]
+    def get_input(self, row, col) -> str | None:
+        return DIGIT_STRS[self.state.inputs[row * self.state.size + col]]
+
+    def get_clue(self, row, col) -> str | None:
+        return DIGIT_STRS[self.state.puzzle[row * self.state.size + col]]
 
     def toggle_note(self, row: int, col: int, value: str):
         """Add the note if not present; remove it if already present."""
-        if value in self.notes[row][col]:
-            self.notes[row][col].remove(value)
-        else:
-            self.notes[row][col].add(value)
+        i = row * self.state.size + col
+        self._remember((i,))
+        self.state.notes[i] ^= 1 << (int(value) - 1)
+
+    def clear_notes(self, row: int, col: int):
+        i = row * self.state.size + col
+        self._remember((i,))
+        self.state.notes[i] = 0
+
+    def fill_all_notes(self) -> list[tuple[int, int]]:
+        """
+        Note every candidate of every empty cell, replacing their notes, as
+        one move. Returns the (row, col) whose notes changed.
+        """
+        state = self.state
+        candidates = state.candidates()
+        changed = [
+            i
+            for i, mask in enumerate(candidates)
+            if not (state.puzzle[i] or state.inputs[i]) and state.notes[i] != mask
+        ]
+        with self.move():
+            self._remember(changed)
+            for i in changed:
+                state.notes[i] = candidates[i]
+        return [self.rules.topology.coords[i] for i in changed]
 
     def is_clue(self, row, col):
-        return self.puzzle[row][col] is not None
+        return self.state.puzzle[row * self.state.size + col] != 0
 
     @abstractmethod
     def is_solved(self) -> bool:
         pass
 
-    def get_notes(self, row: int, col: int) -> set:
+    def get_notes(self, row: int, col: int) -> NoteSet:
         """Return the set of notes for a cell."""
-        return self.notes[row][col]
+        return NoteSet(self.state.notes, row * self.state.size + col)
 
     def remove_note_from_related(self, row: int, col: int, value: str):
-        """Remove `value` from notes of all cells in the same row, col, and block."""
-        size = self.rules.size
-        block_size = self.rules.block_size
-        affected = set()
-        diagonals = True if self.variant == "diagonal" else False
-
-        # row and column
-        for i in range(size):
-            affected.add((row, i))
-            affected.add((i, col))
-
-        # block
-        br, bc = (row // block_size) * block_size, (col // block_size) * block_size
-        for r in range(br, br + block_size):
-            for c in range(bc, bc + block_size):
-                affected.add((r, c))
-
-        # diagonals (diagonal variant)
-        if diagonals:
-            if row == col:
-                for i in range(size):
-                    affected.add((i, i))
-            if row + col == size - 1:
-                for i in range(size):
-                    affected.add((i, size - 1 - i))
-
-        for r, c in affected:
-            self.notes[r][c].discard(value)
-
-        return affected
+        """
+        Remove `value` from the notes of the cell and all its peers.
+        Returns the (row, col) of every cell whose notes changed.
+        """
+        topology = self.rules.topology
+        i = topology.index(row, col)
+        cells = (i, *topology.peers[i])
+        self._remember(cells)
+        changed = self.state.clear_note(cells, value)
+        return {topology.coords[j] for j in changed}
+
+    def blocking_entries(self) -> set[tuple[int, int]]:
+        """
+        (row, col) of the entries that leave the puzzle without a solution,
+        judged from the clues and entries alone, see `ValidityOracle`.
+        """
+        state, coords = self.state, self.rules.topology.coords
+        blocking = self.validity.oracle.blocking_entries(state.puzzle, state.inputs)
+        return {coords[i] for i in blocking}
+
+    def is_solvable(self) -> bool:
+        return not self.blocking_entries()
+
+    def check_blocking_entries(self, callback):
+        """
+        Like `blocking_entries`, but computed off the main loop, which then
+        calls `callback(cells)`. Only the latest check reports back.
+        """
+        coords = self.rules.topology.coords
+        self.validity.submit(
+            self.state.puzzle,
+            self.state.inputs,
+            lambda blocking: callback({coords[i] for i in blocking}),
+        )
+
+    def next_hint(self, use_notes: bool = True) -> Hint | None:
+        """
+        The easiest next deduction from the clues, entries and, unless
+        `use_notes` is False, the notes, or None when none is found. Entries
+        that leave the puzzle unsolvable come first, as a "mistake" hint.
+        """
+        blocking = sorted(self.blocking_entries())
+        if blocking:
+            return Hint(
+                "mistake",
+                eliminations=[(r, c, int(self.get_input(r, c))) for r, c in blocking],
+            )
+        return self.hints.next_hint(self.state, use_notes)
 
     def get_remaining_valid_inputs(self) -> dict:
-        if not self.puzzle or not self.user_inputs:
-            return {}
-
-        # Count numbers in solution
-        remaining_valid_inputs = {i: 9 for i in range(1, 10)}
-
-        # Count numbers in the user input
-        for row in range(0, 9):
-            for column in range(0, 9):
-                if not self.get_input(row, column):
-                    continue
-                if not int(self.get_input(row, column)) == self.get_correct_value(
-                    row, column
-                ):
-                    continue
-                else:
-                    remaining_valid_inputs[int(self.get_input(row, column))] -= 1
-
-        # Substitute remaining_valid_inputs from pre-set values in the puzzle
-        for row in range(0, 9):
-            for column in range(0, 9):
-                if not self.puzzle[row][column]:
-                    continue
-                remaining_valid_inputs[self.puzzle[row][column]] -= 1
-
-        return remaining_valid_inputs
+        """How many more times each digit still has to be placed correctly."""
+        state = self.state
+        return {d: state.size - state.correct[d] for d in range(1, state.size + 1)}
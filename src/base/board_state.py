@@ -0,0 +1,415 @@
+# board_state.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+from array import array
+from collections.abc import Set
+from functools import lru_cache
+from .topology import Topology, get_topology
+
+# Lookup tables from the stored byte to what the board API hands out
+DIGIT_INTS = (None, *range(1, 256))
+DIGIT_STRS = (None, *(str(d) for d in range(1, 256)))
+
+
+def encode_digit(value) -> int:
+    """The stored byte for a digit given as int, str or None (0 = empty)."""
+    return int(value) if value else 0
+
+
+def digit_bit(value) -> int:
+    """The note mask bit of a digit given as int or str."""
+    return 1 << (int(value) - 1)
+
+
+def mask_of(digits) -> int:
+    """Note mask of an iterable of digits given as ints or strings."""
+    mask = 0
+    for value in digits:
+        mask |= digit_bit(value)
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def digits_of(mask: int) -> tuple[str, ...]:
+    """Digit strings set in a note mask, in ascending order."""
+    digits = []
+    while mask:
+        bit = mask & -mask
+        digits.append(DIGIT_STRS[bit.bit_length()])
+        mask ^= bit
+    return tuple(digits)
+
+
+class BoardState:
+    """
+    Flat storage of one game: one byte per cell for the clues, the solution
+    and the user's entries, row by row, with 0 marking an empty cell, plus
+    one pencil-note mask per cell with bit d-1 set for note d.
+
+    Writes that go through `write` or `assign` also keep running counts,
+    so conflict, remaining-digit and solved checks never walk the grid:
+    `unit_counts[u * size + d - 1]` is how often digit d is shown (as a
+    clue or entry) in unit u, `correct[d]` how many cells hold d as a clue
+    or correct entry, and `unsolved` how many cells don't.
+    """
+
+    __slots__ = (
+        "size",
+        "puzzle",
+        "solution",
+        "inputs",
+        "notes",
+        "topology",
+        "unit_counts",
+        "correct",
+        "unsolved",
+    )
+
+    def __init__(self, size: int, topology: Topology | None = None):
+        self.size = size
+        self.puzzle = bytearray(size * size)
+        self.solution = bytearray(size * size)
+        self.inputs = bytearray(size * size)
+        # 16 bits per cell cover every digit up to 16x16 boards
+        self.notes = array("H" if size <= 16 else "L", [0]) * (size * size)
+        self.topology = topology or get_topology(math.isqrt(size))
+        self.unit_counts = array("H", [0]) * (len(self.topology.units) * size)
+        self.correct = array("H", [0]) * (size + 1)
+        self.unsolved = size * size
+
+    def write(self, cells: bytearray, i: int, digit: int):
+        """Store `digit` in cell `i` of one of the grids, updating the counts."""
+        self._count(i, -1)
+        cells[i] = digit
+        self._count(i, 1)
+
+    def assign(self, cells: bytearray, grid):
+        """Overwrite a whole grid, see `fill`, and recount."""
+        BoardState.fill(cells, grid)
+        self.recount()
+
+    def recount(self):
+        self.unit_counts[:] = array("H", [0]) * len(self.unit_counts)
+        self.correct[:] = array("H", [0]) * len(self.correct)
+        self.unsolved = 0
+        for i in range(self.size * self.size):
+            self._count(i, 1)
+
+    def _count(self, i: int, sign: int):
+        shown = self.puzzle[i] or self.inputs[i]
+        if shown:
+            counts, offset = self.unit_counts, shown - 1
+            for u in self.topology.cell_units[i]:
+                counts[u * self.size + offset] += sign
+        entry = self.inputs[i]
+        placed = self.puzzle[i] or (entry if entry == self.solution[i] else 0)
+        if placed:
+            self.correct[placed] += sign
+        else:
+            self.unsolved += sign
+
+    def shown_elsewhere(self, i: int, digit: int) -> bool:
+        """Whether a peer of cell `i` shows `digit`."""
+        counts, offset = self.unit_counts, digit - 1
+        own = 1 if (self.puzzle[i] or self.inputs[i]) == digit else 0
+        return any(
+            counts[u * self.size + offset] > own for u in self.topology.cell_units[i]
+        )
+
+    def candidates(self) -> list[int]:
+        """
+        Note mask of the digits each empty cell can still take given what
+        its units show, 0 for filled cells. Built from `unit_counts`, so one
+        pass over the units and one OR per unit of each empty cell.
+        """
+        size, counts = self.size, self.unit_counts
+        shown = []
+        for base in range(0, len(counts), size):
+            mask = 0
+            for d in range(size):
+                if counts[base + d]:
+                    mask |= 1 << d
+            shown.append(mask)
+
+        full = (1 << size) - 1
+        puzzle, inputs = self.puzzle, self.inputs
+        masks = [0] * (size * size)
+        for i, units in enumerate(self.topology.cell_units):
+            if puzzle[i] or inputs[i]:
+                continue
+            taken = 0
+            for u in units:
+                taken |= shown[u]
+            masks[i] = full & ~taken
+        return masks
+
+    def clear_note(self, cells, value) -> list[int]:
+        """Remove note `value` from `cells`, returning the cells that had it."""
+        bit = digit_bit(value)
+        notes = self.notes
+        changed = [i for i in cells if notes[i] & bit]
+        for i in changed:
+            notes[i] ^= bit
+        return changed
+
+    def intersect_notes(self, i: int, mask: int) -> bool:
+        """Keep only the notes of cell `i` in `mask`, True if any were removed."""
+        kept = self.notes[i] & mask
+        changed = kept != self.notes[i]
+        self.notes[i] = kept
+        return changed
+
+    def count_notes(self, i: int) -> int:
+        return self.notes[i].bit_count()
+
+    def load_notes(self, grid):
+        """Replace all notes from a 2D grid of digit iterables."""
+        masks = [mask_of(digits) for row in grid for digits in row]
+        if len(masks) != len(self.notes):
+            raise ValueError(f"Expected {len(self.notes)} cells, got {len(masks)}")
+        self.notes[:] = array(self.notes.typecode, masks)
+
+    def load_packed(self, puzzle: bytes, solution: bytes, inputs: bytes, notes):
+        """Overwrite all grids from packed bytes and note masks, then recount."""
+        for cells, packed in (
+            (self.puzzle, puzzle),
+            (self.solution, solution),
+            (self.inputs, inputs),
+        ):
+            if len(packed) != len(cells):
+                raise ValueError(f"Expected {len(cells)} cells, got {len(packed)}")
+            cells[:] = packed
+        if len(notes) != len(self.notes):
+            raise ValueError(f"Expected {len(self.notes)} cells, got {len(notes)}")
+        self.notes[:] = array(self.notes.typecode, notes)
+        self.recount()
+
+    @staticmethod
+    def pack(grid) -> bytearray:
+        """Encode a 2D grid of ints, strings or None."""
+        return bytearray(encode_digit(v) for row in grid for v in row)
+
+    @staticmethod
+    def fill(cells: bytearray, grid):
+        """Overwrite `cells` with `grid`, which must have the same shape."""
+        packed = BoardState.pack(grid)
+        if len(packed) != len(cells):
+            raise ValueError(f"Expected {len(cells)} cells, got {len(packed)}")
+        cells[:] = packed
+
+
+class GridView:
+    """
+    2D list-like view over one of the `BoardState` arrays, so existing code
+    can keep using `grid[row][col]`. Reads decode through `table`, writes
+    store the canonical byte, through `state` when given so its counts
+    stay current.
+    """
+
+    __slots__ = ("cells", "size", "table", "state")
+
+    def __init__(
+        self, cells: bytearray, size: int, table, state: BoardState | None = None
+    ):
+        self.cells = cells
+        self.size = size
+        self.table = table
+        self.state = state
+
+    def __getitem__(self, row: int) -> "RowView":
+        if not -self.size <= row < self.size:
+            raise IndexError(row)
+        offset = (row % self.size) * self.size
+        return RowView(self.cells, offset, self.size, self.table, self.state)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self[r] for r in range(self.size))
+
+    def __bool__(self):
+        return self.size > 0
+
+    def __eq__(self, other):
+        if isinstance(other, GridView):
+            return self.cells == other.cells
+        try:
+            return self.cells == BoardState.pack(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    __hash__ = None
+
+    def to_list(self) -> list[list]:
+        return [row.to_list() for row in self]
+
+    def __repr__(self):
+        return f"GridView({self.to_list()!r})"
+
+
+class RowView:
+    """One row of a `GridView`."""
+
+    __slots__ = ("cells", "offset", "size", "table", "state")
+
+    def __init__(
+        self,
+        cells: bytearray,
+        offset: int,
+        size: int,
+        table,
+        state: BoardState | None = None,
+    ):
+        self.cells = cells
+        self.offset = offset
+        self.size = size
+        self.table = table
+        self.state = state
+
+    def _index(self, col: int) -> int:
+        if not -self.size <= col < self.size:
+            raise IndexError(col)
+        return self.offset + col % self.size
+
+    def __getitem__(self, col: int):
+        return self.table[self.cells[self._index(col)]]
+
+    def __setitem__(self, col: int, value):
+        if self.state is None:
+            self.cells[self._index(col)] = encode_digit(value)
+        else:
+            self.state.write(self.cells, self._index(col), encode_digit(value))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        table = self.table
+        return (table[v] for v in self.cells[self.offset:self.offset + self.size])
+
+    def __eq__(self, other):
+        if isinstance(other, RowView):
+            other = other.to_list()
+        try:
+            return self.to_list() == [self.table[encode_digit(v)] for v in other]
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    __hash__ = None
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def __repr__(self):
+        return f"RowView({self.to_list()!r})"
+
+
+class NoteSet(Set):
+    """
+    The pencil notes of one cell as a read-only set of digit strings; the
+    board's `toggle_note` and `clear_notes` change them, so every change
+    is recorded.
+    """
+
+    __slots__ = ("notes", "index")
+
+    def __init__(self, notes: array, index: int):
+        self.notes = notes
+        self.index = index
+
+    @property
+    def mask(self) -> int:
+        return self.notes[self.index]
+
+    def __contains__(self, value):
+        try:
+            digit = int(value)
+        except (TypeError, ValueError):
+            return False
+        return digit > 0 and bool(self.notes[self.index] >> (digit - 1) & 1)
+
+    def __iter__(self):
+        return iter(digits_of(self.notes[self.index]))
+
+    def __len__(self):
+        return self.notes[self.index].bit_count()
+
+    def __repr__(self):
+        return f"NoteSet({set(self)!r})"
+
+
+class NotesView:
+    """2D list-like view over `BoardState.notes`, one `NoteSet` per cell."""
+
+    __slots__ = ("notes", "size")
+
+    def __init__(self, notes: array, size: int):
+        self.notes = notes
+        self.size = size
+
+    def __getitem__(self, row: int) -> "NotesRowView":
+        if not -self.size <= row < self.size:
+            raise IndexError(row)
+        return NotesRowView(self.notes, (row % self.size) * self.size, self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self[r] for r in range(self.size))
+
+    def __eq__(self, other):
+        if isinstance(other, NotesView):
+            return self.notes == other.notes
+        try:
+            return list(self.notes) == [mask_of(d) for row in other for d in row]
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"NotesView({[[set(cell) for cell in row] for row in self]!r})"
+
+
+class NotesRowView:
+    """One row of a `NotesView`."""
+
+    __slots__ = ("notes", "offset", "size")
+
+    def __init__(self, notes: array, offset: int, size: int):
+        self.notes = notes
+        self.offset = offset
+        self.size = size
+
+    def _index(self, col: int) -> int:
+        if not -self.size <= col < self.size:
+            raise IndexError(col)
+        return self.offset + col % self.size
+
+    def __getitem__(self, col: int) -> NoteSet:
+        return NoteSet(self.notes, self._index(col))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (NoteSet(self.notes, self.offset + c) for c in range(self.size))
@@ -16,3 +16,19 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
+
+EASY_DIFFICULTY = 0.2
+MEDIUM_DIFFICULTY = 0.5
+HARD_DIFFICULTY = 0.7
+EXTREME_DIFFICULTY = 0.9
+
+DIFFICULTY_LEVELS = (
+    EASY_DIFFICULTY,
+    MEDIUM_DIFFICULTY,
+    HARD_DIFFICULTY,
+    EXTREME_DIFFICULTY,
+)
+
+# Block sizes offered for new games, each board is block_size² cells wide
+BLOCK_SIZES = (2, 3, 4, 5)
+DEFAULT_BLOCK_SIZE = 3
@@ -18,34 +18,71 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from abc import ABC, abstractmethod
-import multiprocessing as mp
+from .constants import HARD_DIFFICULTY
+from .generator_pool import GenerationRequest, GeneratorPool, default_racers
+from .puzzle_bank import decode_record
 
 
 class GeneratorBase(ABC):
-    """Abstract puzzle generator with optional multiprocessing."""
+    """Abstract puzzle generator backed by the shared worker pool."""
 
-    def generate(self, difficulty: float, timeout: int = 5):
+    block_size: int = 3
+    diagonal: bool = False
+    # Match puzzles to the logical grade of their difficulty level instead
+    # of only removing that share of the clues
+    graded: bool = True
+    # Difficulty from which several seeds race each other, None disables it
+    race_threshold: float | None = HARD_DIFFICULTY
+
+    def __init__(self, block_size: int | None = None):
+        if block_size is not None:
+            self.block_size = block_size
+
+    def generate(
+        self,
+        difficulty: float,
+        timeout: int | None = None,
+        racers: int | None = None,
+        request: GenerationRequest | None = None,
+    ):
         """
-        Run the variant's `_generate_impl` in a subprocess with timeout.
+        Run the variant's `_generate_impl` on warm pool workers with timeout,
+        5 seconds by default and 30 from 16x16 on.
+        Hard puzzles race several seeds and keep the first one to finish.
+        Cancelling `request` kills the workers and raises GenerationCancelled.
         Returns (puzzle, solution).
         """
-        queue = mp.Queue()
-        process = mp.Process(target=self._generate_worker, args=(queue, difficulty))
-        process.start()
-        process.join(timeout)
-
-        if process.is_alive():
-            process.terminate()
-            process.join()
-            raise TimeoutError("Puzzle generation timed out")
-
-        if not queue.empty():
-            return queue.get()
-        raise RuntimeError("Failed to generate puzzle")
-
-    def _generate_worker(self, queue, difficulty: float):
-        puzzle, solution = self._generate_impl(difficulty)
-        queue.put((puzzle, solution))
+        if timeout is None:
+            timeout = 5 if self.block_size <= 3 else 30
+        if racers is None:
+            racers = self.racers_for(difficulty)
+        pool = GeneratorPool.shared()
+        return decode_record(pool.run(self, difficulty, timeout, racers, request)[0])
+
+    def generate_many(
+        self,
+        difficulty: float,
+        count: int,
+        timeout: int = 30,
+        request: GenerationRequest | None = None,
+    ) -> list[bytes]:
+        """
+        Generate `count` puzzles on a single worker, in as few round-trips
+        as the result buffer allows. Returns packed records, decode them
+        with `decode_record` when they are needed.
+        """
+        pool = GeneratorPool.shared()
+        records: list[bytes] = []
+        while len(records) < count:
+            records += pool.run(
+                self, difficulty, timeout, request=request, count=count - len(records)
+            )
+        return records
+
+    def racers_for(self, difficulty: float) -> int:
+        if self.race_threshold is None or difficulty < self.race_threshold:
+            return 1
+        return default_racers()
 
     @abstractmethod
     def _generate_impl(
@@ -0,0 +1,342 @@
+# generator_pool.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import multiprocessing as mp
+import os
+import random
+import struct
+import threading
+import time
+from multiprocessing.connection import wait
+from .puzzle_bank import encode_record
+
+# How often blocked callers look at their cancellation token, in seconds
+_CANCEL_POLL_INTERVAL = 0.05
+# Shared result buffer per worker, sixteen 9x9 records
+RESULT_BUFFER_SIZE = 16 * 162
+# Reply header: status, record count, record size
+_REPLY = struct.Struct("<BHH")
+_OK, _ERROR = 0, 1
+
+
+def default_pool_size() -> int:
+    """Leave one core for the UI, but never use more than four workers."""
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def default_racers() -> int:
+    """One racer per core that is not needed by the UI."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class GenerationCancelled(Exception):
+    """Raised by `GeneratorPool.run` when its request was cancelled."""
+
+
+class GenerationRequest:
+    """
+    Cancellation token for one generation. Cancelling is thread-safe: the
+    pool notices within `_CANCEL_POLL_INTERVAL` and kills the workers that
+    are still generating for this request.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise GenerationCancelled()
+
+
+def _worker_main(conn, buffer):
+    """
+    Serve generation requests until the parent closes the pipe.
+
+    Each request is `(generator, difficulty, seed, count)`. Results are
+    written as packed records (see `encode_record`) into the shared
+    `buffer`, and only a `_REPLY` header goes back over the pipe, followed
+    by the error message if generation failed.
+    """
+    slots = memoryview(buffer).cast("B")
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        generator, difficulty, seed, count = request
+        random.seed(seed)
+        try:
+            reply = _REPLY.pack(_OK, *_fill_slots(slots, generator, difficulty, count))
+        except Exception as e:  # report instead of dying, keep the worker warm
+            reply = _REPLY.pack(_ERROR, 0, 0) + repr(e).encode()
+        try:
+            conn.send_bytes(reply)
+        except (BrokenPipeError, OSError):
+            break
+    conn.close()
+
+
+def _fill_slots(slots, generator, difficulty, count) -> tuple[int, int]:
+    """Generate up to `count` records into `slots`, as many as fit."""
+    record = encode_record(*generator._generate_impl(difficulty))
+    record_size = len(record)
+    if record_size > len(slots):
+        raise ValueError(f"{record_size} byte record does not fit the result buffer")
+    count = min(count, len(slots) // record_size)
+    slots[:record_size] = record
+    for i in range(1, count):
+        record = encode_record(*generator._generate_impl(difficulty))
+        slots[i * record_size:(i + 1) * record_size] = record
+    return count, record_size
+
+
+class _Worker:
+    """
+    One long-lived generator process, the parent end of its pipe and the
+    shared memory it writes results into.
+    """
+
+    def __init__(self):
+        self.conn, child_conn = mp.Pipe()
+        self.buffer = mp.RawArray("B", RESULT_BUFFER_SIZE)
+        self.slots = memoryview(self.buffer).cast("B")
+        self.process = mp.Process(
+            target=_worker_main, args=(child_conn, self.buffer), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+
+class GeneratorPool:
+    """
+    Lazily started pool of warm generator processes shared by every variant.
+
+    Workers are spawned on first use and then kept alive, so each request
+    only pays for generation itself. Workers that time out, crash or lose
+    a race are killed and replaced with a fresh process.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, size: int | None = None):
+        self.size = size or default_pool_size()
+        self._idle: list[_Worker] = []
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @classmethod
+    def shared(cls) -> "GeneratorPool":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def shutdown_shared(cls):
+        with cls._shared_lock:
+            pool, cls._shared = cls._shared, None
+        if pool is not None:
+            pool.shutdown()
+
+    def run(
+        self,
+        generator,
+        difficulty: float,
+        timeout: float = 5,
+        racers: int = 1,
+        request: GenerationRequest | None = None,
+        count: int = 1,
+    ) -> list[bytes]:
+        """
+        Run `generator._generate_impl(difficulty)` on up to `racers` pool
+        workers with different seeds. The first success wins and the other
+        attempts are cancelled.
+
+        Returns between one and `count` packed records, fewer when they do
+        not fit a worker's result buffer; decode them with `decode_record`.
+        Raises GenerationCancelled as soon as `request` is cancelled.
+        """
+        pending = {}
+        for worker in self._acquire_many(racers, request):
+            seed = random.getrandbits(64)
+            try:
+                worker.conn.send((generator, difficulty, seed, count))
+            except OSError:
+                self._replace(worker)
+                continue
+            pending[worker.conn] = worker
+
+        result, error = self._collect_first(
+            pending, time.monotonic() + timeout, request
+        )
+
+        for conn, worker in pending.items():
+            # Keep racers that finished in the meantime, cancel the rest
+            if result is not None and conn.poll(0):
+                self._receive(worker)
+            else:
+                self._replace(worker)
+
+        if result is not None:
+            return result
+        if request is not None:
+            request.raise_if_cancelled()
+        if error is not None or not pending:
+            raise RuntimeError(f"Failed to generate puzzle: {error}")
+        raise TimeoutError("Puzzle generation timed out")
+
+    def _collect_first(self, pending, deadline, request):
+        """Wait for the first successful reply, removing answered workers."""
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (request is not None and request.cancelled):
+                break
+            if request is not None:
+                remaining = min(remaining, _CANCEL_POLL_INTERVAL)
+            for conn in wait(list(pending), remaining):
+                status, payload = self._receive(pending.pop(conn))
+                if status == "ok":
+                    return payload, None
+                error = payload
+        return None, error
+
+    def _receive(self, worker: _Worker):
+        """Read a reply and give the worker back, replacing it if it died."""
+        try:
+            reply = worker.conn.recv_bytes()
+        except (EOFError, OSError):
+            self._replace(worker)
+            return "error", "generator worker died"
+        status, count, size = _REPLY.unpack_from(reply)
+        if status == _OK:
+            records = [
+                bytes(worker.slots[i * size:(i + 1) * size]) for i in range(count)
+            ]
+        self._release(worker)
+        if status != _OK:
+            return "error", reply[_REPLY.size:].decode()
+        return "ok", records
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+
+    def _acquire_many(
+        self, count: int, request: GenerationRequest | None = None
+    ) -> list[_Worker]:
+        """Wait for one worker, then take up to `count - 1` more if free."""
+        workers = [self._acquire(request=request)]
+        while len(workers) < count and (worker := self._acquire(block=False)):
+            workers.append(worker)
+        return workers
+
+    def _acquire(
+        self, block: bool = True, request: GenerationRequest | None = None
+    ) -> _Worker | None:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Generator pool is shut down")
+                if request is not None:
+                    request.raise_if_cancelled()
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.is_alive():
+                        return worker
+                    logging.warning("Generator worker died while idle, replacing")
+                    worker.kill()
+                    self._count -= 1
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                if not block:
+                    return None
+                self._cond.wait(
+                    _CANCEL_POLL_INTERVAL if request is not None else None
+                )
+        try:
+            return _Worker()
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: _Worker):
+        with self._cond:
+            if self._closed:
+                self._count -= 1
+            else:
+                self._idle.append(worker)
+                self._cond.notify()
+                return
+        worker.stop()
+
+    def _replace(self, worker: _Worker):
+        """Kill a stuck or crashed worker and keep a warm one in its place."""
+        worker.kill()
+        with self._cond:
+            self._count -= 1
+            if self._closed:
+                return
+            self._count += 1
+        try:
+            fresh = _Worker()
+        except Exception:
+            logging.exception("Failed to respawn generator worker")
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            return
+        self._release(fresh)
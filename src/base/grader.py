@@ -0,0 +1,385 @@
+# grader.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+import random
+from functools import lru_cache
+from itertools import combinations
+from .puzzle_bank import difficulty_bucket
+from .solver import get_solver, unflatten
+from .topology import get_topology
+
+# Score of the hardest technique allowed for each difficulty level, in the
+# order of DIFFICULTY_LEVELS. A puzzle belongs to the first level whose
+# ceiling is not below its grade.
+GRADE_CEILINGS = (1.2, 2.0, 3.8, math.inf)
+
+# Longest chain of bivalue cells tried by the XY-chain technique
+_MAX_CHAIN_LENGTH = 8
+
+
+def _bits(mask: int):
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+class Step:
+    """
+    One logical deduction: digits to place and candidates to remove, both
+    as (cell, digit) pairs on the flat grid.
+    """
+
+    __slots__ = ("technique", "score", "placements", "eliminations")
+
+    def __init__(self, technique: str, score: float, placements=(), eliminations=()):
+        self.technique = technique
+        self.score = score
+        self.placements = tuple(placements)
+        self.eliminations = tuple(eliminations)
+
+    def __repr__(self):
+        return (
+            f"Step({self.technique!r}, placements={self.placements}, "
+            f"eliminations={self.eliminations})"
+        )
+
+
+class LogicalGrader:
+    """
+    Solves flat grids (0 = empty) the way a person would, always applying
+    the easiest technique that makes progress, and grades a puzzle by the
+    score of the hardest technique it needed.
+
+    Techniques work on every unit of the topology, so locked candidates
+    and subsets also cover the diagonals of diagonal Sudoku.
+    """
+
+    def __init__(self, block_size: int = 3, diagonal: bool = False):
+        self.block_size = block_size
+        self.size = block_size * block_size
+        self.full = (1 << self.size) - 1
+        topology = get_topology(block_size, diagonal)
+        self.units = topology.units
+        # Sets, since the techniques intersect them
+        self.cell_units = tuple(frozenset(units) for units in topology.cell_units)
+        self.peers = tuple(frozenset(peers) for peers in topology.peers)
+        self.techniques = (
+            ("naked single", 1.0, self._naked_single),
+            ("hidden single", 1.2, self._hidden_single),
+            ("locked candidates", 1.7, self._locked_candidates),
+            ("naked pair", 2.0, lambda cand: self._naked_subset(cand, 2)),
+            ("hidden pair", 2.3, lambda cand: self._hidden_subset(cand, 2)),
+            ("naked triple", 2.6, lambda cand: self._naked_subset(cand, 3)),
+            ("hidden triple", 3.0, lambda cand: self._hidden_subset(cand, 3)),
+            ("x-wing", 3.2, lambda cand: self._fish(cand, 2)),
+            ("xy-wing", 3.4, lambda cand: self._xy_chain(cand, 3, 3)),
+            ("swordfish", 3.8, lambda cand: self._fish(cand, 3)),
+            (
+                "xy-chain",
+                4.2,
+                lambda cand: self._xy_chain(cand, 4, _MAX_CHAIN_LENGTH),
+            ),
+        )
+
+    def candidates(self, cells) -> list[int]:
+        """Candidate bitmask per cell, 0 for filled cells."""
+        cand = [0 if v else self.full for v in cells]
+        for i, value in enumerate(cells):
+            if value:
+                bit = 1 << (value - 1)
+                for j in self.peers[i]:
+                    cand[j] &= ~bit
+        return cand
+
+    def find_next_step(self, cells, cand=None, max_score=math.inf) -> Step | None:
+        """
+        The easiest deduction available, or None when no technique up to
+        `max_score` makes progress.
+        """
+        if cand is None:
+            cand = self.candidates(cells)
+        for name, score, technique in self.techniques:
+            if score > max_score:
+                break
+            found = technique(cand)
+            if found:
+                placements, eliminations = found
+                return Step(name, score, placements, eliminations)
+        return None
+
+    def apply(self, step: Step, cells, cand):
+        """Apply `step` to `cells` and their candidate masks in place."""
+        for i, digit in step.eliminations:
+            cand[i] &= ~(1 << (digit - 1))
+        for i, digit in step.placements:
+            cells[i] = digit
+            cand[i] = 0
+            bit = 1 << (digit - 1)
+            for j in self.peers[i]:
+                cand[j] &= ~bit
+
+    def grade(self, cells, max_score=math.inf) -> float:
+        """
+        Score of the hardest technique needed to solve `cells`, or inf when
+        techniques up to `max_score` cannot solve it.
+        """
+        cells = list(cells)
+        cand = self.candidates(cells)
+        grade = 0.0
+        while not all(cells):
+            if any(not mask for v, mask in zip(cells, cand) if not v):
+                return math.inf
+            step = self.find_next_step(cells, cand, max_score)
+            if step is None:
+                return math.inf
+            grade = max(grade, step.score)
+            self.apply(step, cells, cand)
+        return grade
+
+    def _naked_single(self, cand):
+        for i, mask in enumerate(cand):
+            if mask and not mask & (mask - 1):
+                return ((i, mask.bit_length()),), ()
+        return None
+
+    def _hidden_single(self, cand):
+        for unit in self.units:
+            once = twice = 0
+            for i in unit:
+                twice |= once & cand[i]
+                once |= cand[i]
+            hidden = once & ~twice
+            if hidden:
+                bit = hidden & -hidden
+                for i in unit:
+                    if cand[i] & bit:
+                        return ((i, bit.bit_length()),), ()
+        return None
+
+    def _locked_candidates(self, cand):
+        """A digit confined to the overlap of two units leaves the other one."""
+        for u, unit in enumerate(self.units):
+            present = 0
+            for i in unit:
+                present |= cand[i]
+            for bit in _bits(present):
+                cells = [i for i in unit if cand[i] & bit]
+                if len(cells) > self.block_size:
+                    continue
+                shared = frozenset.intersection(*(self.cell_units[i] for i in cells))
+                for v in shared - {u}:
+                    eliminations = [
+                        (j, bit.bit_length())
+                        for j in self.units[v]
+                        if cand[j] & bit and j not in cells
+                    ]
+                    if eliminations:
+                        return (), eliminations
+        return None
+
+    def _naked_subset(self, cand, k: int):
+        """k cells of a unit sharing k candidates own those digits."""
+        for unit in self.units:
+            empty = [i for i in unit if cand[i]]
+            small = [i for i in empty if 2 <= cand[i].bit_count() <= k]
+            for group in combinations(small, k):
+                digits = 0
+                for i in group:
+                    digits |= cand[i]
+                if digits.bit_count() != k:
+                    continue
+                eliminations = [
+                    (j, bit.bit_length())
+                    for j in empty
+                    if j not in group
+                    for bit in _bits(cand[j] & digits)
+                ]
+                if eliminations:
+                    return (), eliminations
+        return None
+
+    def _hidden_subset(self, cand, k: int):
+        """k digits that fit only the same k cells of a unit own those cells."""
+        for unit in self.units:
+            places = {}
+            for i in unit:
+                for bit in _bits(cand[i]):
+                    places.setdefault(bit, []).append(i)
+            rare = [bit for bit, cells in places.items() if 2 <= len(cells) <= k]
+            for group in combinations(rare, k):
+                cells = {i for bit in group for i in places[bit]}
+                if len(cells) != k:
+                    continue
+                digits = sum(group)
+                eliminations = [
+                    (i, bit.bit_length())
+                    for i in sorted(cells)
+                    for bit in _bits(cand[i] & ~digits)
+                ]
+                if eliminations:
+                    return (), eliminations
+        return None
+
+    def _fish(self, cand, k: int):
+        """X-wing (k=2) and swordfish (k=3) on rows and on columns."""
+        size = self.size
+        for bit in _bits(self.full):
+            for by_row in (True, False):
+                lines = {}
+                for i, mask in enumerate(cand):
+                    if mask & bit:
+                        base, cover = divmod(i, size)
+                        if not by_row:
+                            base, cover = cover, base
+                        lines.setdefault(base, set()).add(cover)
+                bases = [b for b, covers in lines.items() if 2 <= len(covers) <= k]
+                for group in combinations(bases, k):
+                    covers = set().union(*(lines[b] for b in group))
+                    if len(covers) != k:
+                        continue
+                    eliminations = [
+                        (b * size + c if by_row else c * size + b, bit.bit_length())
+                        for b in lines
+                        if b not in group
+                        for c in sorted(lines[b] & covers)
+                    ]
+                    if eliminations:
+                        return (), eliminations
+        return None
+
+    def _xy_chain(self, cand, shortest: int, longest: int):
+        """
+        A chain of `shortest` to `longest` bivalue cells, each seeing the
+        next, where the start being anything but `a` forces the end to be
+        `a`: every cell seeing both ends cannot hold `a`. Three cells make
+        an XY-wing.
+        """
+        bivalue = [i for i, mask in enumerate(cand) if mask.bit_count() == 2]
+        for start in bivalue:
+            for a in _bits(cand[start]):
+                found = self._extend_chain(
+                    cand, bivalue, [start], cand[start] ^ a, a, (shortest, longest)
+                )
+                if found:
+                    return (), found
+        return None
+
+    def _extend_chain(self, cand, bivalue, chain, on: int, target: int, lengths):
+        shortest, longest = lengths
+        if len(chain) >= longest:
+            return None
+        last = chain[-1]
+        for nxt in bivalue:
+            if nxt in chain or not cand[nxt] & on or nxt not in self.peers[last]:
+                continue
+            chain.append(nxt)
+            nxt_on = cand[nxt] ^ on
+            if nxt_on == target and len(chain) >= shortest:
+                seen = self.peers[chain[0]] & self.peers[nxt]
+                eliminations = [
+                    (j, target.bit_length())
+                    for j in sorted(seen)
+                    if cand[j] & target and j not in chain
+                ]
+                if eliminations:
+                    return eliminations
+            found = self._extend_chain(cand, bivalue, chain, nxt_on, target, lengths)
+            chain.pop()
+            if found:
+                return found
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_grader(block_size: int = 3, diagonal: bool = False) -> LogicalGrader:
+    """Shared grader instance per topology."""
+    return LogicalGrader(block_size, diagonal)
+
+
+def grade_level(grade: float) -> int:
+    """Index into DIFFICULTY_LEVELS of the level a grade belongs to."""
+    return next(i for i, ceiling in enumerate(GRADE_CEILINGS) if grade <= ceiling)
+
+
+def make_graded_puzzle(
+    difficulty: float,
+    block_size: int = 3,
+    diagonal: bool = False,
+    rng=random,
+    attempts: int = 30,
+):
+    """
+    Build a puzzle whose logical grade matches the level nearest to
+    `difficulty`. Clues are removed while the puzzle stays within the
+    level's ceiling; removal stops once `difficulty` of the cells are gone
+    and the grade has risen above the level below. If no attempt reaches
+    the level, the hardest puzzle found is returned.
+
+    Returns (puzzle, solution) as 2D lists.
+    """
+    solver = get_solver(block_size, diagonal)
+    grader = get_grader(block_size, diagonal)
+    level = difficulty_bucket(difficulty)
+    floor = GRADE_CEILINGS[level - 1] if level else -1.0
+    ceiling = GRADE_CEILINGS[level]
+
+    best = None
+    for _ in range(attempts):
+        solution = solver.random_solution(rng)
+        puzzle, grade = _remove_clues(
+            solver, grader, solution, difficulty, ceiling, floor, rng
+        )
+        if best is None or grade > best[0]:
+            best = grade, puzzle, solution
+        if grade > floor:
+            break
+    _, puzzle, solution = best
+    return unflatten(puzzle, solver.size), unflatten(solution, solver.size)
+
+
+def _remove_clues(solver, grader, solution, difficulty, ceiling, floor, rng):
+    puzzle = solution[:]
+    target_remove = int(difficulty * len(puzzle))
+    order = list(range(len(puzzle)))
+    rng.shuffle(order)
+
+    removed = 0
+    grade = 0.0
+    for i in order:
+        puzzle[i] = 0
+        # The bitmask solver rejects ambiguous puzzles far quicker than
+        # running out of techniques does
+        keep = solver.has_unique_solution(puzzle)
+        if keep and not math.isinf(ceiling):
+            new_grade = grader.grade(puzzle, ceiling)
+            keep = new_grade <= ceiling
+            if keep:
+                grade = new_grade
+        if not keep:
+            puzzle[i] = solution[i]
+            continue
+        removed += 1
+        if removed >= target_remove and grade > floor:
+            break
+
+    if math.isinf(ceiling):
+        grade = grader.grade(puzzle)
+    return puzzle, grade
@@ -0,0 +1,147 @@
+# hints.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import OrderedDict
+from gettext import gettext as _, ngettext
+from .board_state import BoardState
+from .grader import get_grader
+from .topology import Topology
+
+
+def _where(row: int, col: int) -> str:
+    return _("row {row}, column {col}").format(row=row + 1, col=col + 1)
+
+
+class Hint:
+    """
+    The next deduction on a board: (row, col, digit) placements and
+    eliminations, and the technique that finds them. The "mistake"
+    technique lists entries to remove as its eliminations.
+    """
+
+    __slots__ = ("technique", "placements", "eliminations")
+
+    def __init__(self, technique: str, placements=(), eliminations=()):
+        self.technique = technique
+        self.placements = tuple(placements)
+        self.eliminations = tuple(eliminations)
+
+    @property
+    def cells(self) -> list[tuple[int, int]]:
+        """(row, col) the hint is about, placements first."""
+        cells = {}
+        for row, col, _digit in self.placements + self.eliminations:
+            cells[row, col] = None
+        return list(cells)
+
+    def explanation(self) -> str:
+        name = self.technique.capitalize()
+        if self.technique == "mistake":
+            row, col, digit = self.eliminations[0]
+            more = len(self.eliminations) - 1
+            text = _("{digit} in {cell} leaves no solution").format(
+                digit=digit, cell=_where(row, col)
+            )
+            if more:
+                text += ngettext(
+                    " (and {count} more entry)", " (and {count} more entries)", more
+                ).format(count=more)
+            return text
+        if self.placements:
+            row, col, digit = self.placements[0]
+            return _("{technique}: {digit} goes in {cell}").format(
+                technique=name, digit=digit, cell=_where(row, col)
+            )
+        row, col = self.eliminations[0][:2]
+        digits = sorted({d for r, c, d in self.eliminations if (r, c) == (row, col)})
+        more = len(self.cells) - 1
+        text = _("{technique}: remove {digits} from {cell}").format(
+            technique=name, digits=", ".join(map(str, digits)), cell=_where(row, col)
+        )
+        if more:
+            text += ngettext(
+                " and {count} more cell", " and {count} more cells", more
+            ).format(count=more)
+        return text
+
+    def __repr__(self):
+        return (
+            f"Hint({self.technique!r}, placements={self.placements}, "
+            f"eliminations={self.eliminations})"
+        )
+
+
+class HintEngine:
+    """
+    Finds the easiest next deduction on a board with `LogicalGrader`, over
+    the clues and entries of a board and optionally the player's notes, on
+    every unit of the topology, diagonals included.
+
+    Hints are memoized per board state, so asking again, or undoing back to
+    a known state, costs nothing, and any change to the board is a new key.
+    """
+
+    memo_size = 64
+
+    __slots__ = ("topology", "grader", "_memo")
+
+    def __init__(self, topology: Topology):
+        self.topology = topology
+        self.grader = get_grader(topology.block_size, topology.diagonal)
+        self._memo: OrderedDict[bytes, Hint | None] = OrderedDict()
+
+    def next_hint(self, state: BoardState, use_notes: bool = False) -> Hint | None:
+        """The easiest next step, or None when the techniques are stuck."""
+        cells = [clue or entry for clue, entry in zip(state.puzzle, state.inputs)]
+        key = bytes(cells) + (state.notes.tobytes() if use_notes else b"")
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+
+        hint = self._find_hint(state, cells, use_notes)
+        self._memo[key] = hint
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return hint
+
+    def _find_hint(self, state: BoardState, cells, use_notes: bool) -> Hint | None:
+        cand = self.grader.candidates(cells)
+        if use_notes:
+            self._apply_notes(state, cand)
+        step = self.grader.find_next_step(cells, cand)
+        if step is None:
+            return None
+        coords = self.topology.coords
+        return Hint(
+            step.technique,
+            [(*coords[i], digit) for i, digit in step.placements],
+            [(*coords[i], digit) for i, digit in step.eliminations],
+        )
+
+    @staticmethod
+    def _apply_notes(state: BoardState, cand):
+        """
+        Narrow the candidates down to the player's notes, so hints continue
+        from the eliminations already made. Notes that rule out the actual
+        digit of a cell are ignored rather than deduced from.
+        """
+        solution = state.solution
+        for i, mask in enumerate(state.notes):
+            if mask and cand[i] and solution[i] and mask >> (solution[i] - 1) & 1:
+                cand[i] &= mask
@@ -17,7 +17,10 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from contextlib import contextmanager
+from gettext import gettext as _
 from gi.repository import Gtk, GLib
+from .generator_pool import GenerationCancelled, GenerationRequest
 from .ui_helpers import UIHelpers
 from .preferences_manager import PreferencesManager
 import logging
@@ -31,7 +34,15 @@ class ManagerBase:
         self.board = None
         self.cell_inputs = []
         self.conflict_cells = []
+        self.hint_cells = []
         self.pencil_mode = False
+        self._pending_start = None
+        # Open batch: its board, nesting depth, whether it owns the board's
+        # move, and the (row, col) whose notes still need redrawing
+        self._batch_board = None
+        self._batch_depth = 0
+        self._batch_owns_move = False
+        self._dirty_notes = None
 
     def load_saved_game(self):
         self.board = self.board_cls.load_from_file()
@@ -41,6 +52,7 @@ class ManagerBase:
             )
             self.build_grid()
             self._restore_game_state()
+            self.check_blocking_entries()
             self.window.stack.set_visible_child(self.window.game_scrolled_window)
             logging.info(f"Loaded saved {self.board.variant.capitalize()} Sudoku game")
             if self.board.is_solved():
@@ -54,18 +66,58 @@ class ManagerBase:
     def new_game(self, difficulty, difficulty_label):
         self.board = self.board_cls(difficulty, difficulty_label)
 
-    def start_game(self, difficulty: float, difficulty_label: str, variant: str):
-        self.window.stack.set_visible_child(self.window.loading_screen)
+    def start_game(
+        self,
+        difficulty: float,
+        difficulty_label: str,
+        variant: str,
+        block_size: int = 3,
+    ):
         logging.info(
             f"Starting {variant.capitalize()} Sudoku with difficulty: {difficulty}"
         )
+        self.cancel_start_game()
+        if self.board_cls.has_instant_puzzle(variant, difficulty, block_size):
+            # A banked or prefetched puzzle is waiting, skip the loading screen entirely
+            board = self.board_cls(
+                difficulty, difficulty_label, variant, block_size=block_size
+            )
+            self._finish_start_game(board)
+            return
+
+        self.window.stack.set_visible_child(self.window.loading_screen)
+        request = GenerationRequest()
+        self._pending_start = request
 
         def worker():
-            self.board = self.board_cls(difficulty, difficulty_label, variant)
-            GLib.idle_add(self._finish_start_game, self.board)
+            try:
+                board = self.board_cls(
+                    difficulty,
+                    difficulty_label,
+                    variant,
+                    request=request,
+                    block_size=block_size,
+                )
+            except GenerationCancelled:
+                logging.info("Abandoned puzzle generation was cancelled")
+                return
+            GLib.idle_add(self._finish_pending_start, request, board)
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def cancel_start_game(self):
+        """Abandon the game that is still being generated, if any."""
+        if self._pending_start is not None:
+            self._pending_start.cancel()
+            self._pending_start = None
+
+    def _finish_pending_start(self, request: GenerationRequest, board):
+        # Only the latest request may replace the board
+        if request is not self._pending_start or request.cancelled:
+            return False
+        self._pending_start = None
+        return self._finish_start_game(board)
+
     def _finish_start_game(self, board):
         raise NotImplementedError
 
@@ -97,6 +149,11 @@ class ManagerBase:
         if not cell.is_editable():
             return
 
+        with self.batch():
+            self._enter_number(cell, number, ctrl_is_pressed)
+
+    def _enter_number(self, cell, number: str, ctrl_is_pressed: bool):
+        helpers = self.get_ui_helpers()
         r, c = cell.row, cell.col
 
         if self.pencil_mode or ctrl_is_pressed:
@@ -121,13 +178,11 @@ class ManagerBase:
                 return
 
             self.board.toggle_note(r, c, number)
-            cell.update_notes(self.board.get_notes(r, c))
-            self.board.save_to_file()
+            self._notes_changed(r, c)
             return
 
         cell.set_value(number)
         self.board.set_input(r, c, number)
-        self.board.save_to_file()
 
         self.on_cell_filled(cell, number)
 
@@ -137,6 +192,140 @@ class ManagerBase:
     def _clear_cell(self, cell):
         pass
 
+    def undo(self):
+        """Revert the latest move on the board and the cells it touched."""
+        if self._can_step_history() and self.board.history.can_undo():
+            self._clear_hint()
+            self._refresh_cells(self.board.undo())
+            self.board.save()
+            self.check_blocking_entries()
+
+    def redo(self):
+        if self._can_step_history() and self.board.history.can_redo():
+            self._clear_hint()
+            self._refresh_cells(self.board.redo())
+            self.board.save()
+            self.check_blocking_entries()
+
+    def show_hint(self):
+        """Highlight the easiest next deduction and explain it."""
+        if self.board is None:
+            return
+        self._clear_hint()
+        hint = self.board.next_hint()
+        if hint is None:
+            self.window.show_hint_subtitle(
+                _("No hint found, try checking your notes")
+            )
+            return
+        helpers = self.get_ui_helpers()
+        self.hint_cells.extend(helpers.highlight_hint(self.cell_inputs, hint))
+        self.window.show_hint_subtitle(hint.explanation())
+
+    def _clear_hint(self):
+        if self.hint_cells:
+            self.get_ui_helpers().clear_hint(self.hint_cells)
+            self.window.show_hint_subtitle(None)
+
+    def _can_step_history(self) -> bool:
+        # Not while a batch is still recording its move
+        return self.board is not None and self._batch_depth == 0
+
+    def fill_all_notes(self):
+        """Pencil in every candidate of every empty cell, saving once."""
+        if self.board is None:
+            return
+        with self.batch():
+            for r, c in self.board.fill_all_notes():
+                self._notes_changed(r, c)
+
+    def begin_batch(self):
+        """
+        Group the edits until the matching `commit_batch` into one move:
+        notes are redrawn once per touched cell and the game is saved once,
+        when the outermost batch is committed.
+        """
+        if self._batch_depth == 0:
+            self._batch_board = self.board
+            self._batch_owns_move = self.board.begin_move()
+            self._dirty_notes = set()
+        self._batch_depth += 1
+
+    def commit_batch(self):
+        self._batch_depth -= 1
+        if self._batch_depth > 0:
+            return
+        board, self._batch_board = self._batch_board, None
+        changes = board.commit_move() if self._batch_owns_move else []
+        if board is not self.board:
+            # The game was left while the batch was open
+            self._dirty_notes = None
+            return
+        self.flush_notes()
+        self._dirty_notes = None
+        if changes:
+            self._clear_hint()
+            board.save()
+            if any(old != new for _, old, new, _, _ in changes):
+                self.check_blocking_entries()
+
+    @contextmanager
+    def batch(self):
+        self.begin_batch()
+        try:
+            yield
+        finally:
+            self.commit_batch()
+
+    def _notes_changed(self, row: int, col: int):
+        """Redraw the notes of a cell, once the current batch ends if any."""
+        if self._dirty_notes is None:
+            self.cell_inputs[row][col].update_notes(self.board.get_notes(row, col))
+        else:
+            self._dirty_notes.add((row, col))
+
+    def flush_notes(self):
+        """Redraw the notes changed so far in the current batch."""
+        dirty, self._dirty_notes = self._dirty_notes or (), set()
+        for r, c in dirty:
+            self.cell_inputs[r][c].update_notes(self.board.get_notes(r, c))
+
+    def _refresh_cells(self, cells):
+        """Redraw the given (row, col) cells from the board."""
+        pass
+
+    def check_blocking_entries(self):
+        """
+        Without casual mode, the solution is never revealed, so instead mark
+        the entries that leave the puzzle unsolvable, once the background
+        check for the current grid is done.
+        """
+        board = self.board
+        if board is None:
+            return
+        prefs = PreferencesManager.get_preferences()
+        if prefs is None:
+            enabled = False
+        else:
+            casual_mode = prefs.general("casual_mode", default=[None, True])[1]
+            flag = prefs.general("flag_unsolvable_entries", default=[None, True])[1]
+            enabled = flag and not casual_mode
+        if not enabled:
+            board.validity.cancel()
+            self._show_blocking_entries(set())
+            return
+
+        def show(cells):
+            # A check may finish after the player moved on to another game
+            if self.board is board:
+                self._show_blocking_entries(cells)
+
+        board.check_blocking_entries(show)
+
+    def _show_blocking_entries(self, cells):
+        """Mark exactly the given (row, col) entries as blocking."""
+        pass
+
     def on_cell_filled(self, cell, number: str):
         """
         Abstract correctness feedback.
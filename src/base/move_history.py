@@ -0,0 +1,99 @@
+# move_history.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import struct
+from collections import deque
+
+# One changed cell: index, old and new entry (0 = empty), old and new notes
+CHANGE = struct.Struct("<HBBII")
+
+
+def pack_changes(changes) -> bytes:
+    """Pack (cell, old entry, new entry, old notes, new notes) tuples."""
+    return b"".join(CHANGE.pack(*change) for change in changes)
+
+
+def unpack_changes(move: bytes) -> list[tuple[int, int, int, int, int]]:
+    return list(CHANGE.iter_unpack(move))
+
+
+class MoveHistory:
+    """
+    Undo and redo stacks of moves. A move is everything one user action
+    changed, e.g. an entry plus the notes it cleared around it, stored as
+    the packed before/after state of each touched cell, so undoing or
+    redoing only touches those cells. Only the latest `limit` moves are
+    kept.
+    """
+
+    limit = 500
+
+    __slots__ = ("_undo", "_redo")
+
+    def __init__(self, limit: int | None = None):
+        self._undo: deque[bytes] = deque(maxlen=limit or self.limit)
+        self._redo: list[bytes] = []
+
+    def record(self, changes):
+        """Push a new move, which makes the undone moves unreachable."""
+        if changes:
+            self._undo.append(pack_changes(changes))
+            self._redo.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> list[tuple] | None:
+        """Changes of the latest move, to be reverted, or None."""
+        if not self._undo:
+            return None
+        move = self._undo.pop()
+        self._redo.append(move)
+        return unpack_changes(move)
+
+    def redo(self) -> list[tuple] | None:
+        """Changes of the latest undone move, to be applied again, or None."""
+        if not self._redo:
+            return None
+        move = self._redo.pop()
+        self._undo.append(move)
+        return unpack_changes(move)
+
+    def moves(self) -> tuple[tuple[bytes, ...], tuple[bytes, ...]]:
+        """Both stacks as they are now, for saves."""
+        return tuple(self._undo), tuple(self._redo)
+
+    def load(self, data: dict):
+        """Restore both stacks from a JSON save, as hex strings."""
+        self.load_moves(
+            (
+                [bytes.fromhex(move) for move in data.get("undo", ())],
+                [bytes.fromhex(move) for move in data.get("redo", ())],
+            )
+        )
+
+    def load_moves(self, moves):
+        """Restore both stacks from what `moves` returned."""
+        undo, redo = moves
+        self._undo.clear()
+        self._undo.extend(undo)
+        self._redo = list(redo)
@@ -26,6 +26,10 @@ class Preferences(ABC):
             "Highlight when input does not match the correct solution",
             True,
         ],
+        "flag_unsolvable_entries": [
+            "Without casual mode, mark entries that leave no solution",
+            True,
+        ],
         "prevent_conflicting_pencil_notes": False,
         "highlight_row": True,
         "highlight_column": True,
@@ -0,0 +1,227 @@
+# puzzle_bank.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import math
+import mmap
+import os
+import random
+import struct
+import threading
+from .constants import DIFFICULTY_LEVELS
+
+BANK_FILENAME = "puzzles.bank"
+_MAGIC = b"SDKB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHxxII")
+_ENTRY = struct.Struct("<16sBBxxQI")
+
+
+def difficulty_bucket(difficulty: float) -> int:
+    """Index of the difficulty level closest to `difficulty`."""
+    return min(
+        range(len(DIFFICULTY_LEVELS)),
+        key=lambda i: abs(DIFFICULTY_LEVELS[i] - difficulty),
+    )
+
+
+def encode_record(puzzle, solution) -> bytes:
+    """Pack a (puzzle, solution) pair of 2D lists into one fixed-width record."""
+    clues = bytes(v or 0 for row in puzzle for v in row)
+    return clues + bytes(int(v) for row in solution for v in row)
+
+
+def decode_record(record) -> tuple[list[list[int | None]], list[list[int]]]:
+    cells = len(record) // 2
+    size = math.isqrt(cells)
+    puzzle = [
+        [record[r * size + c] or None for c in range(size)] for r in range(size)
+    ]
+    solution = [
+        list(record[cells + r * size:cells + (r + 1) * size]) for r in range(size)
+    ]
+    return puzzle, solution
+
+
+class _Bucket:
+    """A run of records drawn in a random order without repeats."""
+
+    __slots__ = ("offset", "count", "record_size", "start", "stride", "drawn")
+
+    def __init__(self, offset: int, count: int, record_size: int):
+        self.offset = offset
+        self.count = count
+        self.record_size = record_size
+        self.start = random.randrange(count) if count else 0
+        self.stride = self._coprime_stride(count)
+        self.drawn = 0
+
+    @staticmethod
+    def _coprime_stride(count: int) -> int:
+        if count <= 1:
+            return 1
+        while True:
+            stride = random.randrange(1, count)
+            if math.gcd(stride, count) == 1:
+                return stride
+
+    def next_offset(self) -> int | None:
+        if self.drawn >= self.count:
+            return None
+        index = (self.start + self.drawn * self.stride) % self.count
+        self.drawn += 1
+        return self.offset + index * self.record_size
+
+
+class PuzzleBank:
+    """
+    Read-only, memory-mapped view of a puzzle bank file.
+
+    Layout (little endian):
+        header   magic "SDKB", version, index entry count, index offset
+        records  fixed width, N*N clue bytes then N*N solution bytes,
+                 0 marks an empty clue
+        index    one entry per (variant, block size, difficulty bucket)
+                 pointing at a contiguous run of records
+
+    The index is written last so banks can be streamed to disk.
+    """
+
+    _shared = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, entry_count, index_offset = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"Not a puzzle bank: {path}")
+
+        self._buckets: dict[tuple[str, int, int], _Bucket] = {}
+        for i in range(entry_count):
+            name, block_size, bucket, offset, count = _ENTRY.unpack_from(
+                self._map, index_offset + i * _ENTRY.size
+            )
+            variant = name.rstrip(b"\0").decode()
+            record_size = 2 * block_size**4
+            self._buckets[(variant, block_size, bucket)] = _Bucket(
+                offset, count, record_size
+            )
+
+    @classmethod
+    def get(cls) -> "PuzzleBank | None":
+        return cls._shared
+
+    @classmethod
+    def set_shared(cls, bank: "PuzzleBank | None"):
+        if cls._shared is not None:
+            cls._shared.close()
+        cls._shared = bank
+
+    @classmethod
+    def open_first(cls, directories) -> "PuzzleBank | None":
+        """Share the first readable bank found under `<dir>/sudokugame/`."""
+        for directory in directories:
+            path = os.path.join(directory, "sudokugame", BANK_FILENAME)
+            if not os.path.exists(path):
+                continue
+            try:
+                bank = cls(path)
+            except (OSError, ValueError, struct.error):
+                logging.warning(f"Ignoring unreadable puzzle bank {path}")
+                continue
+            logging.info(f"Using puzzle bank {path}")
+            cls.set_shared(bank)
+            return bank
+        return None
+
+    def remaining(self, variant: str, difficulty: float, block_size: int = 3):
+        bucket = self._buckets.get(
+            (variant, block_size, difficulty_bucket(difficulty))
+        )
+        return bucket.count - bucket.drawn if bucket else 0
+
+    def draw(self, variant: str, difficulty: float, block_size: int = 3):
+        """
+        Return a random, not yet drawn (puzzle, solution) pair for the bucket,
+        or None once the bucket is exhausted.
+        """
+        bucket = self._buckets.get(
+            (variant, block_size, difficulty_bucket(difficulty))
+        )
+        if bucket is None:
+            return None
+        with self._lock:
+            offset = bucket.next_offset()
+            if offset is None:
+                return None
+            end = offset + bucket.record_size
+            record = self._map[offset:end]
+        return decode_record(record)
+
+    def close(self):
+        self._map.close()
+
+
+class PuzzleBankWriter:
+    """Stream records into a bank file, one difficulty bucket at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(b"\0" * _HEADER.size)
+        self._entries: list[list] = []
+
+    def begin_bucket(self, variant: str, difficulty: float, block_size: int = 3):
+        self._entries.append(
+            [
+                variant.encode(),
+                block_size,
+                difficulty_bucket(difficulty),
+                self._file.tell(),
+                0,
+            ]
+        )
+
+    def add(self, puzzle, solution):
+        self.add_record(encode_record(puzzle, solution))
+
+    def add_record(self, record: bytes):
+        if not self._entries:
+            raise RuntimeError("begin_bucket() must be called before adding records")
+        self._file.write(record)
+        self._entries[-1][4] += 1
+
+    def close(self):
+        index_offset = self._file.tell()
+        for entry in self._entries:
+            self._file.write(_ENTRY.pack(*entry))
+        self._file.seek(0)
+        self._file.write(
+            _HEADER.pack(_MAGIC, _VERSION, len(self._entries), index_offset)
+        )
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,176 @@
+# puzzle_cache.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+from collections import deque
+from gi.repository import GLib
+from .constants import DIFFICULTY_LEVELS
+from .puzzle_bank import PuzzleBank, decode_record
+from .transforms import random_isomorph
+
+
+class PuzzleCache:
+    """
+    Small bounded buffers of ready puzzles, one per (variant, difficulty) at
+    the board size of the registered generator, refilled in the background
+    so a new game can start without waiting for generation. Puzzles are
+    kept as packed records and only decoded when taken.
+
+    The last generated puzzle of each buffer is kept as a seed: when the
+    buffer runs dry, a random isomorph of the seed is handed out instead,
+    at most `seed_reuse` times until a refill brings a new seed, so quick
+    successive games don't all share one puzzle in disguise.
+    """
+
+    capacity = 2
+    seed_reuse = 2
+    refill_timeout = 30
+
+    _generators: dict = {}
+    _buffers: dict[tuple[str, float], deque] = {}
+    _seeds: dict[tuple[str, float], tuple] = {}
+    # Isomorphs handed out of each seed
+    _seed_uses: dict[tuple[str, float], int] = {}
+    _lock = threading.Lock()
+    _refill_thread: threading.Thread | None = None
+
+    @classmethod
+    def start_prefetch(cls, generators: dict):
+        """Register `{variant: generator}` and schedule the first refill."""
+        with cls._lock:
+            cls._generators.update(generators)
+            for variant in generators:
+                for difficulty in DIFFICULTY_LEVELS:
+                    cls._buffers.setdefault(
+                        (variant, difficulty), deque(maxlen=cls.capacity)
+                    )
+        cls.schedule_refill()
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._generators = {}
+            cls._buffers = {}
+            cls._seeds = {}
+            cls._seed_uses = {}
+
+    @classmethod
+    def has_ready(cls, variant: str, difficulty: float, block_size: int = 3) -> bool:
+        key = (variant, difficulty)
+        with cls._lock:
+            if not cls._prefetches(variant, block_size):
+                return False
+            return bool(cls._buffers.get(key)) or cls._seed_usable(key)
+
+    @classmethod
+    def take(cls, variant: str, difficulty: float, block_size: int = 3):
+        """
+        Pop a ready (puzzle, solution) pair, derive one from the seed if the
+        buffer is empty, or return None if nothing was generated yet.
+        """
+        key = (variant, difficulty)
+        with cls._lock:
+            if not cls._prefetches(variant, block_size):
+                return None
+            buffer = cls._buffers.get(key)
+            if buffer is None:
+                return None
+            record = buffer.popleft() if buffer else None
+            seed = None
+            if record is None and cls._seed_usable(key):
+                seed = cls._seeds[key]
+                cls._seed_uses[key] = cls._seed_uses.get(key, 0) + 1
+            generator = cls._generators.get(variant)
+        cls.schedule_refill()
+        if record is not None:
+            return decode_record(record)
+        if seed is None:
+            return None
+        return random_isomorph(
+            *decode_record(seed), generator.block_size, generator.diagonal
+        )
+
+    @classmethod
+    def _seed_usable(cls, key) -> bool:
+        """Whether the seed may serve another game, call with the lock held."""
+        return key in cls._seeds and cls._seed_uses.get(key, 0) < cls.seed_reuse
+
+    @classmethod
+    def _prefetches(cls, variant: str, block_size: int) -> bool:
+        """Whether puzzles of this size are buffered, call with the lock held."""
+        generator = cls._generators.get(variant)
+        return generator is not None and generator.block_size == block_size
+
+    @classmethod
+    def schedule_refill(cls):
+        """Start refilling once the main loop has nothing better to do."""
+        GLib.idle_add(cls._start_refill_thread, priority=GLib.PRIORITY_LOW)
+
+    @classmethod
+    def _start_refill_thread(cls):
+        with cls._lock:
+            if cls._refill_thread is None or not cls._refill_thread.is_alive():
+                cls._refill_thread = threading.Thread(
+                    target=cls.refill, name="puzzle-prefetch", daemon=True
+                )
+                cls._refill_thread.start()
+        return False
+
+    @classmethod
+    def refill(cls):
+        """
+        Fill every buffer up to capacity, emptiest buffer first and each in
+        one bulk request, so only one pool worker is ever busy prefetching.
+        """
+        failed = set()
+        while key := cls._next_key_to_fill(failed):
+            variant, difficulty = key
+            with cls._lock:
+                missing = cls.capacity - len(cls._buffers.get(key, ()))
+            try:
+                records = cls._generators[variant].generate_many(
+                    difficulty, missing, timeout=cls.refill_timeout
+                )
+            except Exception:
+                logging.warning(
+                    f"Prefetching {variant} puzzle at {difficulty} failed",
+                    exc_info=True,
+                )
+                failed.add(key)
+                continue
+            with cls._lock:
+                if key in cls._buffers:
+                    cls._buffers[key].extend(records)
+                    cls._seeds[key] = records[-1]
+                    cls._seed_uses[key] = 0
+
+    @classmethod
+    def _next_key_to_fill(cls, skip):
+        bank = PuzzleBank.get()
+        with cls._lock:
+            candidates = [
+                (len(buffer), key)
+                for key, buffer in cls._buffers.items()
+                if len(buffer) < cls.capacity
+                and key not in skip
+                and key[0] in cls._generators
+                and not (bank and bank.remaining(*key))
+            ]
+        return min(candidates)[1] if candidates else None
@@ -31,6 +31,18 @@ class RulesBase(ABC):
     def block_size(self) -> int:
         pass
 
+    @property
+    @abstractmethod
+    def solver(self):
+        """A `BitmaskSolver` for this variant's constraints."""
+        pass
+
+    @property
+    @abstractmethod
+    def topology(self):
+        """The shared `Topology` of this variant's cells and units."""
+        pass
+
     @abstractmethod
     def is_valid(self, grid, row, col, value) -> bool:
         pass
@@ -0,0 +1,147 @@
+# save_file.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+
+from .save_format import decode_header, decode_save, is_binary
+
+
+def backup_path(path: str) -> str:
+    """Where the previous good save is kept, e.g. board.sav.bak."""
+    return path + ".bak"
+
+
+def legacy_path(path: str) -> str:
+    """The JSON save from before binary saves, e.g. board.json."""
+    return os.path.splitext(path)[0] + ".json"
+
+
+def write_atomic(path: str, data: bytes, sync: bool = True, previous=None):
+    """
+    Replace `path` with `data` through a temporary file in the same
+    directory, so a crash leaves either the old or the new file, never a
+    truncated one. With `sync`, the data and the rename are flushed to
+    disk before returning. A `previous` file is moved to `backup_path`
+    right before.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        if previous is not None:
+            os.replace(previous, backup_path(path))
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+    if sync:
+        _sync_directory(directory)
+
+
+def _sync_directory(directory: str):
+    """Make renames in `directory` durable, where the platform allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_save(path: str, data: bytes):
+    """
+    Atomically replace the save at `path`, keeping the last good one as
+    its backup. The first binary save moves the JSON save it migrates
+    there.
+    """
+    previous = next(
+        (p for p in (path, legacy_path(path)) if _read(p, decode_header)), None
+    )
+    write_atomic(path, data, previous=previous)
+
+
+def read_save(path: str) -> dict | None:
+    """
+    The state stored at `path`, or in its backup when that file is missing
+    or damaged, or in the JSON save from before binary saves, or None when
+    none can be used. Binary saves decode to the shape of
+    `BoardBase.snapshot`, JSON ones to what `json.load` gives. A state
+    read from another file than `path` names it as "recovered_from".
+    """
+    return _read_first(path, decode_save)
+
+
+def read_save_header(path: str) -> dict | None:
+    """
+    The variant, difficulty, difficulty label and block size of the save
+    `read_save` would load. Binary saves are still read and checksummed
+    in full, so a damaged body is caught, but only their header is
+    decoded.
+    """
+    return _read_first(path, decode_header)
+
+
+def _read_first(path: str, decode) -> dict | None:
+    for candidate in (path, backup_path(path), legacy_path(path)):
+        state = _read(candidate, decode)
+        if state is not None:
+            if candidate != path:
+                if os.path.exists(path):
+                    logging.warning(f"Save {path} is damaged, loaded {candidate}")
+                state["recovered_from"] = candidate
+            return state
+    return None
+
+
+def _read(path: str, decode) -> dict | None:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        logging.warning(f"Ignoring unreadable save {path}")
+        return None
+    try:
+        return decode(data) if is_binary(data) else _decode_json(data)
+    except (ValueError, KeyError, IndexError) as e:
+        logging.warning(f"Ignoring damaged save {path}: {e}")
+        return None
+
+
+def _decode_json(data: bytes) -> dict:
+    """A JSON save from before binary saves."""
+    save = json.loads(data)
+    if not isinstance(save, dict):
+        raise ValueError("Save is not an object")
+    return save
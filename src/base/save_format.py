@@ -0,0 +1,218 @@
+# save_format.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Binary saves. A save starts with a fixed header:
+
+    magic, format version, header length, block size, flags,
+    difficulty, journal epoch, CRC32 of the rest of the file
+
+followed by the variant and difficulty label as length-prefixed UTF-8,
+which ends the header. The body holds the clues, the solution and the
+entries as one byte per cell, the note masks as little-endian 16-bit
+(32-bit above 16x16) integers, the undo and redo stacks as counted,
+length-prefixed packed moves, and the preferences as a JSON object.
+
+Everything up to the header length decodes without the body, though
+the checksum still covers the whole file, and the body loads straight
+into `BoardState` arrays.
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b"SDKS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHBBdII")
+_CHECKED = HEADER.size - 4
+
+# Header flags
+HAS_EPOCH = 1
+
+_COUNT = struct.Struct("<I")
+_MOVE = struct.Struct("<H")
+
+
+def is_binary(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+
+def _notes_typecode(size: int) -> str:
+    # Fixed widths, unlike the "L" arrays `BoardState` uses for big boards
+    return "H" if size <= 16 else "I"
+
+
+def _pack_text(text: str) -> bytes:
+    data = text.encode("utf-8")[:255]
+    return bytes((len(data),)) + data
+
+
+def _pack_moves(moves) -> bytes:
+    parts = [_COUNT.pack(len(moves))]
+    for move in moves:
+        parts += (_MOVE.pack(len(move)), move)
+    return b"".join(parts)
+
+
+def encode_save(snapshot: dict) -> bytes:
+    """The binary save of a `BoardBase.snapshot`."""
+    epoch = snapshot["journal_epoch"]
+    notes = array(_notes_typecode(snapshot["size"]), snapshot["notes"])
+    if sys.byteorder == "big":
+        notes.byteswap()
+    undo, redo = snapshot["history"]
+    preferences = json.dumps(
+        {
+            "variant": snapshot["variant_preferences"],
+            "general": snapshot["general_preferences"],
+        }
+    ).encode("utf-8")
+    texts = _pack_text(snapshot["variant"]) + _pack_text(
+        snapshot["difficulty_label"]
+    )
+    rest = b"".join(
+        (
+            texts,
+            snapshot["puzzle"],
+            snapshot["solution"],
+            snapshot["user_inputs"],
+            notes.tobytes(),
+            _pack_moves(undo),
+            _pack_moves(redo),
+            _COUNT.pack(len(preferences)),
+            preferences,
+        )
+    )
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        HEADER.size + len(texts),
+        snapshot["block_size"],
+        HAS_EPOCH if epoch is not None else 0,
+        snapshot["difficulty"],
+        epoch or 0,
+        0,
+    )
+    checksum = zlib.crc32(rest, zlib.crc32(header[:_CHECKED]))
+    return header[:_CHECKED] + _COUNT.pack(checksum) + rest
+
+
+class _Reader:
+    """Sequential reads from a save body, raising ValueError past its end."""
+
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data: bytes, offset: int):
+        self.data = data
+        self.offset = offset
+
+    def take(self, length: int) -> bytes:
+        end = self.offset + length
+        if end > len(self.data):
+            raise ValueError("Save is truncated")
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def unpack(self, fmt: struct.Struct) -> int:
+        return fmt.unpack(self.take(fmt.size))[0]
+
+    def text(self) -> str:
+        return self.take(self.take(1)[0]).decode("utf-8")
+
+    def moves(self) -> tuple[bytes, ...]:
+        return tuple(
+            self.take(self.unpack(_MOVE)) for _ in range(self.unpack(_COUNT))
+        )
+
+
+def _check(data: bytes):
+    if len(data) < HEADER.size or not is_binary(data):
+        raise ValueError("Not a binary save")
+    (
+        _,
+        version,
+        header_length,
+        block_size,
+        flags,
+        difficulty,
+        epoch,
+        checksum,
+    ) = HEADER.unpack_from(data)
+    if version not in _BODY_DECODERS:
+        raise ValueError(f"Unsupported save format version {version}")
+    if zlib.crc32(data[HEADER.size:], zlib.crc32(data[:_CHECKED])) != checksum:
+        raise ValueError("Save checksum mismatch")
+    reader = _Reader(data, HEADER.size)
+    header = {
+        "format_version": version,
+        "block_size": block_size,
+        "size": block_size * block_size,
+        "difficulty": difficulty,
+        "journal_epoch": epoch if flags & HAS_EPOCH else None,
+        "variant": reader.text(),
+        "difficulty_label": reader.text(),
+    }
+    return header, _Reader(data, header_length)
+
+
+def decode_header(data: bytes) -> dict:
+    """
+    Metadata of a binary save: variant, difficulty, difficulty label,
+    block size and journal epoch, without decoding the body. The whole
+    save is checksummed all the same. Raises ValueError for damaged or
+    unknown saves.
+    """
+    return _check(data)[0]
+
+
+def decode_save(data: bytes) -> dict:
+    """
+    A binary save in the shape of `BoardBase.snapshot`, with the grids as
+    bytes and the notes as an array of masks. Raises ValueError for
+    damaged or unknown saves.
+    """
+    header, reader = _check(data)
+    snapshot = dict(header)
+    _BODY_DECODERS[header["format_version"]](snapshot, reader)
+    return snapshot
+
+
+def _decode_body_v1(snapshot: dict, reader: _Reader):
+    cells = snapshot["size"] * snapshot["size"]
+    snapshot["puzzle"] = reader.take(cells)
+    snapshot["solution"] = reader.take(cells)
+    snapshot["user_inputs"] = reader.take(cells)
+    notes = array(_notes_typecode(snapshot["size"]))
+    notes.frombytes(reader.take(cells * notes.itemsize))
+    if sys.byteorder == "big":
+        notes.byteswap()
+    snapshot["notes"] = notes
+    snapshot["history"] = reader.moves(), reader.moves()
+    preferences = json.loads(reader.take(reader.unpack(_COUNT)))
+    snapshot["variant_preferences"] = preferences["variant"]
+    snapshot["general_preferences"] = preferences["general"]
+
+
+# Body decoders per format version; a new version adds its own and keeps
+# the old ones, so older saves still load and are rewritten as the new one
+_BODY_DECODERS = {1: _decode_body_v1}
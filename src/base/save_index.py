@@ -0,0 +1,101 @@
+# save_index.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+
+from .save_file import read_save
+
+# What a board needs from a save to load it
+_REQUIRED = ("difficulty", "puzzle", "solution", "user_inputs", "notes")
+
+
+class SaveEntry:
+    """
+    What the menu shows about a save, and its parsed state until a board
+    takes it.
+    """
+
+    __slots__ = ("variant", "difficulty", "difficulty_label", "state")
+
+    def __init__(self, state: dict):
+        self.variant = state.get("variant", "Unknown")
+        self.difficulty = state.get("difficulty")
+        self.difficulty_label = state.get("difficulty_label", "Unknown")
+        self.state = state
+
+
+class SaveIndex:
+    """
+    Parsed saves by path, so the menu can offer a game and continue it
+    with a single read and parse of its save: `entry` parses and caches
+    it, and the board loader then takes the parsed state with
+    `take_state`. Whatever writes a save calls `invalidate`, which
+    `SaveService` does after every write.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, SaveEntry | None] = {}
+
+    @classmethod
+    def shared(cls) -> "SaveIndex":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def entry(self, path: str) -> SaveEntry | None:
+        """The save at `path`, or None if there is no usable one."""
+        # Reading under the lock keeps a concurrent write's invalidation
+        # from landing before the stale entry is stored
+        with self._lock:
+            if path not in self._entries:
+                self._entries[path] = self._read_entry(path)
+            return self._entries[path]
+
+    @staticmethod
+    def _read_entry(path: str) -> SaveEntry | None:
+        state = read_save(path)
+        if state is None:
+            return None
+        missing = [key for key in _REQUIRED if key not in state]
+        if missing:
+            logging.warning(f"Ignoring incomplete save {path}, missing {missing}")
+            return None
+        return SaveEntry(state)
+
+    def take_state(self, path: str) -> dict | None:
+        """
+        The parsed state of the save at `path` for a board to load, from
+        the cache if `entry` parsed it, which then lets go of it.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            state = entry.state if entry is not None else None
+            if entry is not None:
+                entry.state = None
+        return state if state is not None else read_save(path)
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._entries.pop(path, None)
@@ -0,0 +1,200 @@
+# save_journal.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import random
+import struct
+import threading
+import time
+
+from .save_file import write_atomic
+
+# Journal files start with a magic and the epoch of the snapshot they follow
+HEADER = struct.Struct("<4sI")
+MAGIC = b"SDJ1"
+
+# One record: kind, then a `move_history.CHANGE` for CHANGE records
+RECORD = struct.Struct("<BHBBII")
+CHANGE, END, UNDO, REDO = range(4)
+_EMPTY = (0, 0, 0, 0, 0)
+
+
+def journal_path(save_path: str) -> str:
+    """The journal next to a save, e.g. board.journal for board.json."""
+    return os.path.splitext(save_path)[0] + ".journal"
+
+
+def pack_move(changes) -> bytes:
+    """Records of one move: its changed cells, then an END record."""
+    records = [RECORD.pack(CHANGE, *change) for change in changes]
+    records.append(RECORD.pack(END, *_EMPTY))
+    return b"".join(records)
+
+
+def read_journal(save_path: str, epoch: int | None) -> list | None:
+    """
+    ("move", changes), ("undo", None) and ("redo", None) entries of the
+    journal of a save, or None if there is no journal following the
+    snapshot of `epoch`. A torn last record or a move without its END
+    record, as left by a crash while appending, is ignored.
+    """
+    try:
+        with open(journal_path(save_path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if epoch is None or data[:HEADER.size] != HEADER.pack(MAGIC, epoch):
+        return None
+
+    entries, changes = [], []
+    end = len(data) - (len(data) - HEADER.size) % RECORD.size
+    for kind, *change in RECORD.iter_unpack(data[HEADER.size:end]):
+        if kind == CHANGE:
+            changes.append(tuple(change))
+        elif kind == END:
+            entries.append(("move", changes))
+            changes = []
+        elif kind in (UNDO, REDO):
+            entries.append((("undo" if kind == UNDO else "redo"), None))
+    return entries
+
+
+class SaveJournal:
+    """
+    Saves a board as a base snapshot plus an append-only journal of its
+    moves, undos and redos as fixed-size records, so saving after a move
+    appends a few bytes instead of rewriting the whole game. Every
+    `compact_every` moves, and whenever `compact` is asked for, the next
+    write replaces the snapshot and starts a new journal.
+
+    Each snapshot gets a new random epoch, stored in the snapshot and in
+    the journal header, so a journal left behind by a crash between the
+    two writes is never replayed onto the wrong snapshot.
+
+    Snapshots and fresh journals are synced to disk when written; appends
+    are synced at most every `sync_interval` seconds, so a crash loses at
+    most that much play instead of every move paying for an fsync, and
+    by `sync`, for when the game is left or the app quits.
+    """
+
+    compact_every = 200
+    sync_interval = 5.0
+
+    __slots__ = (
+        "epoch",
+        "_pending",
+        "_moves",
+        "_snapshot",
+        "_lock",
+        "_synced",
+        "_unsynced",
+    )
+
+    def __init__(self, epoch: int | None = None, moves: int = 0):
+        # Without an epoch there is no snapshot on disk yet
+        self.epoch = epoch
+        self._pending = bytearray()
+        self._moves = moves
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._synced = time.monotonic()
+        self._unsynced = False
+
+    def record_move(self, changes):
+        with self._lock:
+            self._pending += pack_move(changes)
+            self._moves += 1
+
+    def record_undo(self):
+        with self._lock:
+            self._pending += RECORD.pack(UNDO, *_EMPTY)
+
+    def record_redo(self):
+        with self._lock:
+            self._pending += RECORD.pack(REDO, *_EMPTY)
+
+    def needs_compaction(self) -> bool:
+        return self.epoch is None or self._moves >= self.compact_every
+
+    def compact(self, take_snapshot):
+        """
+        Start a new epoch with `take_snapshot()`, which should record
+        `epoch`, as the base the next write saves.
+        """
+        with self._lock:
+            self.epoch = random.getrandbits(32)
+            self._snapshot = take_snapshot()
+            self._pending.clear()
+            self._moves = 0
+
+    def write(self, save_path: str, write_snapshot):
+        """
+        Write what changed since the last write: the new snapshot through
+        `write_snapshot(save_path, snapshot)` and a fresh journal, or just
+        the new records appended to the journal.
+        """
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+            records, self._pending = bytes(self._pending), bytearray()
+            epoch = self.epoch
+            header = HEADER.pack(MAGIC, epoch or 0)
+        try:
+            self._write_files(save_path, write_snapshot, snapshot, header + records)
+        except BaseException:
+            with self._lock:
+                # Retry with the next write unless a newer snapshot took over,
+                # and have the next save take a snapshot, as a failed append
+                # may have left a partial record in the journal
+                if self.epoch == epoch:
+                    if snapshot is not None:
+                        self._snapshot = snapshot
+                    self._pending[:0] = records
+                self._moves = max(self._moves, self.compact_every)
+            raise
+
+    def _write_files(self, save_path: str, write_snapshot, snapshot, journal: bytes):
+        """Write `snapshot` and `journal` in full, or append the records."""
+        path = journal_path(save_path)
+        records = journal[HEADER.size:]
+        if snapshot is not None:
+            write_snapshot(save_path, snapshot)
+            write_atomic(path, journal)
+            self._synced, self._unsynced = time.monotonic(), False
+        elif records:
+            with open(path, "ab") as f:
+                f.write(records)
+                self._unsynced = True
+                if time.monotonic() - self._synced >= self.sync_interval:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._synced, self._unsynced = time.monotonic(), False
+
+    def sync(self, save_path: str):
+        """
+        Sync the records appended since the last sync to disk. Call it
+        from the thread that writes, as it doesn't lock against `write`.
+        """
+        if not self._unsynced:
+            return
+        fd = os.open(journal_path(save_path), os.O_WRONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._synced, self._unsynced = time.monotonic(), False
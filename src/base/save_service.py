@@ -0,0 +1,134 @@
+# save_service.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import time
+
+from .save_index import SaveIndex
+
+
+class SaveService:
+    """
+    Writes saves on a background thread. Callers snapshot their state and
+    hand over a `write` callable that serializes and writes it; a burst of
+    saves to one path ends up as a single write of the newest snapshot,
+    once no save came in for `idle_delay` seconds, but never later than
+    `max_delay` seconds after the oldest unwritten one.
+
+    `flush` writes everything pending right away, for quitting and leaving
+    a game, and then calls the `sync` callables given with the saves
+    written since the last flush, for writes that leave syncing to disk
+    for later. Writes never overlap, so an older snapshot can't land after a
+    newer one. Each write invalidates its path in the `SaveIndex`.
+    """
+
+    idle_delay = 0.5
+    max_delay = 3.0
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # path -> [write, first scheduled, last scheduled]
+        self._pending: dict[str, list] = {}
+        self._syncs: dict[str, object] = {}
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def shared(cls) -> "SaveService":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def schedule(self, path: str, write, sync=None):
+        """
+        Have `write()` save to `path` soon, replacing a pending save of it,
+        and `sync()` get it onto disk on the next `flush`.
+        """
+        now = time.monotonic()
+        with self._cond:
+            pending = self._pending.get(path)
+            self._pending[path] = [write, pending[1] if pending else now, now]
+            if sync is not None:
+                self._syncs[path] = sync
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="save-service", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def has_pending(self) -> bool:
+        with self._cond:
+            return bool(self._pending)
+
+    def flush(self):
+        """Write every pending save now, on the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                writes = [
+                    (path, write) for path, (write, _, _) in self._pending.items()
+                ]
+                self._pending.clear()
+                syncs = list(self._syncs.values())
+                self._syncs.clear()
+            for path, write in writes:
+                self._write(path, write)
+            for sync in syncs:
+                try:
+                    sync()
+                except Exception:
+                    logging.exception("Syncing the game to disk failed")
+
+    def _due(self, now: float) -> float:
+        """Seconds until the next save is due, call with the lock held."""
+        return min(
+            min(last + self.idle_delay, first + self.max_delay) - now
+            for _, first, last in self._pending.values()
+        )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending or self._due(time.monotonic()) > 0:
+                    timeout = self._due(time.monotonic()) if self._pending else None
+                    self._cond.wait(timeout)
+            with self._write_lock:
+                with self._cond:
+                    now = time.monotonic()
+                    due = [
+                        path
+                        for path, (_, first, last) in self._pending.items()
+                        if min(last + self.idle_delay, first + self.max_delay) <= now
+                    ]
+                    writes = [(path, self._pending.pop(path)[0]) for path in due]
+                for path, write in writes:
+                    self._write(path, write)
+
+    @staticmethod
+    def _write(path: str, write):
+        try:
+            write()
+        except Exception:
+            logging.exception("Saving the game failed")
+        SaveIndex.shared().invalidate(path)
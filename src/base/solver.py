@@ -0,0 +1,267 @@
+# solver.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+from functools import lru_cache
+from .topology import get_topology
+
+
+def flatten(grid) -> list[int]:
+    """Turn a 2D grid of ints/strings/None into a flat list, 0 for empty."""
+    return [int(v) if v else 0 for row in grid for v in row]
+
+
+def unflatten(cells, size: int, empty=None) -> list[list]:
+    return [
+        [cells[r * size + c] or empty for c in range(size)] for r in range(size)
+    ]
+
+
+class BitmaskSolver:
+    """
+    Backtracking solver over flat grids (0 = empty, 1..N = digit).
+
+    Every unit (row, column, block and optionally both diagonals) keeps a
+    bitmask of the digits it already holds, so a cell's candidates are one
+    OR over its units. The search always branches on the most constrained
+    empty cell and stops as soon as the requested number of solutions is
+    found, which makes uniqueness checks cheap.
+    """
+
+    def __init__(self, block_size: int = 3, diagonal: bool = False):
+        self.block_size = block_size
+        self.size = block_size * block_size
+        self.diagonal = diagonal
+        self.full = (1 << self.size) - 1
+        topology = get_topology(block_size, diagonal)
+        self.units = topology.units
+        self.cell_units = topology.cell_units
+
+    def solve(self, cells, rng=None) -> list[int] | None:
+        """Return one solution as a flat list, or None if there is none."""
+        solutions = self._run(cells, 1, rng)
+        return solutions[0] if solutions else None
+
+    def count_solutions(self, cells, limit: int = 2) -> int:
+        """Count solutions, giving up once `limit` have been found."""
+        return len(self._run(cells, limit, None))
+
+    def has_unique_solution(self, cells) -> bool:
+        return self.count_solutions(cells, 2) == 1
+
+    def random_solution(self, rng=random) -> list[int]:
+        """A random complete grid."""
+        return self.solve([0] * (self.size * self.size), rng)
+
+    def make_puzzle(self, difficulty: float, rng=random):
+        """
+        Build a uniquely solvable puzzle by removing `difficulty` of the cells
+        from a random solution, keeping any clue whose removal would allow a
+        second solution. Returns (puzzle, solution) as 2D lists.
+        """
+        solution = self.random_solution(rng)
+        puzzle = solution[:]
+        target_remove = int(difficulty * len(puzzle))
+        order = list(range(len(puzzle)))
+        rng.shuffle(order)
+
+        removed = 0
+        for i in order:
+            if removed >= target_remove:
+                break
+            puzzle[i] = 0
+            if self.count_solutions(puzzle, 2) == 1:
+                removed += 1
+            else:
+                puzzle[i] = solution[i]
+
+        return unflatten(puzzle, self.size), unflatten(solution, self.size)
+
+    def make_singles_puzzle(self, difficulty: float, rng=random):
+        """
+        Like `make_puzzle`, but for boards too large to count solutions
+        after every removal. A clue is only removed when the remaining clues
+        alone still force it, as a naked or hidden single. Such a puzzle
+        solves by filling the removed cells in reverse order, so it is
+        unique without ever searching. Returns (puzzle, solution) as 2D
+        lists.
+        """
+        solution = self.random_solution(rng)
+        puzzle = solution[:]
+        used = [self.full] * len(self.units)
+        target_remove = int(difficulty * len(puzzle))
+        order = list(range(len(puzzle)))
+        rng.shuffle(order)
+
+        removed = 0
+        for i in order:
+            if removed >= target_remove:
+                break
+            if self._is_forced(puzzle, used, i):
+                bit = 1 << (puzzle[i] - 1)
+                for u in self.cell_units[i]:
+                    used[u] ^= bit
+                puzzle[i] = 0
+                removed += 1
+
+        return unflatten(puzzle, self.size), unflatten(solution, self.size)
+
+    def _is_forced(self, puzzle, used, i) -> bool:
+        """Whether the clues other than cell `i` force its digit."""
+        units = self.cell_units[i]
+        seen = 0
+        for u in units:
+            seen |= used[u]
+        if seen == self.full:
+            # Naked single: the peers show every other digit
+            return True
+
+        bit = 1 << (puzzle[i] - 1)
+        for u in units:
+            # Hidden single: every other empty cell of the unit sees the
+            # digit in a unit it doesn't share with cell `i`
+            if all(
+                puzzle[j]
+                or any(used[w] & bit for w in self.cell_units[j] if w not in units)
+                for j in self.units[u]
+                if j != i
+            ):
+                return True
+        return False
+
+    def _run(self, cells, limit: int, rng) -> list[list[int]]:
+        grid = list(cells)
+        used = [0] * len(self.units)
+        empties = []
+        for i, value in enumerate(grid):
+            if not value:
+                empties.append(i)
+                continue
+            bit = 1 << (value - 1)
+            for u in self.cell_units[i]:
+                if used[u] & bit:
+                    return []
+                used[u] |= bit
+
+        solutions: list[list[int]] = []
+        self._search(grid, used, empties, limit, rng, solutions)
+        return solutions
+
+    def _search(self, grid, used, empties, limit, rng, solutions) -> bool:
+        if not empties:
+            solutions.append(grid[:])
+            return len(solutions) >= limit
+
+        choice = self._pick_cell(used, empties)
+        if choice is None:
+            return False
+        pos, mask = choice
+
+        i = empties[pos]
+        empties[pos] = empties[-1]
+        empties.pop()
+
+        units = self.cell_units[i]
+        for bit in self._split_bits(mask, rng):
+            grid[i] = bit.bit_length()
+            for u in units:
+                used[u] |= bit
+            done = self._search(grid, used, empties, limit, rng, solutions)
+            for u in units:
+                used[u] ^= bit
+            if done:
+                return True
+
+        grid[i] = 0
+        empties.append(i)
+        empties[pos], empties[-1] = empties[-1], empties[pos]
+        return False
+
+    def _pick_cell(self, used, empties):
+        """
+        Return (position in `empties`, candidate mask) of the cell to branch
+        on, or None when some cell or unit can no longer be completed.
+        """
+        cell_units = self.cell_units
+        full = self.full
+        candidates = {}
+        best_pos, best_mask, best_count = 0, 0, self.size + 1
+        for pos, i in enumerate(empties):
+            taken = 0
+            for u in cell_units[i]:
+                taken |= used[u]
+            mask = full & ~taken
+            candidates[i] = mask
+            count = mask.bit_count()
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            return None
+        if best_count == 1:
+            return best_pos, best_mask
+
+        forced = self._find_hidden_single(used, candidates)
+        if forced is False:
+            return None
+        if forced is not None:
+            i, bit = forced
+            return empties.index(i), bit
+        return best_pos, best_mask
+
+    @staticmethod
+    def _split_bits(mask: int, rng) -> list[int]:
+        bits = []
+        while mask:
+            bit = mask & -mask
+            bits.append(bit)
+            mask ^= bit
+        if rng is not None:
+            rng.shuffle(bits)
+        return bits
+
+    def _find_hidden_single(self, used, candidates):
+        """
+        Look for a digit that fits only one cell of a unit. Returns
+        (cell, bit), False when some digit fits nowhere in a unit, or None.
+        """
+        full = self.full
+        for u, unit in enumerate(self.units):
+            once = twice = 0
+            for i in unit:
+                mask = candidates.get(i, 0)
+                twice |= once & mask
+                once |= mask
+            missing = full & ~used[u]
+            if missing & ~once:
+                return False
+            hidden = missing & ~twice
+            if hidden:
+                bit = hidden & -hidden
+                for i in unit:
+                    if candidates.get(i, 0) & bit:
+                        return i, bit
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_solver(block_size: int = 3, diagonal: bool = False) -> BitmaskSolver:
+    """Shared solver instance per topology."""
+    return BitmaskSolver(block_size, diagonal)
@@ -0,0 +1,101 @@
+# topology.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from functools import lru_cache
+
+
+def build_units(block_size: int, diagonal: bool) -> list[tuple[int, ...]]:
+    """Rows, then columns, then blocks, then both diagonals if enabled."""
+    size = block_size * block_size
+    units = [tuple(r * size + c for c in range(size)) for r in range(size)]
+    units += [tuple(r * size + c for r in range(size)) for c in range(size)]
+    for br in range(0, size, block_size):
+        for bc in range(0, size, block_size):
+            units.append(
+                tuple(
+                    (br + r) * size + bc + c
+                    for r in range(block_size)
+                    for c in range(block_size)
+                )
+            )
+    if diagonal:
+        units.append(tuple(i * size + i for i in range(size)))
+        units.append(tuple(i * size + size - 1 - i for i in range(size)))
+    return units
+
+
+class Topology:
+    """
+    Which cells constrain each other on one board shape, computed once and
+    shared by the solver, grader, rules, boards and UI helpers.
+
+    Cells are flat indices (row * size + col); `coords` maps them back.
+    `peers[i]` lists every other cell sharing a unit with cell `i`, in
+    row-major order, and `diagonal_peers[i]` the ones on its diagonals.
+    """
+
+    __slots__ = (
+        "block_size",
+        "size",
+        "diagonal",
+        "units",
+        "cell_units",
+        "peers",
+        "diagonal_peers",
+        "coords",
+    )
+
+    def __init__(self, block_size: int = 3, diagonal: bool = False):
+        self.block_size = block_size
+        self.size = size = block_size * block_size
+        self.diagonal = diagonal
+        self.units = tuple(build_units(block_size, diagonal))
+        self.coords = tuple(divmod(i, size) for i in range(size * size))
+
+        cell_units = [[] for _ in range(size * size)]
+        for u, unit in enumerate(self.units):
+            for i in unit:
+                cell_units[i].append(u)
+        self.cell_units = tuple(tuple(units) for units in cell_units)
+        self.peers = tuple(
+            self._related(i, units) for i, units in enumerate(self.cell_units)
+        )
+        # The diagonals are always the last two units
+        first_diagonal = 3 * size
+        self.diagonal_peers = tuple(
+            self._related(i, [u for u in units if u >= first_diagonal])
+            for i, units in enumerate(self.cell_units)
+        )
+
+    def _related(self, i: int, units) -> tuple[int, ...]:
+        return tuple(sorted({j for u in units for j in self.units[u]} - {i}))
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.size + col
+
+    def peer_coords(self, row: int, col: int):
+        """(row, col) of every peer of a cell."""
+        coords = self.coords
+        return [coords[j] for j in self.peers[row * self.size + col]]
+
+
+@lru_cache(maxsize=None)
+def get_topology(block_size: int = 3, diagonal: bool = False) -> Topology:
+    """Shared topology instance per board shape."""
+    return Topology(block_size, diagonal)
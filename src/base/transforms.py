@@ -0,0 +1,106 @@
+# transforms.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+
+
+def _shuffled(n: int, rng) -> list[int]:
+    order = list(range(n))
+    rng.shuffle(order)
+    return order
+
+
+def _mirrored(perm: list[int]) -> list[int]:
+    """The permutation `perm` as seen from the opposite end of the range."""
+    n = len(perm)
+    return [n - 1 - perm[n - 1 - i] for i in range(n)]
+
+
+def _symmetric_perm(n: int, rng) -> list[int]:
+    """A random permutation p with p(n-1-i) == n-1-p(i)."""
+    perm = [0] * n
+    pairs = _shuffled(n // 2, rng)
+    for i, j in enumerate(pairs):
+        if rng.random() < 0.5:
+            j = n - 1 - j
+        perm[i] = j
+        perm[n - 1 - i] = n - 1 - j
+    if n % 2:
+        perm[n // 2] = n // 2
+    return perm
+
+
+def _compose(band_perm: list[int], inner_perms: list[list[int]]) -> list[int]:
+    """Expand a band order plus per-band line orders into a line permutation."""
+    block_size = len(band_perm)
+    return [
+        band_perm[band] * block_size + inner_perms[band][offset]
+        for band in range(block_size)
+        for offset in range(block_size)
+    ]
+
+
+def _classic_line_perm(block_size: int, rng) -> list[int]:
+    bands = _shuffled(block_size, rng)
+    return _compose(bands, [_shuffled(block_size, rng) for _ in range(block_size)])
+
+
+def _diagonal_line_perm(block_size: int, rng) -> list[int]:
+    """
+    Line permutation that keeps both diagonals as diagonals when applied to
+    rows and columns alike: bands are swapped symmetrically, and a band's
+    line order is mirrored in the opposite band.
+    """
+    bands = _symmetric_perm(block_size, rng)
+    inner: list[list[int]] = [[] for _ in range(block_size)]
+    for band in range(block_size // 2):
+        inner[band] = _shuffled(block_size, rng)
+        inner[block_size - 1 - band] = _mirrored(inner[band])
+    if block_size % 2:
+        inner[block_size // 2] = _symmetric_perm(block_size, rng)
+    return _compose(bands, inner)
+
+
+def random_isomorph(puzzle, solution, block_size=3, diagonal=False, rng=random):
+    """
+    Return a (puzzle, solution) pair equivalent to the given one: digits are
+    relabelled, rows and columns are shuffled within and across bands, and
+    the grid may be transposed or mirrored. Validity, uniqueness and
+    difficulty are unchanged. With `diagonal`, only transforms that map the
+    two diagonals onto the diagonals are used.
+    """
+    size = block_size * block_size
+    if diagonal:
+        rows = _diagonal_line_perm(block_size, rng)
+        cols = rows[::-1] if rng.random() < 0.5 else rows
+    else:
+        rows = _classic_line_perm(block_size, rng)
+        cols = _classic_line_perm(block_size, rng)
+
+    digits = [None] + [d + 1 for d in _shuffled(size, rng)]
+    transpose = rng.random() < 0.5
+
+    def remap(grid):
+        source = [list(col) for col in zip(*grid)] if transpose else grid
+        return [
+            [digits[int(v)] if v else None for v in (source[r][c] for c in cols)]
+            for r in rows
+        ]
+
+    return remap(puzzle), remap(solution)
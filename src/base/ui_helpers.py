@@ -17,13 +17,16 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from gi.repository import Gtk, Gdk
+from gi.repository import Gtk, Gdk, GLib
 from abc import ABC
+from .topology import get_topology
 
 
 class UIHelpers(ABC):
     """Abstract base class for Sudoku UI helpers."""
 
+    diagonal: bool = False
+
     @staticmethod
     def create_button(label: str, callback, *args):
         button = Gtk.Button(label=label)
@@ -50,37 +53,103 @@ class UIHelpers(ABC):
         """Highlight a specific cell by adding a CSS class."""
         cells[row][col].highlight(css_class)
 
-    @staticmethod
-    def highlight_conflicts(cells, row: int, col: int, label: str, block_size: int):
+    @classmethod
+    def highlight_conflicts(
+        cls, cells, row: int, col: int, label: str, block_size: int
+    ):
         """
         Highlight conflicting cells and return list of conflicts.
-        A conflict is any other cell in the same row, column,
-        or block with the same label.
+        A conflict is any peer of the cell (same row, column, block, and
+        diagonal for diagonal variants) with the same label.
         """
         conflict_cells = []
-        size = len(cells)
-        for r in range(size):
-            for c in range(size):
-                cell = cells[r][c]
-                if (
-                    cell.get_value() == label
-                    and (r != row or c != col)
-                    and (
-                        r == row
-                        or c == col
-                        or (
-                            r // block_size == row // block_size
-                            and c // block_size == col // block_size
-                        )
-                    )
-                ):
-                    cell.highlight("conflict")
-                    conflict_cells.append(cell)
+        for r, c in get_topology(block_size, cls.diagonal).peer_coords(row, col):
+            cell = cells[r][c]
+            if cell.get_value() == label:
+                cell.highlight("conflict")
+                conflict_cells.append(cell)
         return conflict_cells
 
+    @staticmethod
+    def highlight_hint(cells, hint) -> list:
+        """Highlight and explain the cells of a hint, returning those cells."""
+        hint_cells = []
+        for row, col in hint.cells:
+            cell = cells[row][col]
+            cell.highlight("hint")
+            cell.set_tooltip_text(hint.explanation())
+            hint_cells.append(cell)
+        return hint_cells
+
+    @staticmethod
+    def clear_hint(hint_cells):
+        for cell in hint_cells:
+            cell.remove_highlight("hint")
+            cell.set_tooltip_text("")
+        hint_cells.clear()
+
     @staticmethod
     def clear_conflicts(conflict_cells):
         """Clear conflict highlights from the given list of cells."""
         for cell in conflict_cells:
             cell.remove_highlight("conflict")
         conflict_cells.clear()
+
+
+class DigitEntry:
+    """
+    Turns typed digit keys into board numbers. Up to 9×9 every key is a
+    number right away. On larger boards a digit that may still start a
+    two-digit number waits for the next key, `flush` (Enter) or a short
+    timeout, so typing 1 then 6 enters 16 while 7 enters 7 at once.
+    Digits past the board size, like 7 on 4×4, and a lone 0 are dropped.
+    `on_number(number, target)` receives each number as a string.
+    """
+
+    timeout_ms = 1000
+
+    __slots__ = ("size", "on_number", "pending", "target", "_source_id")
+
+    def __init__(self, size: int, on_number):
+        self.size = size
+        self.on_number = on_number
+        self.pending = ""
+        self.target = None
+        self._source_id = None
+
+    def feed(self, digit: str, target=None):
+        if self.pending and target != self.target:
+            self.flush()
+        self._cancel_timeout()
+        if self.pending:
+            first, self.pending = self.pending, ""
+            if int(first + digit) <= self.size:
+                self.on_number(first + digit, target)
+                return
+            self.on_number(first, target)
+        if digit == "0" or int(digit) > self.size:
+            return
+        if int(digit) * 10 <= self.size:
+            self.pending, self.target = digit, target
+            self._source_id = GLib.timeout_add(self.timeout_ms, self._on_timeout)
+        else:
+            self.on_number(digit, target)
+
+    def flush(self) -> bool:
+        """Enter the waiting digit, True if there was one."""
+        self._cancel_timeout()
+        if not self.pending:
+            return False
+        digit, self.pending = self.pending, ""
+        self.on_number(digit, self.target)
+        return True
+
+    def _on_timeout(self):
+        self._source_id = None
+        self.flush()
+        return False
+
+    def _cancel_timeout(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
@@ -0,0 +1,139 @@
+# validity.py
+#
+# Copyright 2025 sepehr-rs
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+from collections import OrderedDict
+from gi.repository import GLib
+from .solver import get_solver
+from .topology import Topology
+
+
+class ValidityOracle:
+    """
+    Tells whether the clues plus the user's entries can still be completed,
+    without looking at the stored solution, and if not which entries are
+    in the way.
+
+    Entries are taken in cell order and kept as long as the kept ones still
+    have a completion; the others are reported as blocking. The completion
+    found last is kept as a witness, so an entry that agrees with it needs
+    no search at all, which covers most keystrokes. Answers are memoized
+    per grid, so undoing back to a known grid is free as well.
+    """
+
+    memo_size = 256
+
+    __slots__ = ("solver", "_witness", "_memo", "_lock")
+
+    def __init__(self, topology: Topology):
+        self.solver = get_solver(topology.block_size, topology.diagonal)
+        self._witness: tuple[bytes, list[int] | None] | None = None
+        self._memo: OrderedDict[bytes, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def blocking_entries(self, clues, entries) -> tuple[int, ...]:
+        """Indices of the entries that leave the grid without a completion."""
+        key = bytes(clues) + bytes(entries)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+            blocking = self._find_blocking(bytes(clues), entries)
+            self._memo[key] = blocking
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return blocking
+
+    def _find_blocking(self, clues: bytes, entries) -> tuple[int, ...]:
+        witness = self._witness_for(clues)
+        if witness is None:
+            # The clues themselves have no solution, no entry is to blame
+            return ()
+        grid = list(clues)
+        blocking = []
+        for i, digit in enumerate(entries):
+            if not digit or clues[i]:
+                continue
+            grid[i] = digit
+            if witness[i] == digit:
+                continue
+            completion = self.solver.solve(grid)
+            if completion is None:
+                grid[i] = 0
+                blocking.append(i)
+            else:
+                witness = completion
+        self._witness = (clues, witness)
+        return tuple(blocking)
+
+    def _witness_for(self, clues: bytes) -> list[int] | None:
+        if self._witness is None or self._witness[0] != clues:
+            self._witness = (clues, self.solver.solve(clues))
+        return self._witness[1]
+
+
+class ValidityChecker:
+    """
+    Runs `ValidityOracle` queries on a background thread. Requests made
+    while one is being answered are coalesced, only the newest is answered
+    next, and only the answer to the newest request reaches its callback,
+    on the main loop.
+    """
+
+    __slots__ = ("oracle", "_lock", "_pending", "_thread", "_generation")
+
+    def __init__(self, topology: Topology):
+        self.oracle = ValidityOracle(topology)
+        self._lock = threading.Lock()
+        self._pending = None
+        self._thread: threading.Thread | None = None
+        self._generation = 0
+
+    def submit(self, clues, entries, callback):
+        """Answer for a snapshot of the grid, `callback(blocking)` when done."""
+        with self._lock:
+            self._generation += 1
+            self._pending = (self._generation, bytes(clues), bytes(entries), callback)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="validity-check", daemon=True
+                )
+                self._thread.start()
+
+    def cancel(self):
+        """Drop the pending request and any answer not delivered yet."""
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._thread = None
+                    return
+            generation, clues, entries, callback = job
+            blocking = self.oracle.blocking_entries(clues, entries)
+            GLib.idle_add(self._deliver, generation, blocking, callback)
+
+    def _deliver(self, generation: int, blocking, callback):
+        if generation == self._generation:
+            callback(blocking)
+        return False
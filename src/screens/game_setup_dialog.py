@@ -1,10 +1,13 @@
 from gi.repository import Gtk, Adw
 from gettext import gettext as _
-
-EASY_DIFFICULTY = 0.2
-MEDIUM_DIFFICULTY = 0.5
-HARD_DIFFICULTY = 0.7
-EXTREME_DIFFICULTY = 0.9
+from ..base.constants import (
+    BLOCK_SIZES,
+    DEFAULT_BLOCK_SIZE,
+    EASY_DIFFICULTY,
+    MEDIUM_DIFFICULTY,
+    HARD_DIFFICULTY,
+    EXTREME_DIFFICULTY,
+)
 
 
 class GameSetupDialog(Adw.Dialog):
@@ -17,6 +20,7 @@ class GameSetupDialog(Adw.Dialog):
         self.on_select = on_select
         self.selected_variant = "classic"
         self.selected_difficulty = EASY_DIFFICULTY
+        self.selected_block_size = DEFAULT_BLOCK_SIZE
         self._radio_groups = {}
 
         toolbar_view = Adw.ToolbarView.new()
@@ -63,6 +67,17 @@ class GameSetupDialog(Adw.Dialog):
             self.selected_difficulty,
         )
 
+        size_list = Gtk.ListBox()
+        size_list.add_css_class("boxed-list")
+        size_list.set_selection_mode(Gtk.SelectionMode.NONE)
+        main_box.append(size_list)
+        self._create_radio_list(
+            size_list,
+            [(f"{n * n} × {n * n}", n) for n in BLOCK_SIZES],
+            "block_size",
+            self.selected_block_size,
+        )
+
         btn = Gtk.Button(label=_("Start Game"))
         btn.add_css_class("pill")
         btn.add_css_class("suggested-action")
@@ -100,5 +115,7 @@ class GameSetupDialog(Adw.Dialog):
             setattr(self, f"selected_{group_name}", value)
 
     def _on_confirm_clicked(self, _):
-        self.on_select(self.selected_variant, self.selected_difficulty)
+        self.on_select(
+            self.selected_variant, self.selected_difficulty, self.selected_block_size
+        )
         self.close()
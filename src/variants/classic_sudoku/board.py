@@ -19,59 +19,49 @@
 
 from typing import List, Tuple
 from ...base.board_base import BoardBase
+from ...base.board_state import encode_digit
+from ...base.generator_pool import GenerationRequest
 from .rules import ClassicSudokuRules
 from .generator import ClassicSudokuGenerator
 
 
 class ClassicSudokuBoard(BoardBase):
-    def __init__(self, difficulty: float, difficulty_label: str, variant: str):
+    def __init__(
+        self,
+        difficulty: float,
+        difficulty_label: str,
+        variant: str,
+        request: GenerationRequest | None = None,
+        block_size: int = 3,
+    ):
         super().__init__(
-            ClassicSudokuRules(),
-            ClassicSudokuGenerator(),
+            ClassicSudokuRules(block_size),
+            ClassicSudokuGenerator(block_size),
             difficulty,
             difficulty_label,
             variant,
+            request=request,
         )
 
     @classmethod
     def load_from_file(cls, filename: str | None = None):
         return cls._load_from_file_common(
             filename=filename,
-            rules=ClassicSudokuRules(),
-            generator=ClassicSudokuGenerator(),
+            rules_cls=ClassicSudokuRules,
+            generator_cls=ClassicSudokuGenerator,
         )
 
     def is_solved(self):
-        for r in range(self.rules.size):
-            for c in range(self.rules.size):
-                if not self.is_clue(r, c):
-                    if self.user_inputs[r][c] != str(self.solution[r][c]):
-                        return False
-        return True
+        return self.state.unsolved == 0
 
     def has_conflict(self, row: int, col: int, value: str) -> List[Tuple[int, int]]:
-        conflicts = []
-        size = self.rules.size
-        block_size = self.rules.block_size
-
-        for r in range(size):
-            for c in range(size):
-                if r == row and c == col:
-                    continue
-
-                if (
-                    r == row
-                    or c == col
-                    or (
-                        r // block_size == row // block_size
-                        and c // block_size == col // block_size
-                    )
-                ):
-                    existing_value = self.puzzle[r][c]
-                    if existing_value is None:
-                        existing_value = self.user_inputs[r][c]
-
-                    if existing_value is not None and str(existing_value) == value:
-                        conflicts.append((r, c))
-
-        return conflicts
+        state = self.state
+        topology = self.rules.topology
+        i, digit = topology.index(row, col), encode_digit(value)
+        if not state.shown_elsewhere(i, digit):
+            return []
+        return [
+            topology.coords[j]
+            for j in topology.peers[i]
+            if (state.puzzle[j] or state.inputs[j]) == digit
+        ]
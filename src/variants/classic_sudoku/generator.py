@@ -17,24 +17,38 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import random
-from sudoku.base_sudoku import PuzzleGenerator
-from sudoku import ClassicSudoku
+from ...base.constants import EASY_DIFFICULTY, EXTREME_DIFFICULTY
 from ...base.generator_base import GeneratorBase
+from ...base.grader import make_graded_puzzle
+from ...base.solver import get_solver
+
+# Share of the cells the generators can remove by block size, where it is
+# below the Extreme level: 4x4 puzzles need 4 clues, and the single-forced
+# removals of larger boards run out at about half the board
+REMOVAL_CEILINGS = {2: 0.75, 4: 0.5, 5: 0.45}
 
 
 class ClassicSudokuGenerator(GeneratorBase):
     """Puzzle generator for classic Sudoku."""
 
     def _generate_impl(self, difficulty: float):
-        random_seed = random.randint(1, 1_000_000)
-        sudoku = PuzzleGenerator.make_puzzle(
-            sudoku_cls=ClassicSudoku,
-            size=9,
-            difficulty=difficulty,
-            ensure_unique=True,
-            seed=random_seed,
-        )
-        puzzle = sudoku.board
-        solution = sudoku.solve().board
-        return puzzle, solution
+        solver = get_solver(self.block_size, self.diagonal)
+        if self.block_size > 3:
+            # Grading and uniqueness searches are too slow from 16x16 on
+            return solver.make_singles_puzzle(self.removal_share(difficulty))
+        if self.block_size < 3:
+            # Every 4x4 puzzle solves with singles, so grades can't tell
+            # the levels apart
+            return solver.make_puzzle(self.removal_share(difficulty))
+        if self.graded:
+            return make_graded_puzzle(difficulty, self.block_size, self.diagonal)
+        return solver.make_puzzle(difficulty)
+
+    def removal_share(self, difficulty: float) -> float:
+        """
+        Share of the cells to remove for `difficulty`, with the levels from
+        Easy to Extreme spread up to what this board size can reach.
+        """
+        ceiling = REMOVAL_CEILINGS.get(self.block_size, EXTREME_DIFFICULTY)
+        scale = (ceiling - EASY_DIFFICULTY) / (EXTREME_DIFFICULTY - EASY_DIFFICULTY)
+        return EASY_DIFFICULTY + (difficulty - EASY_DIFFICULTY) * scale
@@ -24,6 +24,7 @@ from typing import Any
 from gi.repository import Gtk, Gdk, GLib  # pyright: ignore[reportAttributeAccessIssue]
 from ...base.manager_base import ManagerBase
 from ...base.preferences_manager import PreferencesManager
+from ...base.ui_helpers import DigitEntry
 from .board import ClassicSudokuBoard
 from .ui_helpers import ClassicUIHelpers
 from .sudoku_cell import SudokuCell
@@ -34,13 +35,17 @@ class ClassicSudokuManager(ManagerBase):
         super().__init__(window, ClassicSudokuBoard)
         self.key_map, self.remove_keys = ClassicUIHelpers.setup_key_mappings()
         self.ui_helpers = ClassicUIHelpers
+        self.digit_entry = DigitEntry(9, self._on_digits_entered)
         self.parent_grid = None
         self.blocks = []
         self._active_popover = None
         self._cell_popover = None
         self._last_popover_cell = None
         self._restore_focus_on_popover_close = False
+        # Notes picked with right clicks stay one batch until the popover closes
+        self._popover_batch = False
         self.board_frame = None
+        self.blocking_cells = set()
 
     def _require_board(self, message: str):
         board = self.board
@@ -64,6 +69,9 @@ class ClassicSudokuManager(ManagerBase):
         return popover
 
     def _on_cell_popover_closed(self, popover):
+        if self._popover_batch:
+            self._popover_batch = False
+            self.commit_batch()
         cell = getattr(self, "_last_popover_cell", None)
         restore = bool(getattr(self, "_restore_focus_on_popover_close", False))
 
@@ -111,10 +119,14 @@ class ClassicSudokuManager(ManagerBase):
         size = board.rules.size
         block_size = board.rules.block_size
 
+        self.digit_entry = DigitEntry(size, self._on_digits_entered)
         self.parent_grid = self._create_parent_grid()
+        if block_size > 3:
+            self.parent_grid.get_style_context().add_class("dense-board")
         self.blocks = self._create_blocks(block_size)
 
         self.cell_inputs = self._create_cells(size, block_size)
+        self.blocking_cells = set()
 
         self.board_frame = self._wrap_in_aspect_frame(self.parent_grid)
         self.window.grid_container.append(self.board_frame)
@@ -179,9 +191,9 @@ class ClassicSudokuManager(ManagerBase):
         for r in range(size):
             row_cells: list[SudokuCell] = []
             for c in range(size):
-                value = board.puzzle[r][c]
+                value = board.get_clue(r, c)
                 editable = not board.is_clue(r, c)
-                cell = SudokuCell(r, c, value, editable)
+                cell = SudokuCell(r, c, value, editable, block_size=block_size)
 
                 self._attach_controllers(cell, r, c)
                 row_cells.append(cell)
@@ -249,26 +261,52 @@ class ClassicSudokuManager(ManagerBase):
         r, c = cell.row, cell.col
         if not cell.is_editable():
             return
-        if clear_all:
-            board.clear_input(r, c)
-            cell.clear()
-            board.notes[r][c].clear()
-            cell.update_notes(set())
-
-        elif self.pencil_mode:
-            current_notes = board.get_notes(r, c)
-            if current_notes:
-                # remove the last note numerically
-                last_note = sorted(current_notes, key=int)[-1]
-                board.toggle_note(r, c, last_note)
-                cell.update_notes(board.get_notes(r, c))
+        with self.batch():
+            if self.pencil_mode and not clear_all:
+                current_notes = board.get_notes(r, c)
+                if current_notes:
+                    # remove the last note numerically
+                    last_note = sorted(current_notes, key=int)[-1]
+                    board.toggle_note(r, c, last_note)
+            else:
+                board.clear_input(r, c)
+                cell.clear()
+                board.clear_notes(r, c)
+            self._notes_changed(r, c)
 
-        else:
-            board.clear_input(r, c)
-            cell.clear()
-            board.notes[r][c].clear()
-            cell.update_notes(set())
-        board.save_to_file()
+    def _refresh_cells(self, cells):
+        board = self._require_board("Illegal state: cannot refresh without a board")
+        prefs = PreferencesManager.get_preferences()
+        if prefs is None:
+            raise RuntimeError("Illegal state: preferences unavailable")
+        casual_mode = prefs.general("casual_mode")[1]
+        for r, c in cells:
+            cell = self.cell_inputs[r][c]
+            self._clear_feedback(cell)
+            cell.set_value(board.get_input(r, c) or "")
+            cell.update_notes(board.get_notes(r, c))
+        # Same feedback as on_cell_filled, once every changed cell shows its value
+        for r, c in cells:
+            cell = self.cell_inputs[r][c]
+            value = board.get_input(r, c)
+            correct = value == str(board.get_correct_value(r, c))
+            if value and casual_mode and not correct:
+                cell.highlight("wrong")
+            elif value and not casual_mode:
+                conflicts = self.ui_helpers.highlight_conflicts(
+                    self.cell_inputs, r, c, value, board.rules.block_size
+                )
+                if conflicts:
+                    self._handle_wrong_input(cell, value, conflicts)
+            # Correct entries are locked in casual mode, see _handle_correct_input
+            cell.set_editable(not (casual_mode and correct))
+
+    def _show_blocking_entries(self, cells):
+        for r, c in self.blocking_cells - cells:
+            self.cell_inputs[r][c].remove_highlight("unsolvable")
+        for r, c in cells - self.blocking_cells:
+            self.cell_inputs[r][c].highlight("unsolvable")
+        self.blocking_cells = cells
 
     def _popdown_active_popover(self):
         popover: Any = getattr(self, "_active_popover", None)
@@ -430,8 +468,8 @@ class ClassicSudokuManager(ManagerBase):
 
         dr, dc = directions[keyval]
         if ctrl:
-            dr *= 3
-            dc *= 3
+            dr *= board.rules.block_size
+            dc *= board.rules.block_size
         new_r, new_c = row + dr, col + dc
         if 0 <= new_r < board.rules.size and 0 <= new_c < board.rules.size:
             self._focus_cell(new_r, new_c)
@@ -440,11 +478,8 @@ class ClassicSudokuManager(ManagerBase):
     def _handle_number_keys(self, keyval, ctrl, row, col):
         if keyval not in self.key_map:
             return False
-        num = self.key_map[keyval]
-        if num and num != 0:
-            self._fill_cell(self.cell_inputs[row][col], num, ctrl_is_pressed=ctrl)
-            return True
-        return False
+        self.digit_entry.feed(self.key_map[keyval], (row, col, ctrl))
+        return True
 
     def _handle_unicode_digit(self, keyval, ctrl, row, col):
         uni = Gdk.keyval_to_unicode(keyval)
@@ -452,20 +487,21 @@ class ClassicSudokuManager(ManagerBase):
             return False
         try:
             digit = unicodedata.digit(chr(uni))
-            if 1 <= digit <= 9:
-                self._fill_cell(
-                    self.cell_inputs[row][col], str(digit), ctrl_is_pressed=ctrl
-                )
-                return True
         except (ValueError, TypeError):
             return False
-        return False
+        self.digit_entry.feed(str(digit), (row, col, ctrl))
+        return True
+
+    def _on_digits_entered(self, number: str, target):
+        row, col, ctrl = target
+        self._fill_cell(self.cell_inputs[row][col], number, ctrl_is_pressed=ctrl)
 
     def _handle_enter_key(self, keyval, row, col):
-        if (
-            keyval in (Gdk.KEY_Return, Gdk.KEY_KP_Enter)
-            and self.cell_inputs[row][col].is_editable()
-        ):
+        if keyval not in (Gdk.KEY_Return, Gdk.KEY_KP_Enter):
+            return False
+        if self.digit_entry.flush():
+            return True
+        if self.cell_inputs[row][col].is_editable():
             self._show_popover(self.cell_inputs[row][col])
             return True
         return False
@@ -482,7 +518,13 @@ class ClassicSudokuManager(ManagerBase):
         self, num_button: Gtk.Button, cell: SudokuCell, popover, mouse_button
     ):
         number = num_button.get_label()
+        if mouse_button == 3 and not self._popover_batch:
+            self.begin_batch()
+            self._popover_batch = True
         self._fill_cell(cell, number, ctrl_is_pressed=(mouse_button == 3))
+        if self._popover_batch:
+            # The cell stays in view next to the popover, keep it current
+            self.flush_notes()
         if not self.pencil_mode and mouse_button != 3:
             self._restore_focus_on_popover_close = False
             popover.popdown()
@@ -548,7 +590,7 @@ class ClassicSudokuManager(ManagerBase):
                 cell.row, cell.col, cell.get_value()
             )
             for r, c in affected:
-                self.cell_inputs[r][c].update_notes(self.board.get_notes(r, c))
+                self._notes_changed(r, c)
 
     def _clear_correct_feedback(self, cell):
         """Remove correct highlight and tooltip."""
@@ -18,29 +18,34 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from ...base.rules_base import RulesBase
+from ...base.solver import get_solver
+from ...base.topology import get_topology
 
 
 class ClassicSudokuRules(RulesBase):
     block_size: int = 3
+    diagonal: bool = False
+
+    def __init__(self, block_size: int | None = None):
+        if block_size is not None:
+            self.block_size = block_size
 
     @property
     def size(self) -> int:
         return self.block_size * self.block_size  # 9 for classic Sudoku
 
+    @property
+    def solver(self):
+        return get_solver(self.block_size, self.diagonal)
+
+    @property
+    def topology(self):
+        return get_topology(self.block_size, self.diagonal)
+
     def is_valid(self, grid, row, col, value) -> bool:
-        # Row
-        if value in grid[row]:
-            return False
-        # Column
-        if value in [grid[r][col] for r in range(self.size)]:
+        if grid[row][col] == value:
             return False
-        # Block
-        br, bc = row // self.block_size, col // self.block_size
-        for r in range(br * self.block_size, (br + 1) * self.block_size):
-            for c in range(bc * self.block_size, (bc + 1) * self.block_size):
-                if grid[r][c] == value:
-                    return False
-        return True
+        return all(grid[r][c] != value for r, c in self.topology.peer_coords(row, col))
 
     def is_solved(self, user_inputs, solution) -> bool:
         return user_inputs == solution
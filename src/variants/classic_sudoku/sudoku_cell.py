@@ -23,11 +23,15 @@ from gi.repository import Gtk, GLib  # pyright: ignore[reportAttributeAccessIssu
 class SudokuCell(Gtk.Button):
     """Individual Sudoku cell widget with main value and notes display."""
 
-    def __init__(self, row: int, col: int, value: str, editable: bool):
+    def __init__(
+        self, row: int, col: int, value: str, editable: bool, block_size: int = 3
+    ):
         super().__init__()
 
         self.row = row
         self.col = col
+        # Notes are laid out like the digits of a block
+        self.block_size = block_size
         self._editable = editable
         self.compact_mode = False
         self._feedback_source_id = None
@@ -105,45 +109,46 @@ class SudokuCell(Gtk.Button):
         return self.main_label.get_text()
 
     def update_notes(self, notes: set[str]):
-        """Update the notes display."""
-        # Clear old labels
-        for child in list(self.notes_grid):
-            self.notes_grid.remove(child)
-        self.note_labels.clear()
-        if not notes or self.main_label.get_text():
-            return
-        sorted_notes = sorted(notes, key=int)
-        for n in sorted_notes:
+        """
+        Update the notes display, adding and removing only the labels of
+        notes that changed.
+        """
+        shown = set() if self.main_label.get_text() else set(notes)
+        for n in set(self.note_labels) - shown:
+            self.notes_grid.remove(self.note_labels.pop(n))
+        for n in sorted(shown - set(self.note_labels), key=int):
             note_label = Gtk.Label(label=n)
             note_label.get_style_context().add_class("note-cell-label")
-            size = max(8, 12 if not self.compact_mode else 8)
+            size = self._note_size()
             note_label.set_size_request(size, size)
             note_label.set_halign(Gtk.Align.CENTER)
             note_label.set_valign(Gtk.Align.CENTER)
 
             self.note_labels[n] = note_label
 
-            index = int(n) - 1
-            row = index // 3
-            col = index % 3
+            row, col = divmod(int(n) - 1, self.block_size)
 
             self.notes_grid.attach(note_label, col, row, 1, 1)
 
         self.notes_grid.show()
 
+    def _note_size(self) -> int:
+        return (36 if not self.compact_mode else 24) // self.block_size
+
     def update_display(self):
         """Update the display state."""
-        if self.main_label.get_text():
-            for label in self.note_labels.values():
-                label.set_text("")
+        if self.main_label.get_text() and self.note_labels:
+            # A value hides the notes
+            self.update_notes(set())
 
     def set_compact(self, compact: bool):
         if self.compact_mode != compact:
             self.compact_mode = compact
             size = 10 if compact else 40
             self.set_size_request(size, size)
-            current_notes = set(self.note_labels.keys())
-            self.update_notes(current_notes)
+            note_size = self._note_size()
+            for label in self.note_labels.values():
+                label.set_size_request(note_size, note_size)
 
     def highlight(self, class_name: str):
         """Add a highlight class to the cell."""
@@ -17,10 +17,12 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import math
+
 from gi.repository import Gtk, Gdk  # pyright: ignore[reportAttributeAccessIssue]
 from gettext import gettext as _
 
-from ...base.ui_helpers import UIHelpers
+from ...base.ui_helpers import DigitEntry, UIHelpers
 from ...base.preferences_manager import PreferencesManager
 
 
@@ -37,9 +39,12 @@ class ClassicUIHelpers(UIHelpers):
 
     @staticmethod
     def setup_key_mappings():
-        """Map keyboard keys to Sudoku numbers 1–9."""
-        key_map = {getattr(Gdk, f"KEY_{i}"): str(i) for i in range(1, 10)}
-        key_map.update({getattr(Gdk, f"KEY_KP_{i}"): str(i) for i in range(1, 10)})
+        """
+        Map keyboard keys to digits 0–9. Numbers above 9 are typed as two
+        digits, see `DigitEntry`.
+        """
+        key_map = {getattr(Gdk, f"KEY_{i}"): str(i) for i in range(10)}
+        key_map.update({getattr(Gdk, f"KEY_KP_{i}"): str(i) for i in range(10)})
         remove_keys = (Gdk.KEY_BackSpace, Gdk.KEY_Delete, Gdk.KEY_KP_Delete)
         return key_map, remove_keys
 
@@ -120,7 +125,13 @@ class ClassicUIHelpers(UIHelpers):
             remaining_valid_inputs,
         )
         clear_button = ClassicUIHelpers._add_action_buttons(
-            grid, cell, popover, on_clear_selected, pencil_mode, mouse_button
+            grid,
+            cell,
+            popover,
+            on_clear_selected,
+            pencil_mode,
+            mouse_button,
+            math.isqrt(len(remaining_valid_inputs)),
         )
         key_map, remove_keys = (
             ClassicUIHelpers.setup_key_mappings()
@@ -157,11 +168,13 @@ class ClassicUIHelpers(UIHelpers):
     def _add_number_buttons(
         grid, on_number_selected, cell, popover, mouse_button, remaining_valid_inputs
     ):
-        """Create 1–9 number buttons inside the popover grid."""
+        """Create one button per digit, laid out like a block of the board."""
         prefs = PreferencesManager.get_preferences()
         show_remaining = prefs.general("show_remaining_valid_inputs")[1]
+        size = len(remaining_valid_inputs)
+        block_size = math.isqrt(size)
         num_buttons = {}
-        for i in range(1, 10):
+        for i in range(1, size + 1):
             button = ClassicUIHelpers.create_number_button(
                 str(i), on_number_selected, cell, popover, mouse_button
             )
@@ -176,18 +189,24 @@ class ClassicUIHelpers(UIHelpers):
                 else:
                     button.set_sensitive(False)
 
-            grid.attach(widget_to_attach, (i - 1) % 3, (i - 1) // 3, 1, 1)
+            grid.attach(
+                widget_to_attach,
+                (i - 1) % block_size,
+                (i - 1) // block_size,
+                1,
+                1,
+            )
             num_buttons[str(i)] = button
 
         return num_buttons
 
     @staticmethod
     def _add_action_buttons(
-        grid, cell, popover, on_clear_selected, pencil_mode, mouse_button
+        grid, cell, popover, on_clear_selected, pencil_mode, mouse_button, block_size=3
     ):
-        """Create Clear (and optionally Done) buttons."""
+        """Create Clear (and optionally Done) buttons below the number buttons."""
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        grid.attach(button_box, 0, 3, 3, 1)
+        grid.attach(button_box, 0, block_size, block_size, 1)
 
         clear_button = Gtk.Button(label=_("Clear"))
         clear_button.set_size_request(-1, 40)
@@ -213,10 +232,18 @@ class ClassicUIHelpers(UIHelpers):
     def _attach_key_controller(grid, num_buttons, clear_button, key_map, remove_keys):
         """Wire up keyboard input for numbers and clearing."""
 
-        def on_key_pressed(controller, keyval, keycode, state):
-            if keyval in key_map and (num := key_map[keyval]) in num_buttons:
+        def on_number(num, _target):
+            if num in num_buttons:
                 num_buttons[num].emit("clicked")
+
+        digits = DigitEntry(len(num_buttons), on_number)
+
+        def on_key_pressed(controller, keyval, keycode, state):
+            if keyval in key_map:
+                digits.feed(key_map[keyval])
                 return True
+            elif keyval in (Gdk.KEY_Return, Gdk.KEY_KP_Enter):
+                return digits.flush()
             elif keyval in remove_keys:
                 clear_button.emit("clicked")
                 return True
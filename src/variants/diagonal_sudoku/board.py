@@ -17,23 +17,31 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import List, Tuple, Iterable, Set
 from ..classic_sudoku.board import ClassicSudokuBoard
 from ...base.board_base import BoardBase
+from ...base.generator_pool import GenerationRequest
 from ...base.preferences_manager import PreferencesManager
 from .rules import DiagonalSudokuRules
 from .generator import DiagonalSudokuGenerator
 
 
 class DiagonalSudokuBoard(ClassicSudokuBoard):
-    def __init__(self, difficulty: float, difficulty_label: str, variant: str):
+    def __init__(
+        self,
+        difficulty: float,
+        difficulty_label: str,
+        variant: str,
+        request: GenerationRequest | None = None,
+        block_size: int = 3,
+    ):
         BoardBase.__init__(
             self,
-            DiagonalSudokuRules(),
-            DiagonalSudokuGenerator(),
+            DiagonalSudokuRules(block_size),
+            DiagonalSudokuGenerator(block_size),
             difficulty,
             difficulty_label,
             variant,
+            request=request,
         )
         prefs = PreferencesManager.get_preferences()
         self.variant_preferences = prefs.variant_defaults.copy()
@@ -43,38 +51,6 @@ class DiagonalSudokuBoard(ClassicSudokuBoard):
     def load_from_file(cls, filename: str | None = None):
         return cls._load_from_file_common(
             filename=filename,
-            rules=DiagonalSudokuRules(),
-            generator=DiagonalSudokuGenerator(),
+            rules_cls=DiagonalSudokuRules,
+            generator_cls=DiagonalSudokuGenerator,
         )
-
-    def _iter_diagonal_cells(self, row: int, col: int) -> Iterable[Tuple[int, int]]:
-        size = self.rules.size
-        if row == col:
-            for i in range(size):
-                if i != row:
-                    yield (i, i)
-        if row + col == size - 1:
-            for i in range(size):
-                r, c = i, size - 1 - i
-                if r != row or c != col:
-                    yield (r, c)
-
-    def _get_existing_value(self, row: int, col: int):
-        val = self.puzzle[row][col]
-        return val if val is not None else self.user_inputs[row][col]
-
-    def has_conflict(self, row: int, col: int, value: str) -> List[Tuple[int, int]]:
-        conflicts = super().has_conflict(row, col, value)
-        diagonal_conflicts: List[Tuple[int, int]] = []
-        seen_conflicts: Set[Tuple[int, int]] = set(conflicts)
-
-        for r, c in self._iter_diagonal_cells(row, col):
-            if (r, c) in seen_conflicts:
-                continue
-
-            existing_value = self._get_existing_value(r, c)
-            if existing_value is not None and str(existing_value) == value:
-                diagonal_conflicts.append((r, c))
-                seen_conflicts.add((r, c))
-
-        return conflicts + diagonal_conflicts
@@ -22,36 +22,7 @@ from ...base.preferences_manager import PreferencesManager
 
 
 class DiagonalUIHelpers(ClassicUIHelpers):
-
-    @staticmethod
-    def highlight_conflicts(cells, row: int, col: int, label: str, block_size: int):
-        """
-        Highlight conflicting cells and return list of conflicts.
-        A conflict is any other cell in the same row, column, block,
-        or either main diagonal with the same label.
-        """
-        conflict_cells = []
-        size = len(cells)
-        for r in range(size):
-            for c in range(size):
-                cell = cells[r][c]
-                if (
-                    cell.get_value() == label
-                    and (r != row or c != col)
-                    and (
-                        r == row  # same row
-                        or c == col  # same column
-                        or (
-                            r // block_size == row // block_size
-                            and c // block_size == col // block_size
-                        )  # same block
-                        or (r == c and row == col)
-                        or (r + c == size - 1 and row + col == size - 1)
-                    )
-                ):
-                    cell.highlight("conflict")
-                    conflict_cells.append(cell)
-        return conflict_cells
+    diagonal: bool = True
 
     @classmethod
     def highlight_related_cells(
@@ -17,7 +17,7 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from gi.repository import Adw, Gtk, Gio
+from gi.repository import Adw, Gtk, Gio, GLib
 from gettext import gettext as _
 from .screens.game_setup_dialog import GameSetupDialog
 from .screens.finished_page import FinishedPage  # noqa: F401
@@ -28,9 +28,14 @@ from .variants.classic_sudoku.preferences import ClassicSudokuPreferences
 from .variants.diagonal_sudoku.manager import DiagonalSudokuManager
 from .variants.diagonal_sudoku.preferences import DiagonalSudokuPreferences
 from .base.preferences_manager import PreferencesManager
+from .base.puzzle_bank import PuzzleBank
+from .base.puzzle_cache import PuzzleCache
+from .variants.classic_sudoku.generator import ClassicSudokuGenerator
+from .variants.diagonal_sudoku.generator import DiagonalSudokuGenerator
 from .base.board_base import _get_save_path
-import os
-import json
+from .base.save_index import SaveIndex
+from .base.save_service import SaveService
+from .base.constants import DEFAULT_BLOCK_SIZE
 
 # Keep template widget types imported for GTK template registration
 _TEMPLATE_WIDGET_TYPES = (FinishedPage, LoadingScreen)
@@ -63,6 +68,10 @@ class SudokuWindow(Adw.ApplicationWindow):
             "back-to-menu": self.on_back_to_menu,
             "pencil-toggled": self._on_pencil_toggled_action,
             "show-preferences": self.on_show_preferences,
+            "undo": self._on_undo_action,
+            "redo": self._on_redo_action,
+            "fill-notes": self._on_fill_notes_action,
+            "hint": self._on_hint_action,
         }
         for name, callback in actions.items():
             act = Gio.SimpleAction.new(name, None)
@@ -80,13 +89,21 @@ class SudokuWindow(Adw.ApplicationWindow):
         gesture.connect("pressed", self._on_window_pressed)
         self.add_controller(gesture)
 
+        PuzzleBank.open_first([GLib.get_user_data_dir(), *GLib.get_system_data_dirs()])
+        PuzzleCache.start_prefetch(
+            {
+                "classic": ClassicSudokuGenerator(),
+                "diagonal": DiagonalSudokuGenerator(),
+            }
+        )
+
     def _connect_buttons(self):
         self.continue_button.connect("clicked", self.on_continue_clicked)
         self.new_game_button.connect("clicked", self.on_new_game_clicked)
         self.pencil_toggle_button.connect("toggled", self._on_pencil_toggled_button)
         self.continue_button.set_tooltip_text(_("Continue Game"))
         self.new_game_button.set_tooltip_text(_("New Game"))
-        self.continue_button.set_visible(os.path.exists(_get_save_path()))
+        self.continue_button.set_visible(self.get_manager_type() is not None)
         self.home_button.set_visible(False)
 
     def _update_preferences_visibility(self, visible: bool):
@@ -142,12 +159,8 @@ class SudokuWindow(Adw.ApplicationWindow):
         raise ValueError(f"Unknown Sudoku variant: {variant}")
 
     def get_manager_type(self, filename=None):
-        path = filename or _get_save_path()
-        if not os.path.exists(path):
-            return None
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("variant", "Unknown")
+        entry = SaveIndex.shared().entry(filename or _get_save_path())
+        return entry.variant if entry is not None else None
 
     def on_continue_clicked(self, _):
         variant = self.get_manager_type()
@@ -159,7 +172,11 @@ class SudokuWindow(Adw.ApplicationWindow):
     def on_new_game_clicked(self, _):
         GameSetupDialog(on_select=self.on_game_setup_selected).present(self)
 
-    def on_game_setup_selected(self, variant_name, difficulty):
+    def on_game_setup_selected(
+        self, variant_name, difficulty, block_size=DEFAULT_BLOCK_SIZE
+    ):
+        if self.manager:
+            self.manager.cancel_start_game()
         self.manager, prefs = self._get_variant_and_prefs(variant_name)
         PreferencesManager.set_preferences(prefs)
 
@@ -170,16 +187,23 @@ class SudokuWindow(Adw.ApplicationWindow):
             0.9: _("Extreme"),
         }
         label = label_map.get(difficulty, str(difficulty))
+        if block_size != DEFAULT_BLOCK_SIZE:
+            label = f"{label} • {block_size * block_size} × {block_size * block_size}"
 
         self.sudoku_window_title.set_subtitle(f"{variant_name.capitalize()} • {label}")
         self._setup_ui()
-        self.manager.start_game(difficulty, label, variant_name)
+        self.manager.start_game(difficulty, label, variant_name, block_size)
 
     def on_show_primary_menu(self):
         self.primary_menu_button.popup()
 
     def on_show_preferences(self, *_):
-        PreferencesDialog(self.manager.board.save_to_file).present(self)
+        PreferencesDialog(self._on_preferences_changed).present(self)
+
+    def _on_preferences_changed(self):
+        self.manager.board.compact()
+        # Casual mode and flag_unsolvable_entries decide what is flagged
+        self.manager.check_blocking_entries()
 
     def _on_window_pressed(self, gesture, n_press, x, y):
         if gesture.get_current_button() != 1:
@@ -270,13 +294,24 @@ class SudokuWindow(Adw.ApplicationWindow):
         self.stack.set_valign(Gtk.Align.FILL)
 
     def on_back_to_menu(self, *_):
-        self.continue_button.set_visible(os.path.exists(_get_save_path()))
+        if self.manager:
+            self.manager.cancel_start_game()
+        # The menu offers to continue from what is on disk
+        self.save_game()
+        self.continue_button.set_visible(self.get_manager_type() is not None)
         self.sudoku_window_title.set_subtitle("")
         self.stack.set_visible_child(self.main_menu_box)
         self.pencil_toggle_button.set_visible(False)
         PreferencesManager.set_preferences(None)
         self._update_preferences_visibility(False)
 
+    def save_game(self):
+        """Write out the game in full, if it was saved at all, before leaving it."""
+        board = self.manager.board if self.manager else None
+        if board is not None and board.journal.epoch is not None:
+            board.compact()
+        SaveService.shared().flush()
+
     def _on_pencil_toggled_button(self, button):
         if self.manager:
             self._change_subtitle_for_pencil_mode()
@@ -288,6 +323,29 @@ class SudokuWindow(Adw.ApplicationWindow):
         self.pencil_toggle_button.set_active(not self.pencil_toggle_button.get_active())
         self._change_subtitle_for_pencil_mode()
 
+    def _on_undo_action(self, *_):
+        if self.manager and self.is_game_page:
+            self.manager.undo()
+
+    def _on_redo_action(self, *_):
+        if self.manager and self.is_game_page:
+            self.manager.redo()
+
+    def _on_fill_notes_action(self, *_):
+        if self.manager and self.is_game_page:
+            self.manager.fill_all_notes()
+
+    def _on_hint_action(self, *_):
+        if self.manager and self.is_game_page:
+            self.manager.show_hint()
+
+    def show_hint_subtitle(self, text: str | None):
+        """Explain a hint in the subtitle, or restore it when `text` is None."""
+        if text is None:
+            self._change_subtitle_for_pencil_mode()
+        else:
+            self.sudoku_window_title.set_subtitle(text)
+
     def _change_subtitle_for_pencil_mode(self):
         non_game_pages = {
             self.main_menu_box,
@@ -322,6 +380,11 @@ class SudokuWindow(Adw.ApplicationWindow):
 
     def _build_primary_menu(self, show_preferences=True):
         menu, section = Gio.Menu(), Gio.Menu()
+        if show_preferences:
+            game_section = Gio.Menu()
+            game_section.append(_("Show Hint"), "win.hint")
+            game_section.append(_("Fill All Notes"), "win.fill-notes")
+            menu.append_section(None, game_section)
         section.append(_("Keyboard Shortcuts"), "app.shortcuts")
         if show_preferences:
             section.append(_("Preferences"), "win.show-preferences")
@@ -1,6 +1,6 @@
 import os
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -46,3 +46,26 @@ def _prefs_guard(dummy_preferences_factory):
         yield
     finally:
         PreferencesManager.set_preferences(None)
+
+
+@pytest.fixture
+def sample_solution():
+    return [[str((r * 3 + r // 3 + c) % 9 + 1) for c in range(9)] for r in range(9)]
+
+
+@pytest.fixture
+def board(request, sample_solution):
+    """
+    A classic board with `sample_solution` and no clues, or the clues of an
+    indirect parametrisation as {(row, col): digit}.
+    """
+    from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+    puzzle = [[None] * 9 for _ in range(9)]
+    for (row, col), digit in getattr(request, "param", {}).items():
+        puzzle[row][col] = digit
+    with patch(
+        "src.base.generator_base.GeneratorBase.generate",
+        return_value=(puzzle, sample_solution),
+    ):
+        return ClassicSudokuBoard(0.5, "Medium", "classic")
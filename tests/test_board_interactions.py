@@ -3,7 +3,9 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 
+from src.base.preferences_manager import PreferencesManager
 from src.variants.classic_sudoku.board import ClassicSudokuBoard
+from src.variants.classic_sudoku.preferences import ClassicSudokuPreferences
 from src.variants.classic_sudoku.manager import ClassicSudokuManager, Gdk
 
 
@@ -176,11 +178,12 @@ def test_on_clear_selected_clears_cell_and_closes_popover(manager):
 
 
 def test_clear_cell_clear_all_removes_value_notes_and_saves(manager):
-    manager.board.save_to_file = MagicMock()
+    manager.board.save = MagicMock()
     target_cell = manager.cell_inputs[1][1]
     target_cell.set_value("9")
     manager.board.user_inputs[1][1] = "9"
-    manager.board.notes[1][1] = {"1", "3"}
+    for digit in ("1", "3"):
+        manager.board.toggle_note(1, 1, digit)
 
     manager._clear_cell(target_cell, clear_all=True)
 
@@ -188,17 +191,133 @@ def test_clear_cell_clear_all_removes_value_notes_and_saves(manager):
     assert manager.board.get_notes(1, 1) == set()
     assert target_cell.cleared is True
     assert target_cell.notes == set()
-    manager.board.save_to_file.assert_called_once()
+    manager.board.save.assert_called_once()
 
 
 def test_clear_cell_in_pencil_mode_removes_highest_note_only(manager):
-    manager.board.save_to_file = MagicMock()
+    manager.board.save = MagicMock()
     manager.pencil_mode = True
     target_cell = manager.cell_inputs[0][0]
-    manager.board.notes[0][0] = {"1", "4", "9"}
+    for digit in ("1", "4", "9"):
+        manager.board.toggle_note(0, 0, digit)
 
     manager._clear_cell(target_cell)
 
     assert manager.board.get_notes(0, 0) == {"1", "4"}
     assert target_cell.notes == {"1", "4"}
-    manager.board.save_to_file.assert_called_once()
+    manager.board.save.assert_called_once()
+
+
+def test_right_click_notes_in_the_popover_are_one_move_saved_on_close(manager):
+    manager.board.save = MagicMock()
+    target_cell = manager.cell_inputs[2][2]
+    popover = MagicMock()
+
+    for label in ("1", "4", "7"):
+        number_button = MagicMock()
+        number_button.get_label.return_value = label
+        manager.on_number_selected(number_button, target_cell, popover, 3)
+
+    assert target_cell.notes == {"1", "4", "7"}
+    manager.board.save.assert_not_called()
+
+    manager._on_cell_popover_closed(popover)
+
+    manager.board.save.assert_called_once()
+    assert manager.board.undo() == [(2, 2)]
+    assert manager.board.get_notes(2, 2) == set()
+
+
+def test_fill_all_notes_redraws_each_cell_once_and_saves_once(manager):
+    manager.board.save = MagicMock()
+    manager.board.user_inputs[0][0] = "1"
+    redraws = []
+    for row in manager.cell_inputs:
+        for cell in row:
+            cell.update_notes = lambda notes, cell=cell: redraws.append(cell)
+
+    manager.fill_all_notes()
+
+    assert len(redraws) == len(set(redraws)) == 80
+    manager.board.save.assert_called_once()
+
+
+def _check_blocking_entries(manager, dummy_preferences_factory, general_defaults):
+    PreferencesManager.set_preferences(
+        general_defaults
+        and dummy_preferences_factory(general_defaults=general_defaults)
+    )
+    with patch.object(ClassicSudokuBoard, "check_blocking_entries") as check:
+        manager.check_blocking_entries()
+    return check
+
+
+def test_blocking_entries_are_flagged_by_default_without_casual_mode(
+    manager, dummy_preferences_factory
+):
+    general_defaults = {
+        "casual_mode": ["", False],
+        "flag_unsolvable_entries": list(
+            ClassicSudokuPreferences.general_defaults["flag_unsolvable_entries"]
+        ),
+    }
+
+    check = _check_blocking_entries(
+        manager, dummy_preferences_factory, general_defaults
+    )
+
+    check.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "general_defaults",
+    [
+        None,
+        {"casual_mode": ["", True], "flag_unsolvable_entries": ["", True]},
+        {"casual_mode": ["", False], "flag_unsolvable_entries": ["", False]},
+    ],
+)
+def test_blocking_entries_are_not_flagged_when_turned_off(
+    manager, dummy_preferences_factory, general_defaults
+):
+    check = _check_blocking_entries(
+        manager, dummy_preferences_factory, general_defaults
+    )
+
+    check.assert_not_called()
+
+
+def _refresh_wrong_entry(manager, dummy_preferences_factory, casual_mode):
+    PreferencesManager.set_preferences(
+        dummy_preferences_factory(general_defaults={"casual_mode": ["", casual_mode]})
+    )
+    manager.cell_inputs = [[MagicMock() for _ in range(9)] for _ in range(9)]
+    for row in manager.cell_inputs:
+        for cell in row:
+            cell.get_value.return_value = ""
+    wrong = "2" if manager.board.get_correct_value(0, 0) != 2 else "3"
+    manager.board.set_input(0, 0, wrong)
+    manager._refresh_cells([(0, 0)])
+    return manager.cell_inputs[0][0], wrong
+
+
+def test_undo_redo_marks_wrong_entries_in_casual_mode(
+    manager, dummy_preferences_factory
+):
+    cell, _ = _refresh_wrong_entry(manager, dummy_preferences_factory, True)
+
+    cell.highlight.assert_called_with("wrong")
+
+
+def test_undo_redo_only_shows_conflicts_without_casual_mode(
+    manager, dummy_preferences_factory
+):
+    cell, wrong = _refresh_wrong_entry(manager, dummy_preferences_factory, False)
+
+    cell.highlight.assert_not_called()
+
+    manager.cell_inputs[0][5].get_value.return_value = wrong
+    manager._refresh_cells([(0, 0)])
+
+    cell.highlight.assert_called_with("wrong")
+    manager.cell_inputs[0][5].highlight.assert_called_with("conflict")
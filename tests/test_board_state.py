@@ -0,0 +1,153 @@
+import random
+
+import pytest
+
+from src.base.board_state import (
+    DIGIT_INTS,
+    DIGIT_STRS,
+    BoardState,
+    GridView,
+    NoteSet,
+    NotesView,
+)
+
+
+def _grid(text, size=4):
+    return [
+        [int(ch) if ch != "." else None for ch in text[r * size:(r + 1) * size]]
+        for r in range(size)
+    ]
+
+
+def test_views_read_canonical_types_and_write_through():
+    state = BoardState(4)
+    clues = GridView(state.puzzle, 4, DIGIT_INTS)
+    entries = GridView(state.inputs, 4, DIGIT_STRS)
+
+    clues[1][2] = "3"
+    entries[0][0] = 4
+    entries[3][3] = None
+
+    assert clues[1][2] == 3
+    assert entries[0][0] == "4"
+    assert entries[3][3] is None
+    assert state.puzzle[6] == 3
+    assert state.inputs[0] == 4
+
+
+def test_views_compare_by_digits_whatever_the_representation():
+    state = BoardState(4)
+    BoardState.fill(state.solution, _grid("1234341221434321"))
+    solution = GridView(state.solution, 4, DIGIT_INTS)
+
+    assert solution == _grid("1234341221434321")
+    assert solution == [[str(v) for v in row] for row in _grid("1234341221434321")]
+    assert solution[0] == ["1", 2, "3", 4]
+    assert solution != _grid("4321341221434321")
+    assert solution.to_list() == _grid("1234341221434321")
+
+
+def test_fill_rejects_grids_of_another_size():
+    state = BoardState(4)
+
+    with pytest.raises(ValueError):
+        BoardState.fill(state.puzzle, [[1] * 9 for _ in range(9)])
+
+
+def test_out_of_range_access_raises_index_error():
+    view = GridView(BoardState(4).puzzle, 4, DIGIT_INTS)
+
+    with pytest.raises(IndexError):
+        view[4]
+    with pytest.raises(IndexError):
+        view[0][4]
+    assert view[-1][-1] is None
+
+
+def test_note_set_behaves_like_a_set_of_digit_strings():
+    state = BoardState(9)
+    notes = NoteSet(state.notes, 10)
+    assert not notes
+
+    state.notes[10] = 0b1000100
+
+    assert notes == {"3", "7"}
+    assert list(notes) == ["3", "7"]
+    assert "7" in notes and 7 in notes and "x" not in notes and "0" not in notes
+    assert not hasattr(notes, "add")
+
+
+def test_bulk_note_operations_work_on_masks():
+    state = BoardState(9)
+    for i in (0, 1, 2):
+        state.notes[i] = 0b111
+
+    assert state.clear_note([0, 2, 5], "2") == [0, 2]
+    assert state.notes[:3].tolist() == [0b101, 0b111, 0b101]
+    assert state.intersect_notes(1, 0b110) is True
+    assert state.intersect_notes(1, 0b110) is False
+    assert state.count_notes(1) == 2
+
+
+def test_notes_load_from_nested_digits():
+    state = BoardState(4)
+    grid = [[set() for _ in range(4)] for _ in range(4)]
+    grid[0][1] = {"1", "3"}
+
+    state.load_notes(grid)
+
+    assert state.notes[1] == 0b101
+    assert NotesView(state.notes, 4) == grid
+    assert NotesView(state.notes, 4)[0][1] == {"1", "3"}
+
+
+def _snapshot(state):
+    return state.unit_counts.tolist(), state.correct.tolist(), state.unsolved
+
+
+def test_counts_follow_writes_and_match_a_recount():
+    rng = random.Random(5)
+    state = BoardState(4)
+    state.assign(state.solution, _grid("1234341221434321"))
+    state.assign(state.puzzle, _grid("1..4..1..1..4..1"))
+
+    for _ in range(200):
+        state.write(state.inputs, rng.randrange(16), rng.randrange(5))
+        counts = _snapshot(state)
+        state.recount()
+        assert _snapshot(state) == counts
+
+
+def test_counts_answer_conflict_remaining_and_solved_queries():
+    state = BoardState(4)
+    state.assign(state.solution, _grid("1234341221434321"))
+    state.assign(state.puzzle, _grid("1234341221434..."))
+    entries = GridView(state.inputs, 4, DIGIT_STRS, state)
+
+    assert state.unsolved == 3
+    assert state.shown_elsewhere(13, 1)
+    assert not state.shown_elsewhere(13, 3)
+
+    entries[3][1] = "2"
+    entries[3][2] = "2"
+    assert state.correct[2] == 4 and state.correct[3] == 3
+    entries[3][1] = "3"
+    entries[3][3] = "1"
+    assert state.correct[1] == 4 and state.unsolved == 0
+
+
+def test_candidates_match_a_scan_of_each_cells_peers():
+    rng = random.Random(11)
+    state = BoardState(9)
+    topology = state.topology
+    for _ in range(30):
+        state.write(state.inputs, rng.randrange(81), rng.randrange(1, 10))
+
+    candidates = state.candidates()
+
+    for i in range(81):
+        if state.inputs[i]:
+            assert candidates[i] == 0
+            continue
+        seen = {state.inputs[j] for j in topology.peers[i]} - {0}
+        assert candidates[i] == sum(1 << (d - 1) for d in range(1, 10) if d not in seen)
@@ -4,7 +4,9 @@ from unittest.mock import patch
 import pytest
 
 
+from src.base.board_state import digits_of
 from src.base.preferences_manager import PreferencesManager
+from src.base.save_file import read_save
 from src.variants.classic_sudoku.board import ClassicSudokuBoard
 from src.variants.diagonal_sudoku.board import DiagonalSudokuBoard
 from src.variants.diagonal_sudoku.rules import DiagonalSudokuRules
@@ -118,17 +120,16 @@ def test_diagonal_save_load_roundtrip_preserves_board_state(tmp_path):
     assert isinstance(loaded.rules, DiagonalSudokuRules)
 
 
-def test_save_serializes_notes_as_lists(tmp_path):
+def test_save_stores_notes_as_masks(tmp_path):
     board = _build_board(ClassicSudokuBoard, "classic")
-    save_path = tmp_path / "serialized-notes.json"
+    save_path = tmp_path / "serialized-notes.sav"
 
     board.save_to_file(str(save_path))
 
-    with open(save_path, encoding="utf-8") as file_obj:
-        state = json.load(file_obj)
+    state = read_save(str(save_path))
 
-    assert sorted(state["notes"][0][1]) == ["1", "3"]
-    assert state["notes"][4][4] == ["7"]
+    assert digits_of(state["notes"][1]) == ("1", "3")
+    assert digits_of(state["notes"][4 * 9 + 4]) == ("7",)
     assert state["variant"] == "classic"
 
 
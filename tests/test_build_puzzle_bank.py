@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+from src.base.puzzle_bank import PuzzleBank
+
+SCRIPT = os.path.join(
+    os.path.dirname(__file__), "..", "scripts", "build-puzzle-bank.py"
+)
+
+
+def test_builds_a_bank_without_gtk(tmp_path):
+    output = tmp_path / "puzzles.bank"
+    # Shadow gi so that any GTK import in the script fails loudly
+    (tmp_path / "gi.py").write_text("raise ImportError('GTK imported')\n")
+    env = {**os.environ, "PYTHONPATH": str(tmp_path)}
+    args = [str(output), "--count", "3", "--difficulties", "0.2", "0.5", "--jobs", "2"]
+
+    result = subprocess.run(
+        [sys.executable, SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    bank = PuzzleBank(str(output))
+    try:
+        for variant in ("classic", "diagonal"):
+            for difficulty in (0.2, 0.5):
+                assert bank.remaining(variant, difficulty) == 3
+        assert bank.remaining("classic", 0.9) == 0
+    finally:
+        bank.close()
+    assert "Wrote 12 puzzles" in result.stdout
+    assert "p99" in result.stdout
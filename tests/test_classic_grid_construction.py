@@ -126,7 +126,7 @@ def test_build_grid_creates_expected_classic_structure():
         ),
         patch(
             "src.variants.classic_sudoku.manager.SudokuCell",
-            side_effect=lambda row, col, value, editable: _FakeSudokuCell(
+            side_effect=lambda row, col, value, editable, **_: _FakeSudokuCell(
                 row, col, value, editable
             ),
         ),
@@ -162,7 +162,7 @@ def test_build_grid_wraps_appends_and_reapplies_layout():
         ),
         patch(
             "src.variants.classic_sudoku.manager.SudokuCell",
-            side_effect=lambda row, col, value, editable: _FakeSudokuCell(
+            side_effect=lambda row, col, value, editable, **_: _FakeSudokuCell(
                 row, col, value, editable
             ),
         ),
@@ -123,7 +123,7 @@ class TestManagerBoardClassUsage:
         def fake_idle_add(func, *args, **kwargs):
             return func(*args, **kwargs) or True
 
-        def fake_generate(_self, _difficulty, timeout=5):
+        def fake_generate(_self, _difficulty, timeout=5, **_kwargs):
             del timeout
             puzzle = [[None] * 9 for _ in range(9)]
             solution = [
@@ -171,7 +171,7 @@ class TestManagerBoardClassUsage:
         def fake_idle_add(func, *args, **kwargs):
             return func(*args, **kwargs) or True
 
-        def fake_generate(_self, _difficulty, timeout=5):
+        def fake_generate(_self, _difficulty, timeout=5, **_kwargs):
             del timeout
             puzzle = [[None] * 9 for _ in range(9)]
             solution = [
@@ -223,16 +223,20 @@ class TestDiagonalConflictBehavior:
 
         assert (0, 0) in conflicts
 
-    def test_get_existing_value_prefers_puzzle_over_user_input(self, diagonal_board):
+    def test_clues_are_shown_over_user_input(self, diagonal_board):
         diagonal_board.puzzle[2][2] = "4"
         diagonal_board.user_inputs[2][2] = "9"
 
-        assert diagonal_board._get_existing_value(2, 2) == "4"
+        assert diagonal_board.get_clue(2, 2) == "4"
+        assert (2, 2) in diagonal_board.has_conflict(6, 6, "4")
+        assert (2, 2) not in diagonal_board.has_conflict(6, 6, "9")
 
-    def test_iter_diagonal_cells_for_center_includes_both_diagonals(
-        self, diagonal_board
-    ):
-        cells = set(diagonal_board._iter_diagonal_cells(4, 4))
+    def test_diagonal_peers_of_center_include_both_diagonals(self, diagonal_board):
+        topology = diagonal_board.rules.topology
+        cells = {
+            topology.coords[i]
+            for i in topology.diagonal_peers[topology.index(4, 4)]
+        }
 
         assert len(cells) == 16
         assert (0, 0) in cells
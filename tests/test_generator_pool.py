@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.base.generator_base import GeneratorBase
+from src.base.generator_pool import (
+    GenerationCancelled,
+    GenerationRequest,
+    RESULT_BUFFER_SIZE,
+    GeneratorPool,
+)
+from src.base.puzzle_bank import decode_record
+from src.variants.classic_sudoku.manager import ClassicSudokuManager
+
+
+def _pid_grid(difficulty):
+    """Smuggle the worker's pid out in a 2x2 record."""
+    pid = list(os.getpid().to_bytes(4, "little"))
+    return [pid[:2], pid[2:]], [[int(difficulty * 10)] * 2] * 2
+
+
+def _pid(records):
+    return int.from_bytes(records[0][:4], "little")
+
+
+class _PidGenerator(GeneratorBase):
+    def _generate_impl(self, difficulty):
+        return _pid_grid(difficulty)
+
+
+class _SlowGenerator(GeneratorBase):
+    def _generate_impl(self, difficulty):
+        time.sleep(difficulty)
+        return _pid_grid(0)
+
+
+class _LotteryGenerator(GeneratorBase):
+    """Only the first racer to claim the ticket finishes quickly."""
+
+    def __init__(self, ticket):
+        self.ticket = ticket
+
+    def _generate_impl(self, difficulty):
+        try:
+            os.close(os.open(self.ticket, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            time.sleep(30)
+        return _pid_grid(difficulty)
+
+
+class _HugeGenerator(GeneratorBase):
+    def _generate_impl(self, difficulty):
+        return [[1] * 64] * 64, [[1] * 64] * 64
+
+
+class _CrashingGenerator(GeneratorBase):
+    def _generate_impl(self, difficulty):
+        os._exit(1)
+
+
+class _FailingGenerator(GeneratorBase):
+    def _generate_impl(self, difficulty):
+        raise ValueError("bad difficulty")
+
+
+@pytest.fixture
+def pool():
+    test_pool = GeneratorPool(size=1)
+    try:
+        yield test_pool
+    finally:
+        test_pool.shutdown()
+
+
+def test_pool_reuses_warm_worker(pool):
+    first = pool.run(_PidGenerator(), 0.5)
+    second = pool.run(_PidGenerator(), 0.7)
+
+    assert _pid(first) == _pid(second)
+    assert _pid(first) != os.getpid()
+    assert decode_record(second[0])[1] == [[7, 7], [7, 7]]
+
+
+def test_pool_returns_several_records_per_round_trip(pool):
+    records = pool.run(_PidGenerator(), 0.5, count=3)
+
+    assert len(records) == 3
+    assert all(len(record) == 8 for record in records)
+    assert len(pool.run(_PidGenerator(), 0.5, count=10000)) == (
+        RESULT_BUFFER_SIZE // 8
+    )
+
+
+def test_pool_reports_records_that_do_not_fit(pool):
+    with pytest.raises(RuntimeError, match="does not fit"):
+        pool.run(_HugeGenerator(), 0.5)
+
+
+def test_pool_replaces_timed_out_worker(pool):
+    with pytest.raises(TimeoutError):
+        pool.run(_SlowGenerator(), 5, timeout=0.2)
+
+    assert _pid(pool.run(_SlowGenerator(), 0)) != os.getpid()
+
+
+def test_pool_replaces_crashed_worker(pool):
+    with pytest.raises(RuntimeError):
+        pool.run(_CrashingGenerator(), 0.5)
+
+    assert _pid(pool.run(_PidGenerator(), 0.5)) != os.getpid()
+
+
+def test_pool_reports_generator_errors_and_keeps_worker(pool):
+    first = pool.run(_PidGenerator(), 0.5)
+
+    with pytest.raises(RuntimeError, match="bad difficulty"):
+        pool.run(_FailingGenerator(), 0.5)
+
+    assert _pid(pool.run(_PidGenerator(), 0.5)) == _pid(first)
+
+
+def test_race_returns_first_result_and_cancels_the_rest(tmp_path):
+    pool = GeneratorPool(size=3)
+    try:
+        start = time.monotonic()
+        records = pool.run(
+            _LotteryGenerator(str(tmp_path / "ticket")), 0.9, timeout=10, racers=3
+        )
+
+        assert time.monotonic() - start < 5
+        assert _pid(records) != os.getpid()
+        assert len(pool._idle) == 3
+        assert all(worker.is_alive() for worker in pool._idle)
+        pool.run(_PidGenerator(), 0.5, timeout=1, racers=3)
+    finally:
+        pool.shutdown()
+
+
+def test_race_uses_only_free_workers(pool):
+    assert _pid(pool.run(_PidGenerator(), 0.9, racers=4)) != os.getpid()
+    assert pool._count == 1
+
+
+def test_racers_only_for_hard_difficulties():
+    generator = _PidGenerator()
+
+    assert generator.racers_for(0.5) == 1
+    assert generator.racers_for(0.9) >= 1
+
+    generator.race_threshold = None
+    assert generator.racers_for(0.9) == 1
+
+
+def test_cancelled_request_kills_its_worker(pool):
+    request = GenerationRequest()
+    first = _pid(pool.run(_PidGenerator(), 0.5))
+    threading.Timer(0.1, request.cancel).start()
+
+    start = time.monotonic()
+    with pytest.raises(GenerationCancelled):
+        pool.run(_SlowGenerator(), 30, timeout=60, request=request)
+
+    assert time.monotonic() - start < 5
+    assert _pid(pool.run(_PidGenerator(), 0.5)) != first
+
+
+def test_only_latest_start_game_reaches_the_ui():
+    started = []
+
+    class _DeferredThread:
+        def __init__(self, *args, target=None, **kwargs):
+            self.start = lambda: started.append(target)
+
+    def fake_generate(_self, difficulty, timeout=5, **_kwargs):
+        puzzle = [[None] * 9 for _ in range(9)]
+        solution = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+        return puzzle, solution
+
+    manager = ClassicSudokuManager(MagicMock())
+    with (
+        patch("src.base.manager_base.threading.Thread", _DeferredThread),
+        patch(
+            "src.base.manager_base.GLib.idle_add",
+            lambda func, *args: func(*args),
+        ),
+        patch("src.base.generator_base.GeneratorBase.generate", fake_generate),
+        patch.object(ClassicSudokuManager, "build_grid"),
+    ):
+        manager.start_game(0.9, "Extreme", "classic")
+        manager.start_game(0.2, "Easy", "classic")
+        stale, latest = started
+
+        stale()
+        assert manager.board is None
+
+        latest()
+        assert manager.board.difficulty_label == "Easy"
+
+        manager.start_game(0.5, "Medium", "classic")
+        manager.cancel_start_game()
+        started[-1]()
+        assert manager.board.difficulty_label == "Easy"
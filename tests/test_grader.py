@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from src.base.grader import get_grader, grade_level, make_graded_puzzle
+from src.base.solver import flatten
+
+EASY_PUZZLE = (
+    "53..7...."
+    "6..195..."
+    ".98....6."
+    "8...6...3"
+    "4..8.3..1"
+    "7...2...6"
+    ".6....28."
+    "...419..5"
+    "....8..79"
+)
+
+
+def _cells(text):
+    return [int(ch) if ch != "." else 0 for ch in text]
+
+
+def _without(cand, digit, cells):
+    for i in cells:
+        cand[i] &= ~(1 << (digit - 1))
+    return cand
+
+
+def test_singles_only_puzzle_grades_easy():
+    grader = get_grader()
+
+    grade = grader.grade(_cells(EASY_PUZZLE))
+
+    assert grade <= 1.2
+    assert grade_level(grade) == 0
+
+
+def test_locked_candidates_clear_the_rest_of_the_row():
+    grader = get_grader()
+    cand = _without([grader.full] * 81, 1, (9, 10, 11, 18, 19, 20))
+
+    _, eliminations = grader._locked_candidates(cand)
+
+    assert eliminations == [(i, 1) for i in range(3, 9)]
+
+
+def test_naked_pair_clears_its_digits_from_the_unit():
+    grader = get_grader()
+    cand = [grader.full] * 81
+    cand[0] = cand[1] = 0b11
+
+    _, eliminations = grader._naked_subset(cand, 2)
+
+    assert sorted(eliminations) == [(i, d) for i in range(2, 9) for d in (1, 2)]
+
+
+def test_x_wing_clears_its_columns():
+    grader = get_grader()
+    others = [c for c in range(9) if c not in (0, 4)]
+    cand = _without([grader.full] * 81, 1, others + [45 + c for c in others])
+
+    _, eliminations = grader._fish(cand, 2)
+
+    expected = [(r * 9 + c, 1) for r in range(9) if r not in (0, 5) for c in (0, 4)]
+    assert sorted(eliminations) == sorted(expected)
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_every_step_agrees_with_the_solution(diagonal):
+    grader = get_grader(3, diagonal)
+    rng = random.Random(7)
+    for difficulty in (0.5, 0.7, 0.9):
+        puzzle, solution = make_graded_puzzle(difficulty, 3, diagonal, rng)
+        cells, answer = flatten(puzzle), flatten(solution)
+        cand = grader.candidates(cells)
+        while step := grader.find_next_step(cells, cand):
+            for i, digit in step.placements:
+                assert answer[i] == digit, step
+            for i, digit in step.eliminations:
+                assert answer[i] != digit, step
+            grader.apply(step, cells, cand)
+        assert all(c in (0, a) for c, a in zip(cells, answer))
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+@pytest.mark.parametrize("level, difficulty", list(enumerate((0.2, 0.5, 0.7, 0.9))))
+def test_graded_puzzles_match_their_level(diagonal, level, difficulty):
+    puzzle, _ = make_graded_puzzle(difficulty, 3, diagonal, random.Random(3))
+
+    grade = get_grader(3, diagonal).grade(flatten(puzzle))
+
+    assert grade_level(grade) == level
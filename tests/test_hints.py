@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+from src.base.board_state import BoardState
+from src.base.grader import LogicalGrader
+from src.base.hints import Hint, HintEngine
+from src.base.topology import get_topology
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+PUZZLE = (
+    "53..7...."
+    "6..195..."
+    ".98....6."
+    "8...6...3"
+    "4..8.3..1"
+    "7...2...6"
+    ".6....28."
+    "...419..5"
+    "....8..79"
+)
+SOLUTION = (
+    "534678912"
+    "672195348"
+    "198342567"
+    "859761423"
+    "426853791"
+    "713924856"
+    "961537284"
+    "287419635"
+    "345286179"
+)
+
+
+def _state(puzzle, solution, block_size=3, diagonal=False):
+    topology = get_topology(block_size, diagonal)
+    state = BoardState(topology.size, topology)
+    state.puzzle[:] = bytes(int(ch) if ch != "." else 0 for ch in puzzle)
+    state.solution[:] = bytes(int(ch) for ch in solution)
+    state.recount()
+    return state
+
+
+def test_hint_is_the_easiest_step_in_board_coordinates():
+    state = _state(PUZZLE, SOLUTION)
+    hint = HintEngine(get_topology(3)).next_hint(state)
+
+    assert hint.technique == "naked single"
+    ((row, col, digit),) = hint.placements
+    assert digit == int(SOLUTION[row * 9 + col])
+    assert hint.cells == [(row, col)]
+    assert hint.explanation() == (
+        f"Naked single: {digit} goes in row {row + 1}, column {col + 1}"
+    )
+
+
+def test_notes_narrow_the_candidates_unless_they_rule_out_the_answer():
+    engine = HintEngine(get_topology(3))
+    state = _state(PUZZLE, SOLUTION)
+    state.notes[2] = 1 << 3
+
+    assert engine.next_hint(state, use_notes=True).placements == ((0, 2, 4),)
+
+    state.notes[2] = 1 << 0
+    assert engine.next_hint(state, use_notes=True).placements != ((0, 2, 1),)
+
+
+def test_diagonals_come_from_the_topology():
+    puzzle, solution = "1....2....3.....", "1234341221434321"
+
+    classic = HintEngine(get_topology(2)).next_hint(_state(puzzle, solution, 2))
+    diagonal = HintEngine(get_topology(2, True)).next_hint(
+        _state(puzzle, solution, 2, True)
+    )
+
+    assert diagonal.placements == ((3, 3, 4),)
+    assert classic is None or classic.placements != ((3, 3, 4),)
+
+
+def test_hints_are_memoized_until_the_board_changes():
+    engine = HintEngine(get_topology(3))
+    state = _state(PUZZLE, SOLUTION)
+    first = engine.next_hint(state)
+
+    with patch.object(LogicalGrader, "find_next_step") as find_next_step:
+        assert engine.next_hint(state) is first
+        find_next_step.assert_not_called()
+
+    (row, col, digit), = first.placements
+    state.write(state.inputs, row * 9 + col, digit)
+    assert engine.next_hint(state) is not first
+
+
+def test_elimination_hints_explain_the_first_cell():
+    hint = Hint("x-wing", eliminations=[(0, 4, 3), (0, 4, 7), (5, 4, 3)])
+
+    assert hint.cells == [(0, 4), (5, 4)]
+    assert hint.explanation() == (
+        "X-wing: remove 3, 7 from row 1, column 5 and 1 more cell"
+    )
+
+
+def test_board_hints_flag_entries_without_a_solution_first():
+    grid = [[int(SOLUTION[r * 9 + c]) for c in range(9)] for r in range(9)]
+    puzzle = [
+        [grid[r][c] if PUZZLE[r * 9 + c] != "." else None for c in range(9)]
+        for r in range(9)
+    ]
+    with patch(
+        "src.base.generator_base.GeneratorBase.generate",
+        return_value=(puzzle, grid),
+    ):
+        board = ClassicSudokuBoard(0.5, "Medium", "classic")
+    board.user_inputs[0][2] = "2"
+
+    hint = board.next_hint()
+
+    assert hint.technique == "mistake"
+    assert hint.eliminations == ((0, 2, 2),)
+    assert hint.explanation() == "2 in row 1, column 3 leaves no solution"
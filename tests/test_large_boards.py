@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.base.constants import DIFFICULTY_LEVELS
+from src.base.solver import get_solver, unflatten
+from src.base.ui_helpers import DigitEntry
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+from src.variants.classic_sudoku.generator import ClassicSudokuGenerator
+from src.variants.diagonal_sudoku.board import DiagonalSudokuBoard
+
+
+def _entered(size):
+    numbers = []
+    return numbers, DigitEntry(size, lambda number, target: numbers.append(number))
+
+
+def _build_board(board_cls, variant, block_size):
+    solver = get_solver(block_size, board_cls is DiagonalSudokuBoard)
+    solution = unflatten(solver.solve([0] * block_size**4), block_size**2)
+    puzzle = [[None] * block_size**2 for _ in range(block_size**2)]
+    with patch(
+        "src.base.generator_base.GeneratorBase.generate",
+        return_value=(puzzle, solution),
+    ):
+        return board_cls(0.5, "Medium", variant, block_size=block_size)
+
+
+def test_single_digits_are_entered_at_once_on_small_boards():
+    numbers, entry = _entered(9)
+
+    for digit in "190":
+        entry.feed(digit)
+
+    assert numbers == ["1", "9"]
+    assert not entry.flush()
+
+
+def test_digits_past_the_board_size_are_dropped():
+    numbers, entry = _entered(4)
+
+    for digit in "17049":
+        entry.feed(digit)
+
+    assert numbers == ["1", "4"]
+    assert not entry.flush()
+
+
+def test_two_digit_numbers_on_large_boards():
+    numbers, entry = _entered(16)
+
+    entry.feed("1")
+    assert numbers == []
+    entry.feed("6")
+    entry.feed("7")
+    entry.feed("1")
+    entry.feed("8")
+    entry.feed("1")
+    assert entry.flush()
+
+    assert numbers == ["16", "7", "1", "8", "1"]
+
+
+def test_pending_digit_is_entered_before_moving_to_another_cell():
+    numbers, entry = _entered(25)
+    targets = []
+    entry.on_number = lambda number, target: targets.append((number, target))
+
+    entry.feed("2", (0, 0))
+    entry.feed("2", (0, 1))
+    entry.feed("5", (0, 1))
+
+    assert targets == [("2", (0, 0)), ("25", (0, 1))]
+
+
+def test_large_board_queries_cover_every_digit():
+    board = _build_board(ClassicSudokuBoard, "classic", 4)
+    answer = board.get_correct_value(0, 0)
+
+    assert board.rules.size == 16
+    assert sorted(board.get_remaining_valid_inputs()) == list(range(1, 17))
+    board.set_input(0, 0, answer)
+    assert board.get_remaining_valid_inputs()[answer] == 15
+    assert board.has_conflict(3, 3, str(answer)) == [(0, 0)]
+    assert board.has_conflict(15, 15, str(answer)) == []
+
+    board.toggle_note(0, 1, "16")
+    board.toggle_note(0, 1, "9")
+    assert board.get_notes(0, 1) == {"9", "16"}
+
+
+def test_save_load_roundtrip_keeps_the_board_size(tmp_path):
+    board = _build_board(DiagonalSudokuBoard, "diagonal", 4)
+    board.set_input(15, 15, "12")
+    save_path = tmp_path / "large-save.json"
+
+    board.save_to_file(str(save_path))
+    loaded = DiagonalSudokuBoard.load_from_file(str(save_path))
+
+    assert loaded.rules.block_size == 4
+    assert loaded.generator.block_size == 4
+    assert loaded.solution == board.solution
+    assert loaded.get_input(15, 15) == "12"
+    assert loaded.has_conflict(0, 0, "12") == [(15, 15)]
+
+
+@pytest.mark.parametrize("block_size", [2, 4])
+def test_each_difficulty_level_removes_more_clues(block_size):
+    generator = ClassicSudokuGenerator(block_size)
+    removed = []
+    for difficulty in DIFFICULTY_LEVELS:
+        puzzle, _ = generator._generate_impl(difficulty)
+        removed.append(sum(row.count(None) for row in puzzle))
+
+    assert removed == sorted(set(removed))
@@ -0,0 +1,118 @@
+from src.base.move_history import MoveHistory
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+def test_undo_and_redo_an_entry_with_the_notes_it_removed(board):
+    value = str(board.solution[0][0])
+    board.toggle_note(0, 5, value)
+    board.toggle_note(4, 0, value)
+    board.toggle_note(0, 0, "9")
+
+    with board.move() as changes:
+        board.set_input(0, 0, value)
+        board.remove_note_from_related(0, 0, value)
+
+    assert {change[0] for change in changes} == {0, 5, 36}
+    assert board.get_notes(0, 5) == set()
+
+    touched = board.undo()
+
+    assert sorted(touched) == [(0, 0), (0, 5), (4, 0)]
+    assert board.get_input(0, 0) is None
+    assert board.get_notes(0, 0) == {"9"}
+    assert board.get_notes(0, 5) == {value}
+    assert board.get_notes(4, 0) == {value}
+    assert board.get_remaining_valid_inputs()[int(value)] == 9
+
+    board.redo()
+
+    assert board.get_input(0, 0) == value
+    assert board.get_notes(0, 5) == set()
+    assert board.get_remaining_valid_inputs()[int(value)] == 8
+
+
+def test_unchanged_moves_are_not_recorded(board):
+    with board.move() as changes:
+        board.toggle_note(2, 2, "3")
+        board.toggle_note(2, 2, "3")
+
+    assert changes == []
+    assert not board.history.can_undo()
+
+
+def test_nested_moves_join_the_outer_one(board):
+    with board.move():
+        board.set_input(1, 1, "2")
+        with board.move():
+            board.set_input(1, 2, "3")
+
+    board.undo()
+
+    assert board.get_input(1, 1) is None
+    assert board.get_input(1, 2) is None
+    assert not board.history.can_undo()
+
+
+def test_new_move_drops_the_undone_ones(board):
+    with board.move():
+        board.set_input(0, 1, "4")
+    board.undo()
+
+    assert board.history.can_redo()
+
+    with board.move():
+        board.set_input(0, 2, "5")
+
+    assert not board.history.can_redo()
+    assert board.redo() == []
+
+
+def test_history_keeps_only_the_latest_moves():
+    history = MoveHistory(limit=3)
+    for i in range(5):
+        history.record([(i, 0, 1, 0, 0)])
+
+    undone = []
+    while history.can_undo():
+        undone.append(history.undo()[0][0])
+
+    assert undone == [4, 3, 2]
+
+
+def test_history_survives_save_and_load(board, tmp_path):
+    save_path = tmp_path / "history-save.json"
+    with board.move():
+        board.set_input(3, 3, "6")
+    with board.move():
+        board.toggle_note(3, 4, "7")
+    board.undo()
+
+    board.save_to_file(str(save_path))
+    loaded = ClassicSudokuBoard.load_from_file(str(save_path))
+
+    assert loaded.get_notes(3, 4) == set()
+    loaded.redo()
+    assert loaded.get_notes(3, 4) == {"7"}
+    loaded.undo()
+    loaded.undo()
+    assert loaded.get_input(3, 3) is None
+
+
+def test_fill_all_notes_is_one_undoable_move(board):
+    board.puzzle[0][0] = 1
+    board.user_inputs[0][1] = "2"
+    board.toggle_note(8, 8, "5")
+    board.history = MoveHistory()
+
+    cells = board.fill_all_notes()
+
+    assert len(cells) == 79
+    assert board.get_notes(0, 2) == {str(d) for d in range(3, 10)}
+    assert board.get_notes(8, 8) == {str(d) for d in range(1, 10)}
+    assert board.get_notes(0, 1) == set()
+
+    board.undo()
+
+    assert board.get_notes(0, 2) == set()
+    assert board.get_notes(8, 8) == {"5"}
+    assert not board.history.can_undo()
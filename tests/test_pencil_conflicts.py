@@ -146,7 +146,7 @@ def test_no_conflict(classic_board):
 def test_pencil_pref_off(classic_board):
     manager = ClassicSudokuManager(MagicMock())
     manager.board = classic_board
-    manager.board.save_to_file = MagicMock()
+    manager.board.save = MagicMock()
     manager.pencil_mode = True
     manager.cell_inputs = [[MockCell(r, c) for c in range(9)] for r in range(9)]
 
@@ -166,7 +166,7 @@ def test_pencil_pref_off(classic_board):
 def test_pencil_pref_on_and_filled_guard(classic_board):
     manager = ClassicSudokuManager(MagicMock())
     manager.board = classic_board
-    manager.board.save_to_file = MagicMock()
+    manager.board.save = MagicMock()
     manager.pencil_mode = True
     manager.cell_inputs = [[MockCell(r, c) for c in range(9)] for r in range(9)]
 
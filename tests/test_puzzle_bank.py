@@ -0,0 +1,105 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.base.puzzle_bank import (
+    PuzzleBank,
+    PuzzleBankWriter,
+    decode_record,
+    encode_record,
+)
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+def _solution(shift=0):
+    return [
+        [(r * 3 + r // 3 + c + shift) % 9 + 1 for c in range(9)] for r in range(9)
+    ]
+
+
+def _puzzle(solution):
+    return [
+        [solution[r][c] if (r + c) % 3 == 0 else None for c in range(9)]
+        for r in range(9)
+    ]
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / "puzzles.bank"
+    with PuzzleBankWriter(str(path)) as writer:
+        writer.begin_bucket("classic", 0.5)
+        for shift in range(5):
+            solution = _solution(shift)
+            writer.add(_puzzle(solution), solution)
+        writer.begin_bucket("diagonal", 0.9)
+        writer.add(_puzzle(_solution()), _solution())
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_bank():
+    yield
+    PuzzleBank.set_shared(None)
+
+
+def test_record_roundtrip():
+    solution = _solution()
+    puzzle = _puzzle(solution)
+
+    record = encode_record(puzzle, solution)
+
+    assert len(record) == 162
+    assert decode_record(record) == (puzzle, solution)
+
+
+def test_draw_returns_every_record_once_then_exhausts(bank_path):
+    bank = PuzzleBank(str(bank_path))
+
+    drawn = [bank.draw("classic", 0.5) for _ in range(5)]
+
+    assert sorted(solution[0][0] for _, solution in drawn) == [1, 2, 3, 4, 5]
+    assert bank.remaining("classic", 0.5) == 0
+    assert bank.draw("classic", 0.5) is None
+    assert bank.remaining("diagonal", 0.9) == 1
+    assert bank.draw("classic", 0.2) is None
+    bank.close()
+
+
+def test_draw_matches_nearest_difficulty_bucket(bank_path):
+    bank = PuzzleBank(str(bank_path))
+
+    assert bank.draw("diagonal", 0.88) == (_puzzle(_solution()), _solution())
+    bank.close()
+
+
+def test_open_first_skips_invalid_banks(tmp_path, bank_path):
+    invalid = tmp_path / "invalid" / "sudokugame"
+    invalid.mkdir(parents=True)
+    (invalid / "puzzles.bank").write_bytes(b"not a bank")
+    valid = tmp_path / "valid" / "sudokugame"
+    valid.mkdir(parents=True)
+    bank_path.rename(valid / "puzzles.bank")
+
+    bank = PuzzleBank.open_first(
+        [str(tmp_path / "missing"), str(tmp_path / "invalid"), str(tmp_path / "valid")]
+    )
+
+    assert bank is PuzzleBank.get()
+    assert bank.remaining("classic", 0.5) == 5
+
+
+def test_board_draws_from_bank_before_generating(bank_path):
+    PuzzleBank.set_shared(PuzzleBank(str(bank_path)))
+
+    with patch(
+        "src.base.generator_base.GeneratorBase.generate",
+        side_effect=AssertionError("should not generate"),
+    ):
+        board = ClassicSudokuBoard(0.5, "Medium", "classic")
+
+    clues = [(r, c) for r in range(9) for c in range(9) if board.puzzle[r][c]]
+    assert len(clues) == 27
+    assert all(board.puzzle[r][c] == board.solution[r][c] for r, c in clues)
+    assert ClassicSudokuBoard.has_instant_puzzle("classic", 0.5)
+    assert not ClassicSudokuBoard.has_instant_puzzle("classic", 0.2)
@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.base.puzzle_bank import encode_record
+from src.base.puzzle_cache import PuzzleCache
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+def _solution():
+    return [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    PuzzleCache.reset()
+    yield
+    PuzzleCache.reset()
+
+
+@pytest.fixture
+def generator():
+    generator = MagicMock(block_size=3, diagonal=False)
+    generator.generate_many.side_effect = lambda difficulty, count, **_: [
+        encode_record([[None] * 9 for _ in range(9)], _solution())
+    ] * count
+    return generator
+
+
+def test_refill_fills_every_difficulty_up_to_capacity(generator):
+    PuzzleCache.start_prefetch({"classic": generator})
+
+    PuzzleCache.refill()
+
+    assert generator.generate_many.call_count == 4
+    for call in generator.generate_many.call_args_list:
+        assert call.args[1] == PuzzleCache.capacity
+    for difficulty in (0.2, 0.5, 0.7, 0.9):
+        assert PuzzleCache.has_ready("classic", difficulty)
+
+
+def test_take_consumes_buffer_and_schedules_refill(generator):
+    PuzzleCache.start_prefetch({"classic": generator})
+    PuzzleCache.refill()
+
+    with patch.object(PuzzleCache, "schedule_refill") as schedule_refill:
+        for _ in range(PuzzleCache.capacity):
+            assert PuzzleCache.take("classic", 0.5) is not None
+
+    assert schedule_refill.call_count == PuzzleCache.capacity
+    assert generator.generate_many.call_count == 4
+
+
+def test_empty_buffer_falls_back_to_isomorph_of_seed(generator):
+    PuzzleCache.start_prefetch({"classic": generator})
+    PuzzleCache.refill()
+    for _ in range(PuzzleCache.capacity):
+        PuzzleCache.take("classic", 0.5)
+
+    assert PuzzleCache.has_ready("classic", 0.5)
+    puzzle, solution = PuzzleCache.take("classic", 0.5)
+
+    assert puzzle == [[None] * 9 for _ in range(9)]
+    assert all(sorted(row) == list(range(1, 10)) for row in solution)
+
+
+def test_a_seed_serves_only_a_few_games_until_the_next_refill(generator):
+    PuzzleCache.start_prefetch({"classic": generator})
+    PuzzleCache.refill()
+    for _ in range(PuzzleCache.capacity + PuzzleCache.seed_reuse):
+        assert PuzzleCache.take("classic", 0.5) is not None
+
+    assert not PuzzleCache.has_ready("classic", 0.5)
+    assert PuzzleCache.take("classic", 0.5) is None
+
+    PuzzleCache.refill()
+
+    assert PuzzleCache.has_ready("classic", 0.5)
+
+
+def test_take_before_first_refill_returns_none(generator):
+    PuzzleCache.start_prefetch({"classic": generator})
+
+    assert not PuzzleCache.has_ready("classic", 0.5)
+    assert PuzzleCache.take("classic", 0.5) is None
+
+
+def test_take_unknown_variant_returns_none():
+    assert PuzzleCache.take("diagonal", 0.5) is None
+
+
+def test_refill_skips_failing_buffers(generator):
+    generator.generate_many.side_effect = TimeoutError("too slow")
+    PuzzleCache.start_prefetch({"classic": generator})
+
+    PuzzleCache.refill()
+
+    assert generator.generate_many.call_count == 4
+    assert not PuzzleCache.has_ready("classic", 0.2)
+
+
+def test_board_uses_prefetched_puzzle(generator):
+    PuzzleCache.start_prefetch({"classic": generator})
+    PuzzleCache.refill()
+
+    with patch(
+        "src.base.generator_base.GeneratorBase.generate",
+        side_effect=AssertionError("should not generate"),
+    ):
+        board = ClassicSudokuBoard(0.5, "Medium", "classic")
+
+    assert board.solution == _solution()
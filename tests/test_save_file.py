@@ -0,0 +1,112 @@
+import json
+import os
+
+from src.base.save_file import (
+    backup_path,
+    legacy_path,
+    read_save,
+    read_save_header,
+)
+from src.base.save_format import HEADER, decode_header, decode_save, encode_save
+from src.base.save_journal import journal_path
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+def test_binary_saves_round_trip(board):
+    board.set_input(0, 0, "1")
+    board.toggle_note(0, 1, "3")
+    with board.move():
+        board.set_input(4, 4, "7")
+    snapshot = board.snapshot()
+
+    decoded = decode_save(encode_save(snapshot))
+
+    for key, value in snapshot.items():
+        assert decoded[key] == value, key
+    assert len(encode_save(snapshot)) < 1024
+
+
+def test_the_header_reads_without_the_body(board):
+    data = encode_save(board.snapshot())
+    header_length = HEADER.unpack_from(data)[2]
+
+    header = decode_header(data)
+
+    assert header["variant"] == "classic"
+    assert header["difficulty_label"] == "Medium"
+    assert header["block_size"] == 3
+    assert header_length < 64
+
+
+def test_the_previous_save_is_kept_as_a_backup(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.set_input(0, 0, "1")
+    board.save_to_file(save_path)
+    board.set_input(0, 1, "2")
+    board.save_to_file(save_path)
+
+    assert read_save(backup_path(save_path))["user_inputs"][1] == 0
+    assert read_save(save_path)["user_inputs"][1] == 2
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_a_truncated_save_falls_back_to_the_backup(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.set_input(0, 0, "1")
+    board.save_to_file(save_path)
+    board.set_input(0, 1, "2")
+    board.save_to_file(save_path)
+
+    with open(save_path, "rb") as f:
+        data = f.read()
+    with open(save_path, "wb") as f:
+        f.write(data[: len(data) // 2])
+
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+
+    assert loaded.get_input(0, 0) == "1"
+    assert loaded.get_input(0, 1) is None
+
+
+def test_a_save_with_a_wrong_checksum_is_rejected(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+
+    with open(save_path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"\xff")
+
+    assert read_save(save_path) is None
+    assert read_save_header(save_path) is None
+
+
+def test_json_saves_are_migrated(board, sample_solution, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.set_input(0, 0, "1")
+    board.save_to_file(save_path)
+    state = read_save(save_path)
+    os.remove(save_path)
+    os.remove(journal_path(save_path))
+    with open(legacy_path(save_path), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "difficulty": 0.5,
+                "variant": "classic",
+                "puzzle": [[None] * 9 for _ in range(9)],
+                "solution": [[int(v) for v in row] for row in sample_solution],
+                "user_inputs": [["1"] + [None] * 8] + [[None] * 9] * 8,
+                "notes": [[[] for _ in range(9)] for _ in range(9)],
+            },
+            f,
+        )
+
+    assert read_save_header(save_path)["variant"] == "classic"
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+    assert loaded.get_input(0, 0) == "1"
+    assert loaded.journal.needs_compaction()
+
+    loaded.save_to_file(save_path)
+
+    assert read_save(save_path)["user_inputs"] == state["user_inputs"]
+    assert not os.path.exists(legacy_path(save_path))
+    assert read_save(backup_path(save_path))["variant"] == "classic"
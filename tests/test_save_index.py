@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+
+
+from src.base import save_index
+from src.base.save_index import SaveIndex
+from src.base.save_service import SaveService
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+@pytest.fixture
+def index():
+    index = SaveIndex()
+    with patch.object(SaveIndex, "shared", return_value=index):
+        yield index
+
+
+@pytest.mark.parametrize("board", [{(0, 0): 1}], indirect=True)
+def test_continuing_parses_the_save_once(board, index, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.set_input(0, 1, "4")
+    board.save_to_file(save_path)
+
+    with patch.object(save_index, "read_save", wraps=save_index.read_save) as read:
+        entry = index.entry(save_path)
+        assert index.entry(save_path) is entry
+        loaded = ClassicSudokuBoard.load_from_file(save_path)
+
+    assert read.call_count == 1
+    assert entry.variant == "classic"
+    assert entry.difficulty_label == "Medium"
+    assert entry.state is None
+    assert loaded.get_input(0, 1) == "4"
+
+
+@pytest.mark.parametrize("board", [{(0, 0): 1}], indirect=True)
+def test_writes_through_the_save_service_invalidate_entries(board, index, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    assert index.entry(save_path).state["user_inputs"][1] == 0
+    service = SaveService()
+    service.idle_delay = service.max_delay = 60
+
+    with (
+        patch("src.base.board_base._get_save_path", return_value=save_path),
+        patch.object(SaveService, "shared", return_value=service),
+    ):
+        board.set_input(0, 1, "4")
+        board.compact()
+        service.flush()
+
+    assert index.entry(save_path).state["user_inputs"][1] == 4
+
+
+def test_missing_saves_have_no_entry(index, tmp_path):
+    assert index.entry(str(tmp_path / "board.sav")) is None
+
+
+def test_saves_missing_the_grids_have_no_entry(index, tmp_path):
+    save_path = tmp_path / "board.json"
+    save_path.write_text('{"variant": "classic", "difficulty": 0.5}')
+
+    assert index.entry(str(save_path)) is None
@@ -0,0 +1,210 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+
+from src.base.save_file import read_save, write_save
+from src.base.save_format import encode_save
+from src.base.save_service import SaveService
+from src.base.save_journal import HEADER, RECORD, SaveJournal, journal_path
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+def _play(board):
+    with board.move():
+        board.set_input(0, 0, "1")
+    with board.move():
+        board.toggle_note(0, 1, "3")
+        board.toggle_note(0, 1, "5")
+    with board.move():
+        board.set_input(4, 4, "7")
+    board.undo()
+
+
+def test_moves_are_appended_to_the_journal_and_replayed(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    with open(save_path, "rb") as f:
+        snapshot = f.read()
+
+    _play(board)
+    board.journal.write(save_path, board.write_snapshot)
+
+    with open(save_path, "rb") as f:
+        assert f.read() == snapshot
+    # Three changed cells, three END records and one UNDO
+    assert os.path.getsize(journal_path(save_path)) == HEADER.size + 7 * RECORD.size
+
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+
+    assert loaded.user_inputs == board.user_inputs
+    assert loaded.notes == board.notes
+    assert loaded.get_input(4, 4) is None
+    loaded.redo()
+    assert loaded.get_input(4, 4) == "7"
+    loaded.undo()
+    loaded.undo()
+    assert loaded.get_notes(0, 1) == set()
+
+
+def test_a_torn_journal_tail_is_ignored(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    _play(board)
+    board.journal.write(save_path, board.write_snapshot)
+
+    with open(journal_path(save_path), "ab") as f:
+        # A move cut off before its END record, then half a record
+        f.write(RECORD.pack(0, 8, 0, 9, 0, 0) + RECORD.pack(0, 9, 0, 9, 0, 0)[:5])
+
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+
+    assert loaded.user_inputs == board.user_inputs
+    assert loaded.get_input(0, 8) is None
+
+
+def test_a_journal_from_another_snapshot_is_not_replayed(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    _play(board)
+    board.journal.write(save_path, board.write_snapshot)
+
+    state = read_save(save_path)
+    state["journal_epoch"] += 1
+    write_save(save_path, encode_save(state))
+
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+
+    assert loaded.get_input(0, 0) is None
+
+
+def test_moves_after_loading_a_snapshot_without_its_journal_are_kept(
+    board, tmp_path
+):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    state = read_save(save_path)
+    state["journal_epoch"] += 1
+    write_save(save_path, encode_save(state))
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+    service = SaveService()
+    service.idle_delay = service.max_delay = 60
+
+    with (
+        patch("src.base.board_base._get_save_path", return_value=save_path),
+        patch.object(SaveService, "shared", return_value=service),
+    ):
+        with loaded.move():
+            loaded.set_input(0, 0, "1")
+        loaded.save()
+        service.flush()
+
+    assert ClassicSudokuBoard.load_from_file(save_path).get_input(0, 0) == "1"
+
+
+def test_moves_after_loading_the_backup_are_kept(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    service = SaveService()
+    service.idle_delay = service.max_delay = 60
+    with (
+        patch("src.base.board_base._get_save_path", return_value=save_path),
+        patch.object(SaveService, "shared", return_value=service),
+    ):
+        board.save_to_file(save_path)
+        with board.move():
+            board.set_input(0, 0, "1")
+        board.save()
+        service.flush()
+        # A newer snapshot, written before a crash kept its journal from
+        # being written, then damaged
+        state = read_save(save_path)
+        state["journal_epoch"] += 1
+        write_save(save_path, encode_save(state))
+        with open(save_path, "wb") as f:
+            f.write(b"damaged")
+
+        loaded = ClassicSudokuBoard.load_from_file(save_path)
+        assert loaded.get_input(0, 0) == "1"
+        with loaded.move():
+            loaded.set_input(0, 1, "2")
+        loaded.save()
+        service.flush()
+
+    assert "recovered_from" not in read_save(save_path)
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+    assert loaded.get_input(0, 0) == "1"
+    assert loaded.get_input(0, 1) == "2"
+
+
+def test_flush_syncs_appended_moves(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    service = SaveService()
+    service.idle_delay = service.max_delay = 60
+    with (
+        patch("src.base.board_base._get_save_path", return_value=save_path),
+        patch.object(SaveService, "shared", return_value=service),
+        patch.object(SaveJournal, "sync_interval", 60),
+    ):
+        board.save_to_file(save_path)
+        with board.move():
+            board.set_input(0, 0, "1")
+        board.save()
+        with patch("src.base.save_journal.os.fsync") as fsync:
+            service.flush()
+
+    fsync.assert_called_once()
+    assert ClassicSudokuBoard.load_from_file(save_path).get_input(0, 0) == "1"
+
+
+def test_compaction_writes_a_new_snapshot_and_empties_the_journal(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+
+    with patch.object(SaveJournal, "compact_every", 3):
+        _play(board)
+        assert board.journal.needs_compaction()
+        board.journal.compact(board.snapshot)
+    board.journal.write(save_path, board.write_snapshot)
+
+    assert os.path.getsize(journal_path(save_path)) == HEADER.size
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+    assert loaded.user_inputs == board.user_inputs
+    assert loaded.notes == board.notes
+    assert loaded.history.can_redo()
+
+
+def test_a_failed_snapshot_write_is_retried(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    with board.move():
+        board.set_input(0, 0, "1")
+    board.journal.compact(board.snapshot)
+
+    def fail(path, snapshot):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        board.journal.write(save_path, fail)
+    with board.move():
+        board.set_input(0, 1, "2")
+    board.journal.write(save_path, board.write_snapshot)
+
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+    assert loaded.get_input(0, 0) == "1"
+    assert loaded.get_input(0, 1) == "2"
+    loaded.undo()
+    assert loaded.get_input(0, 1) is None
+
+
+def test_a_failed_append_makes_the_next_save_a_snapshot(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    board.save_to_file(save_path)
+    with board.move():
+        board.set_input(0, 0, "1")
+
+    with patch("builtins.open", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            board.journal.write(save_path, board.write_snapshot)
+
+    assert board.journal.needs_compaction()
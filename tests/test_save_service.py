@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+
+from src.base.save_service import SaveService
+from src.variants.classic_sudoku.board import ClassicSudokuBoard
+
+
+@pytest.fixture
+def service():
+    service = SaveService()
+    service.idle_delay = 0.05
+    service.max_delay = 0.2
+    return service
+
+
+def _recorder():
+    written, done = [], threading.Event()
+
+    def write(value):
+        written.append(value)
+        done.set()
+
+    return written, done, write
+
+
+def test_a_burst_of_saves_is_written_once(service):
+    written, done, write = _recorder()
+
+    for value in range(5):
+        service.schedule("board.json", lambda value=value: write(value))
+
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert written == [4]
+    assert not service.has_pending()
+
+
+def test_saves_are_not_held_back_longer_than_max_delay(service):
+    written, done, write = _recorder()
+    start = time.monotonic()
+
+    # Never idle long enough, only the staleness bound can trigger a write
+    while not done.is_set() and time.monotonic() - start < 2:
+        service.schedule("board.json", lambda: write(time.monotonic()))
+        time.sleep(0.01)
+
+    assert written
+    assert written[0] - start < service.max_delay + 0.1
+
+
+def test_flush_writes_pending_saves_right_away(service):
+    service.idle_delay = service.max_delay = 60
+    written, _, write = _recorder()
+    service.schedule("a.json", lambda: write("a"))
+    service.schedule("b.json", lambda: write("b"))
+
+    service.flush()
+
+    assert sorted(written) == ["a", "b"]
+    assert not service.has_pending()
+
+
+def test_failed_writes_do_not_stop_the_service(service):
+    written, done, write = _recorder()
+
+    def fail():
+        raise OSError("disk full")
+
+    service.schedule("a.json", fail)
+    service.flush()
+    service.schedule("a.json", lambda: write("ok"))
+
+    assert done.wait(2)
+    assert written == ["ok"]
+
+
+def test_board_save_snapshots_the_state_at_the_time_of_the_call(board, tmp_path):
+    save_path = str(tmp_path / "board.sav")
+    service = SaveService()
+    service.idle_delay = service.max_delay = 60
+
+    with (
+        patch("src.base.board_base._get_save_path", return_value=save_path),
+        patch.object(SaveService, "shared", return_value=service),
+    ):
+        board.set_input(0, 0, "1")
+        board.toggle_note(0, 1, "3")
+        board.save()
+        board.set_input(0, 0, "2")
+        service.flush()
+
+    loaded = ClassicSudokuBoard.load_from_file(save_path)
+
+    assert loaded.get_input(0, 0) == "1"
+    assert loaded.get_notes(0, 1) == {"3"}
@@ -0,0 +1,95 @@
+import random
+
+from src.base.solver import flatten, get_solver, unflatten
+
+PUZZLE = (
+    "53..7...."
+    "6..195..."
+    ".98....6."
+    "8...6...3"
+    "4..8.3..1"
+    "7...2...6"
+    ".6....28."
+    "...419..5"
+    "....8..79"
+)
+SOLUTION = (
+    "534678912"
+    "672195348"
+    "198342567"
+    "859761423"
+    "426853791"
+    "713924856"
+    "961537284"
+    "287419635"
+    "345286179"
+)
+
+
+def _cells(text):
+    return [int(ch) if ch != "." else 0 for ch in text]
+
+
+def _is_valid_solution(solver, cells):
+    full = set(range(1, solver.size + 1))
+    return all({cells[i] for i in unit} == full for unit in solver.units)
+
+
+def test_solve_returns_known_solution():
+    assert get_solver().solve(_cells(PUZZLE)) == _cells(SOLUTION)
+
+
+def test_solve_rejects_conflicting_givens():
+    cells = _cells(PUZZLE)
+    cells[1] = 5
+
+    assert get_solver().solve(cells) is None
+
+
+def test_count_solutions_stops_at_limit():
+    solver = get_solver()
+
+    assert solver.count_solutions(_cells(PUZZLE)) == 1
+    assert solver.count_solutions([0] * 81, limit=3) == 3
+    assert not solver.has_unique_solution([0] * 81)
+
+
+def test_diagonal_solver_enforces_diagonals():
+    solver = get_solver(3, diagonal=True)
+
+    cells = solver.random_solution(random.Random(7))
+
+    assert _is_valid_solution(solver, cells)
+    assert len(solver.units) == 29
+
+
+def test_make_puzzle_is_unique_for_other_block_sizes():
+    solver = get_solver(2)
+
+    puzzle, solution = solver.make_puzzle(0.6, random.Random(3))
+
+    assert _is_valid_solution(solver, flatten(solution))
+    assert solver.has_unique_solution(flatten(puzzle))
+
+
+def test_flatten_roundtrip_accepts_strings_and_none():
+    grid = [["1", None], [None, 2]]
+
+    assert flatten(grid) == [1, 0, 0, 2]
+    assert unflatten([1, 0, 0, 2], 2) == [[1, None], [None, 2]]
+
+
+def test_singles_puzzle_is_unique_and_scales_to_large_boards():
+    solver = get_solver(4)
+
+    puzzle, solution = solver.make_singles_puzzle(0.9, random.Random(5))
+
+    assert _is_valid_solution(solver, flatten(solution))
+    assert solver.has_unique_solution(flatten(puzzle))
+    assert flatten(puzzle).count(0) > 100
+
+    solver = get_solver(5, diagonal=True)
+    puzzle, solution = solver.make_singles_puzzle(0.5, random.Random(5))
+
+    assert _is_valid_solution(solver, flatten(solution))
+    assert solver.solve(flatten(puzzle)) == flatten(solution)
@@ -0,0 +1,70 @@
+import pytest
+
+from src.base.topology import get_topology
+from src.variants.classic_sudoku.rules import ClassicSudokuRules
+from src.variants.diagonal_sudoku.rules import DiagonalSudokuRules
+
+
+def _brute_force_peers(size, block_size, diagonal, row, col):
+    peers = set()
+    for r in range(size):
+        for c in range(size):
+            if (r, c) == (row, col):
+                continue
+            if (
+                r == row
+                or c == col
+                or (
+                    r // block_size == row // block_size
+                    and c // block_size == col // block_size
+                )
+                or (diagonal and r == c and row == col)
+                or (diagonal and r + c == size - 1 and row + col == size - 1)
+            ):
+                peers.add((r, c))
+    return peers
+
+
+@pytest.mark.parametrize("block_size", [2, 3])
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_peers_match_a_full_scan(block_size, diagonal):
+    topology = get_topology(block_size, diagonal)
+    size = block_size * block_size
+
+    for row in range(size):
+        for col in range(size):
+            expected = _brute_force_peers(size, block_size, diagonal, row, col)
+            assert set(topology.peer_coords(row, col)) == expected
+
+
+def test_classic_cell_has_twenty_peers_and_three_units():
+    topology = get_topology(3, False)
+
+    assert {len(peers) for peers in topology.peers} == {20}
+    assert {len(units) for units in topology.cell_units} == {3}
+    assert not any(topology.diagonal_peers)
+
+
+def test_diagonal_membership():
+    topology = get_topology(3, True)
+
+    assert len(topology.diagonal_peers[topology.index(4, 4)]) == 16
+    assert len(topology.diagonal_peers[topology.index(0, 0)]) == 8
+    assert topology.diagonal_peers[topology.index(0, 1)] == ()
+    assert len(topology.peers[topology.index(4, 4)]) == 20 + 12
+
+
+def test_topology_is_shared_per_shape():
+    assert get_topology(3, False) is get_topology(3, False)
+    assert ClassicSudokuRules().topology is get_topology(3, False)
+    assert DiagonalSudokuRules().topology is get_topology(3, True)
+
+
+def test_rules_check_diagonals_only_for_diagonal_variant():
+    grid = [[None] * 9 for _ in range(9)]
+    grid[0][0] = "5"
+
+    assert ClassicSudokuRules().is_valid(grid, 4, 4, "5")
+    assert not DiagonalSudokuRules().is_valid(grid, 4, 4, "5")
+    assert not ClassicSudokuRules().is_valid(grid, 0, 7, "5")
+    assert not ClassicSudokuRules().is_valid(grid, 0, 0, "5")
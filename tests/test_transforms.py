@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from src.base.solver import flatten, get_solver
+from src.base.transforms import random_isomorph
+
+
+def _is_valid_solution(solver, cells):
+    full = set(range(1, solver.size + 1))
+    return all({cells[i] for i in unit} == full for unit in solver.units)
+
+
+@pytest.mark.parametrize(
+    "block_size, diagonal", [(3, False), (3, True), (2, False), (2, True)]
+)
+def test_isomorphs_stay_valid_and_unique(block_size, diagonal):
+    solver = get_solver(block_size, diagonal)
+    rng = random.Random(11)
+    puzzle, solution = solver.make_puzzle(0.6, rng)
+    clue_count = sum(v is not None for row in puzzle for v in row)
+
+    for _ in range(25):
+        new_puzzle, new_solution = random_isomorph(
+            puzzle, solution, block_size, diagonal, rng
+        )
+
+        assert _is_valid_solution(solver, flatten(new_solution))
+        assert sum(v is not None for row in new_puzzle for v in row) == clue_count
+        assert all(
+            v is None or v == new_solution[r][c]
+            for r, row in enumerate(new_puzzle)
+            for c, v in enumerate(row)
+        )
+        assert solver.has_unique_solution(flatten(new_puzzle))
+
+
+def test_isomorphs_look_different():
+    solver = get_solver(3, True)
+    rng = random.Random(5)
+    puzzle, solution = solver.make_puzzle(0.5, rng)
+
+    seen = {
+        str(random_isomorph(puzzle, solution, 3, True, rng)[0]) for _ in range(50)
+    }
+
+    assert len(seen) > 40
@@ -0,0 +1,113 @@
+import threading
+from unittest.mock import patch
+
+from src.base.solver import BitmaskSolver
+from src.base.topology import get_topology
+from src.base.validity import ValidityChecker, ValidityOracle
+
+PUZZLE = (
+    "53..7...."
+    "6..195..."
+    ".98....6."
+    "8...6...3"
+    "4..8.3..1"
+    "7...2...6"
+    ".6....28."
+    "...419..5"
+    "....8..79"
+)
+SOLUTION = (
+    "534678912"
+    "672195348"
+    "198342567"
+    "859761423"
+    "426853791"
+    "713924856"
+    "961537284"
+    "287419635"
+    "345286179"
+)
+
+
+def _cells(text):
+    return bytes(int(ch) if ch != "." else 0 for ch in text)
+
+
+def _entries(**placed):
+    entries = bytearray(81)
+    for name, digit in placed.items():
+        entries[int(name[1:])] = digit
+    return entries
+
+
+def test_correct_entries_do_not_block():
+    oracle = ValidityOracle(get_topology(3))
+    solution = _cells(SOLUTION)
+    entries = bytes(0 if p else s for p, s in zip(_cells(PUZZLE), solution))
+
+    assert oracle.blocking_entries(_cells(PUZZLE), bytes(81)) == ()
+    assert oracle.blocking_entries(_cells(PUZZLE), entries) == ()
+
+
+def test_entry_without_a_completion_blocks_even_without_a_conflict():
+    oracle = ValidityOracle(get_topology(3))
+
+    # 2 fits cell 2 by the rules, but the only solution has a 4 there
+    blocking = oracle.blocking_entries(_cells(PUZZLE), _entries(c2=2, c3=6))
+
+    assert blocking == (2,)
+
+
+def test_entries_agreeing_with_the_last_completion_need_no_search():
+    oracle = ValidityOracle(get_topology(3))
+    oracle.blocking_entries(_cells(PUZZLE), bytes(81))
+
+    with patch.object(BitmaskSolver, "solve") as solve:
+        blocking = oracle.blocking_entries(_cells(PUZZLE), _entries(c2=4, c3=6))
+
+    assert blocking == ()
+    solve.assert_not_called()
+
+
+def test_answers_are_memoized_per_grid():
+    oracle = ValidityOracle(get_topology(3))
+    entries = _entries(c2=2)
+    oracle.blocking_entries(_cells(PUZZLE), entries)
+
+    with patch.object(BitmaskSolver, "solve") as solve:
+        assert oracle.blocking_entries(_cells(PUZZLE), entries) == (2,)
+
+    solve.assert_not_called()
+
+
+def test_checker_answers_only_the_latest_of_quick_requests():
+    checker = ValidityChecker(get_topology(3))
+    started, release = threading.Event(), threading.Event()
+    answered = []
+    real_query = ValidityOracle.blocking_entries
+
+    def slow_query(oracle, clues, entries):
+        started.set()
+        release.wait(5)
+        return real_query(oracle, clues, entries)
+
+    with (
+        patch.object(
+            ValidityOracle, "blocking_entries", autospec=True, side_effect=slow_query
+        ) as query,
+        patch(
+            "src.base.validity.GLib.idle_add",
+            side_effect=lambda fn, *args: fn(*args),
+        ),
+    ):
+        checker.submit(_cells(PUZZLE), bytes(81), answered.append)
+        started.wait(5)
+        worker = checker._thread
+        for digit in (1, 2, 4):
+            checker.submit(_cells(PUZZLE), _entries(c2=digit), answered.append)
+        release.set()
+        worker.join(5)
+
+        assert query.call_count == 2
+
+    assert answered == [()]